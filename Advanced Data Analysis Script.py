@@ -2,6 +2,7 @@ Project Structure
 advanced_data_analysis/
 │
 ├── analysis.py
+├── columnar_cache.py   # memory-mapped column sidecar for the CSV
 ├── data/
 │   └── sample_data.csv
 └── results/
@@ -15,12 +16,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from columnar_cache import load_csv
 
 # Ensure results directory exists
 os.makedirs("results", exist_ok=True)
 
-# Load data
-data = pd.read_csv('data/sample_data.csv')
+# Load data (parsed once, then memory-mapped from data/sample_data.csv.columns/)
+data = load_csv('data/sample_data.csv')
 
 # 1. Basic overview
 print("First 5 rows:")
@@ -6,6 +6,7 @@ Project Structure
 data_analysis_project/
 │
 ├── analysis.py
+├── columnar_cache.py   # memory-mapped column sidecar for the CSV
 └── data/
     └── sample_data.csv
 
@@ -23,9 +24,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from columnar_cache import load_csv
 
-# Load data
-data = pd.read_csv('data/sample_data.csv')
+# Load data (parsed once, then memory-mapped from data/sample_data.csv.columns/)
+data = load_csv('data/sample_data.csv')
 
 # Basic overview
 print("First 5 rows of data:")
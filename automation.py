@@ -17,6 +17,11 @@ Project Structure
 automated_data_analysis/
 │
 ├── analysis.py
+├── report_streaming.py      # chunked accumulators for the --chunksize mode
+├── report_cache.py          # per-artifact rebuild cache + build manifest
+├── report_figures.py        # Agg figure renderers (safe to run in worker processes)
+├── report_executor.py       # process/thread pools + per-stage timings
+├── columnar_cache.py        # memory-mapped column sidecar for the CSV
 ├── templates/
 │   └── report_template.html
 ├── data/
@@ -61,98 +66,164 @@ HTML Template (templates/report_template.html)
 
 
 analysis.py – Automated Script
+import sys
+import threading
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
 import seaborn as sns
 import os
 import pdfkit
 from jinja2 import Environment, FileSystemLoader
+import report_figures
+from report_streaming import stream_report_data, write_cleaned
+from report_cache import BuildCache
+from report_executor import ReportExecutor
+from columnar_cache import load_csv
 
-# Ensure results folder exists
-os.makedirs("results", exist_ok=True)
+# Streaming mode for inputs larger than memory:
+#   python analysis.py --chunksize 100000
+chunksize = int(sys.argv[sys.argv.index("--chunksize") + 1]) if "--chunksize" in sys.argv else None
 
-# Load data
-data = pd.read_csv('data/sample_data.csv')
+csv_file = 'data/sample_data.csv'
+template_file = 'templates/report_template.html'
 
-# -------------------------------
-# Data Cleaning
-# -------------------------------
-for col in data.columns:
-    if data[col].dtype in [np.float64, np.int64]:
-        data[col].fillna(data[col].mean(), inplace=True)
-    else:
-        data[col].fillna(data[col].mode()[0], inplace=True)
-
-# -------------------------------
-# Analysis
-# -------------------------------
-descriptive_stats = data.describe().round(2).to_html()
-dept_salary = data.groupby('Department')['Salary'].mean().round(2)
-dept_salary_table = dept_salary.to_frame().to_html()
-
-# -------------------------------
-# Visualizations
-# -------------------------------
-# Average salary by department
 avg_salary_plot = 'results/avg_salary_by_department.png'
-plt.figure(figsize=(8,6))
-sns.barplot(x=dept_salary.index, y=dept_salary.values)
-plt.title("Average Salary by Department")
-plt.ylabel("Salary")
-plt.xlabel("Department")
-plt.tight_layout()
-plt.savefig(avg_salary_plot)
-plt.close()
-
-# Age distribution
 age_distribution_plot = 'results/age_distribution.png'
-plt.figure(figsize=(8,6))
-sns.histplot(data['Age'], bins=5, kde=True)
-plt.title("Age Distribution")
-plt.xlabel("Age")
-plt.ylabel("Frequency")
-plt.tight_layout()
-plt.savefig(age_distribution_plot)
-plt.close()
-
-# Correlation heatmap
-corr_matrix = data.corr()
 correlation_plot = 'results/correlation_heatmap.png'
-plt.figure(figsize=(8,6))
-sns.heatmap(corr_matrix, annot=True, cmap='coolwarm')
-plt.title("Correlation Heatmap")
-plt.tight_layout()
-plt.savefig(correlation_plot)
-plt.close()
-
-# -------------------------------
-# Generate HTML report
-# -------------------------------
-env = Environment(loader=FileSystemLoader('templates'))
-template = env.get_template('report_template.html')
-
-html_out = template.render(
-    descriptive_table=descriptive_stats,
-    dept_salary_table=dept_salary_table,
-    avg_salary_plot=avg_salary_plot,
-    age_distribution_plot=age_distribution_plot,
-    correlation_plot=correlation_plot
-)
-
 html_file = 'results/report.html'
-with open(html_file, 'w') as f:
-    f.write(html_out)
-
-# -------------------------------
-# Convert HTML to PDF
-# -------------------------------
 pdf_file = 'results/report.pdf'
-pdfkit.from_file(html_file, pdf_file)
+cleaned_file = 'results/cleaned_data.csv'
+
+PLOT_PARAMS = {
+    "avg_salary": {"figsize": [8, 6], "title": "Average Salary by Department"},
+    "age_distribution": {"figsize": [8, 6], "bins": 5, "kde": True, "title": "Age Distribution"},
+    "correlation": {"figsize": [8, 6], "annot": True, "cmap": "coolwarm", "title": "Correlation Heatmap"},
+}
 
 # -------------------------------
-# Save cleaned data
+# Data Cleaning + Analysis (runs only if a cached stage misses)
 # -------------------------------
-data.to_csv('results/cleaned_data.csv', index=False)
-
-print("Automation complete! Check the 'results/' folder for outputs.")
+_analysis = {}
+_analysis_lock = threading.Lock()
+
+def analysis():
+    with _analysis_lock:
+        if _analysis:
+            return _analysis
+        if chunksize:
+            # Chunked cleaning + analysis (peak memory ~ one chunk); the second pass also writes the cleaned CSV
+            summary = stream_report_data(csv_file, chunksize, cleaned_csv=cleaned_file,
+                                         hist_bins=PLOT_PARAMS["age_distribution"]["bins"])
+            _analysis.update(data=None, descriptive=summary["descriptive"], dept_salary=summary["dept_salary"],
+                             corr=summary["corr"], ages=summary["age_hist"])
+        else:
+            data = load_csv(csv_file)
+            for col in data.columns:
+                if data[col].dtype in [np.float64, np.int64]:
+                    data[col].fillna(data[col].mean(), inplace=True)
+                else:
+                    data[col].fillna(data[col].mode()[0], inplace=True)
+            _analysis.update(data=data, descriptive=data.describe(),
+                             dept_salary=data.groupby('Department')['Salary'].mean(),
+                             corr=data.corr(), ages=data['Age'])
+        _analysis["dept_salary"] = _analysis["dept_salary"].round(2)
+        return _analysis
+
+def save_cleaned(path):
+    # Written in both modes, so the file exists even when every table came from the cache
+    if chunksize:
+        with _analysis_lock:
+            streamed = bool(_analysis)  # stream_report_data already wrote cleaned_file
+        if not streamed or path != cleaned_file:
+            write_cleaned(csv_file, path, chunksize)
+    else:
+        analysis()["data"].to_csv(path, index=False)
+
+def render_html(path, descriptive_stats, dept_salary_table):
+    env = Environment(loader=FileSystemLoader('templates'))
+    template = env.get_template('report_template.html')
+    html_out = template.render(
+        descriptive_table=descriptive_stats,
+        dept_salary_table=dept_salary_table,
+        avg_salary_plot=avg_salary_plot,
+        age_distribution_plot=age_distribution_plot,
+        correlation_plot=correlation_plot
+    )
+    with open(path, 'w') as f:
+        f.write(html_out)
+
+def main():
+    # Ensure results folder exists
+    os.makedirs("results", exist_ok=True)
+
+    # Every artifact is rebuilt only when its own inputs change
+    cache = BuildCache("results/.cache")
+    data_key = [cache.file_digest(csv_file), chunksize]
+    code_key = [cache.file_digest(__file__), cache.file_digest(report_figures.__file__),
+                pd.__version__, matplotlib.__version__, sns.__version__]
+
+    with ReportExecutor() as executor:
+        timings = executor.timings
+
+        # -------------------------------
+        # Analysis tables
+        # -------------------------------
+        with timings.stage("analysis_tables"):
+            descriptive_stats = cache.text("descriptive_table", [data_key, code_key],
+                                           lambda: analysis()["descriptive"].round(2).to_html())
+            dept_salary_table = cache.text("dept_salary_table", [data_key, code_key],
+                                           lambda: analysis()["dept_salary"].to_frame().to_html())
+
+        # -------------------------------
+        # Visualizations (process pool, one figure per worker)
+        # -------------------------------
+        figures = [
+            ("avg_salary", avg_salary_plot, report_figures.render_avg_salary, "dept_salary"),
+            ("age_distribution", age_distribution_plot, report_figures.render_age_distribution, "ages"),
+            ("correlation", correlation_plot, report_figures.render_correlation, "corr"),
+        ]
+        plot_keys, figure_jobs = {}, {}
+        for name, path, render, source in figures:
+            inputs = [data_key, code_key, PLOT_PARAMS[name]]
+            plot_keys[name] = cache.lookup(f"{name}_plot", inputs, path)
+            if plot_keys[name] is None:
+                figure_jobs[name] = (inputs, path, executor.submit_figure(
+                    f"{name}_plot", render, path, analysis()[source], **PLOT_PARAMS[name]))
+
+        # Cleaned CSV export overlaps with figure rendering
+        cleaned_job = executor.submit_io("cleaned_data", cache.artifact, "cleaned_data",
+                                         [data_key, code_key], cleaned_file, save_cleaned)
+
+        # -------------------------------
+        # Generate HTML report (only references the PNG paths)
+        # -------------------------------
+        with timings.stage("report_html"):
+            html_key = cache.artifact(
+                "report_html",
+                [cache.file_digest(template_file), code_key, descriptive_stats, dept_salary_table],
+                html_file,
+                lambda path: render_html(path, descriptive_stats, dept_salary_table))
+
+        for name, (inputs, path, job) in figure_jobs.items():
+            job.result()
+            stage = next(s for s in timings.stages if s["stage"] == f"{name}_plot")
+            plot_keys[name] = cache.store(f"{name}_plot", inputs, path, stage["seconds"])
+
+        # -------------------------------
+        # Convert HTML to PDF (needs the finished PNGs)
+        # -------------------------------
+        pdf_job = executor.submit_io("report_pdf", cache.artifact, "report_pdf", [html_key, plot_keys],
+                                     pdf_file, lambda path: pdfkit.from_file(html_file, path))
+        cleaned_job.result()
+        pdf_job.result()
+
+    manifest = cache.save("results/build_manifest.json")
+    timings.save("results/stage_timings.json")
+    print(timings.summary())
+    print(f"Build cache: {manifest['hits']} hits, {manifest['misses']} misses "
+          f"(see results/build_manifest.json)")
+    print("Automation complete! Check the 'results/' folder for outputs.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# automaton_engine.py
+# NumPy engine for the self-organizing cellular automaton ("Conway game of life")
+#
+# State lives in three typed arrays instead of a grid of Cell objects:
+#   energy  int32   0 where empty
+#   species int8    0-9 for a live cell, EMPTY (-1) for free space, WALL (-2)
+#                   outside the world (only used when stepping padded tiles)
+#   age     int32
+#
+# One generation is a fixed sequence of whole-array passes over the eight
+# neighbour views of a 1-cell padded copy (no per-cell Python):
+#   decay        every live cell ages by one and loses one energy; <= 0 dies
+#   transfer     a cell with living neighbours gives min(energy // 2, target + 5)
+#                to one random same-species neighbour with less energy
+#   reproduction a cell with living neighbours and energy > 20 spawns a child
+#                with energy // 3 into one random empty neighbour; when several
+#                parents pick the same square the first in row-major order wins
+#
+# The rules are those of CellularAutomaton, applied synchronously: every cell
+# decides from the state at the start of the pass, instead of seeing the
+# partial updates of cells scanned before it.
+#
+# Random choices are a counter-based hash of (seed, generation, decision, global
+# row, global col), so the result depends only on the seed and not on how the
+# world is split up; automaton_tiles relies on that to match this engine.
+
+import numpy as np
+
+EMPTY = -1
+WALL = -2
+START_ENERGY = 10
+SPECIES = 10
+REPRODUCTION_ENERGY = 20
+
+# Same order as CellularAutomaton._get_neighbors.
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+# A cell's next state depends on cells up to four steps away: a rival claimant
+# for the square it spawns into sits two cells off, and whether that rival can
+# reproduce depends on transfers from its own neighbours.
+HALO = 4
+
+_TRANSFER, _REPRODUCE = 1, 2
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(x):
+    """SplitMix64 finalizer over a uint64 array."""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def cell_hash(seed, generation, decision, rows, cols):
+    """Deterministic 64-bit random value per (global row, col) for one decision."""
+    key = (seed * 0x9E3779B97F4A7C15 + generation * 0xD1B54A32D192ED03 + decision * 0x8CB92BA72F3D8DD7) & _MASK64
+    x = rows.astype(np.uint64) * np.uint64(0x100000001B3) ^ cols.astype(np.uint64)
+    return _mix(_mix(x ^ np.uint64(key)))
+
+
+def seed_cells(rows, cols, density, seed, block=1024):
+    """Yield (rows, cols, species) arrays of initial cells, block by block.
+
+    Each block has its own Generator seeded from (seed, block row, block col), so
+    the same cells come out whether a caller builds one dense array or only the
+    tiles it needs, and sparse worlds cost O(cells), not O(area).
+    """
+    for br in range(0, rows, block):
+        for bc in range(0, cols, block):
+            h, w = min(block, rows - br), min(block, cols - bc)
+            rng = np.random.default_rng([seed, br // block, bc // block])
+            count = rng.binomial(h * w, density)
+            if not count:
+                continue
+            flat = np.sort(rng.choice(h * w, size=count, replace=False))
+            yield br + flat // w, bc + flat % w, rng.integers(0, SPECIES, count).astype(np.int8)
+
+
+def _pad(a, fill=0):
+    """Copy of ``a`` with a one-cell border of ``fill`` (cheaper than np.pad)."""
+    padded = np.full((a.shape[0] + 2, a.shape[1] + 2), fill, dtype=a.dtype)
+    padded[1:-1, 1:-1] = a
+    return padded
+
+
+# Lookup tables over an 8-bit "which neighbours qualify" mask: how many bits are
+# set, and the position of the n-th set bit.
+_POPCOUNT = np.array([bin(m).count("1") for m in range(256)], dtype=np.uint8)
+_NTH_BIT = np.zeros((256, 8), dtype=np.int8)
+for _m in range(256):
+    for _n, _k in enumerate(k for k in range(8) if _m >> k & 1):
+        _NTH_BIT[_m, _n] = _k
+
+
+def _choose(bits, seed, generation, decision, row0, col0):
+    """Pick one set bit per cell of an (h, w) uint8 option mask, uniformly at random.
+
+    Returns (rows, cols, direction index) for every cell with at least one option.
+    """
+    r, c = np.nonzero(bits)
+    if not len(r):
+        return r, c, r
+    cell_bits = bits[r, c]
+    draws = cell_hash(seed, generation, decision, r + row0, c + col0) >> np.uint64(11)
+    pick = draws % _POPCOUNT[cell_bits].astype(np.uint64)
+    return r, c, _NTH_BIT[cell_bits, pick.astype(np.intp)]
+
+
+def step(energy, species, age, generation, seed, row0=0, col0=0):
+    """Advance arrays one generation; returns new (energy, species, age).
+
+    ``row0``/``col0`` are the global coordinates of element [0, 0] (random draws
+    are keyed on global position). Anything beyond the array edge counts as wall.
+    """
+    h, w = species.shape
+    if not (species >= 0).any():
+        return np.zeros_like(energy), species.copy(), np.zeros_like(age)
+    width = w + 2
+    offsets = np.array([dr * width + dc for dr, dc in DIRECTIONS])
+
+    def view(padded, dr, dc):
+        return padded[1 + dr:1 + dr + h, 1 + dc:1 + dc + w]
+
+    def flat(r, c):
+        return (r + 1) * width + (c + 1)
+
+    # Decay (every live cell, including those about to die, still counts as a
+    # living neighbour this generation, as in the object version)
+    sp_pad = _pad(species, WALL)
+    alive_pad = sp_pad >= 0
+    alive = alive_pad[1:-1, 1:-1]
+    e_pad = _pad(energy)
+    e_pad -= alive_pad
+    age_pad = _pad(age)
+    age_pad += alive_pad
+    e = e_pad[1:-1, 1:-1]
+    survive = alive & (e > 0)
+
+    living = np.zeros((h, w), dtype=np.uint8)
+    for dr, dc in DIRECTIONS:
+        living += view(alive_pad, dr, dc)
+    active = survive & (living > 0)
+
+    e_flat, sp_flat = e_pad.ravel(), sp_pad.ravel()
+    if active.any():
+        # Energy transfer to a random weaker neighbour of the same species
+        bits = np.zeros((h, w), dtype=np.uint8)
+        for k, (dr, dc) in enumerate(DIRECTIONS):
+            bits |= ((view(sp_pad, dr, dc) == species) & (view(e_pad, dr, dc) < e)).view(np.uint8) << k
+        bits *= active
+        r, c, k = _choose(bits, seed, generation, _TRANSFER, row0, col0)
+        if len(r):
+            src = flat(r, c)
+            dst = src + offsets[k]
+            amount = np.minimum(e_flat[src] // 2, e_flat[dst] + 5)
+            received = np.bincount(dst, weights=amount, minlength=e_flat.size).astype(np.int32)
+            e_flat[src] -= amount
+            e_flat += received
+
+        # Reproduction into a random empty neighbour; the first parent in
+        # row-major order wins a contested square
+        parents = active & (e > REPRODUCTION_ENERGY)
+        if parents.any():
+            empty_pad = sp_pad == EMPTY
+            bits = np.zeros((h, w), dtype=np.uint8)
+            for k, (dr, dc) in enumerate(DIRECTIONS):
+                bits |= view(empty_pad, dr, dc).view(np.uint8) << k
+            bits *= parents
+            r, c, k = _choose(bits, seed, generation, _REPRODUCE, row0, col0)
+            src = flat(r, c)
+            dst = src + offsets[k]
+            dst, first = np.unique(dst, return_index=True)  # src is in row-major order
+            src = src[first]
+            share = e_flat[src] // 3
+            e_flat[src] -= share
+            e_flat[dst] = share
+            sp_flat[dst] = sp_flat[src]
+            age_pad.ravel()[dst] = 0
+            survive = survive | (sp_pad[1:-1, 1:-1] >= 0) & ~alive
+
+    new_species = np.where(survive, sp_pad[1:-1, 1:-1], np.where(species == WALL, WALL, EMPTY)).astype(np.int8)
+    return np.where(survive, e, 0), new_species, np.where(survive, age_pad[1:-1, 1:-1], 0)
+
+
+class ArrayAutomaton:
+    """Array-backed CellularAutomaton: same rules, applied as whole-grid passes."""
+
+    def __init__(self, rows, cols, initial_density=0.3, seed=None):
+        self.rows = rows
+        self.cols = cols
+        self.seed = int(np.random.SeedSequence(seed).entropy) & _MASK64 if seed is None else seed
+        self.generation = 0
+        self.energy = np.zeros((rows, cols), dtype=np.int32)
+        self.species = np.full((rows, cols), EMPTY, dtype=np.int8)
+        self.age = np.zeros((rows, cols), dtype=np.int32)
+        for r, c, sp in seed_cells(rows, cols, initial_density, self.seed):
+            self.species[r, c] = sp
+            self.energy[r, c] = START_ENERGY
+
+    def evolve(self):
+        """Evolves the automaton by one generation."""
+        self.energy, self.species, self.age = step(self.energy, self.species, self.age, self.generation, self.seed)
+        self.generation += 1
+
+    def population(self):
+        """Live cells per species (index = species id)."""
+        live = self.species[self.species >= 0]
+        return np.bincount(live, minlength=SPECIES)
+
+    def display(self):
+        """Prints a simplified representation of the grid."""
+        for row in self.species.tolist():
+            print("".join(" . " if s < 0 else f" {s} " for s in row))
+        print("-" * (self.cols * 3))
@@ -0,0 +1,199 @@
+# automaton_tiles.py
+# Sparse, tiled, multi-process world for the cellular automaton
+#
+# The world is cut into square tiles and only tiles that hold live cells are
+# stored. Each generation steps those tiles, plus any neighbour tile a child
+# could spawn into (a live cell on the shared edge), in a process pool:
+#
+#   1. halo exchange: every tile to step is copied into a (tile + 2*HALO)
+#      square with the bordering cells of its neighbour tiles around it
+#      (missing tiles are empty, anything outside the world is WALL)
+#   2. a worker runs automaton_engine.step on the padded square with its global
+#      origin, and returns just the interior
+#   3. tiles that came back empty are dropped
+#
+# HALO covers every cell that can influence a tile's interior in one
+# generation, and random draws are keyed on global coordinates, so the result
+# is cell-for-cell identical to ArrayAutomaton with the same seed. Memory is
+# proportional to the number of live tiles, not to rows x cols; small tiles
+# suit very sparse worlds (32 x 32 keeps an isolated cell to ~9 KB), large
+# tiles amortize per-tile overhead in dense ones.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from automaton_engine import EMPTY, HALO, SPECIES, START_ENERGY, WALL, seed_cells, step
+
+
+def _step_tile(task):
+    key, energy, species, age, generation, seed, row0, col0 = task
+    energy, species, age = step(energy, species, age, generation, seed, row0, col0)
+    inner = (slice(HALO, -HALO), slice(HALO, -HALO))
+    species = species[inner]
+    if not (species >= 0).any():
+        return key, None
+    return key, (np.ascontiguousarray(energy[inner]), np.ascontiguousarray(species),
+                 np.ascontiguousarray(age[inner]))
+
+
+class TiledWorld:
+    """Sparse rows x cols automaton stored and stepped as independent tiles."""
+
+    def __init__(self, rows, cols, initial_density=0.3, seed=None, tile=64, processes=None):
+        if tile < HALO:
+            raise ValueError(f"tile must be at least {HALO} cells")
+        self.rows = rows
+        self.cols = cols
+        self.tile = tile
+        self.seed = int(np.random.SeedSequence(seed).entropy) & ((1 << 64) - 1) if seed is None else seed
+        self.processes = os.cpu_count() if processes is None else processes
+        self.generation = 0
+        self.tiles = {}  # (tile row, tile col) -> (energy, species, age)
+        self._pool = None
+        if initial_density:
+            tiles_across = (cols + tile - 1) // tile
+            for r, c, sp in seed_cells(rows, cols, initial_density, self.seed):
+                keys = (r // tile) * tiles_across + c // tile
+                for key in np.unique(keys):
+                    mask = keys == key
+                    energy, species, _ = self._tile(divmod(int(key), tiles_across), create=True)
+                    species[r[mask] % tile, c[mask] % tile] = sp[mask]
+                    energy[r[mask] % tile, c[mask] % tile] = START_ENERGY
+
+    @classmethod
+    def from_arrays(cls, energy, species, age, seed, generation=0, tile=64, processes=None):
+        """Tile an existing dense state (e.g. an ArrayAutomaton's arrays)."""
+        world = cls(*species.shape, initial_density=0, seed=seed, tile=tile, processes=processes)
+        world.generation = generation
+        for tr in range(0, world.rows, tile):
+            for tc in range(0, world.cols, tile):
+                block = (slice(tr, tr + tile), slice(tc, tc + tile))
+                if (species[block] >= 0).any():
+                    world.tiles[(tr // tile, tc // tile)] = (energy[block].copy(), species[block].copy(),
+                                                             age[block].copy())
+        return world
+
+    # ------------------- Tiles -------------------
+    def _shape(self, key):
+        tr, tc = key
+        return min(self.tile, self.rows - tr * self.tile), min(self.tile, self.cols - tc * self.tile)
+
+    def _tile(self, key, create=False):
+        if key not in self.tiles and create:
+            shape = self._shape(key)
+            self.tiles[key] = (np.zeros(shape, np.int32), np.full(shape, EMPTY, np.int8), np.zeros(shape, np.int32))
+        return self.tiles.get(key)
+
+    def _neighbors(self, key):
+        tr, tc = key
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = tr + dr, tc + dc
+                if (dr or dc) and 0 <= r * self.tile < self.rows and 0 <= c * self.tile < self.cols:
+                    yield (dr, dc), (r, c)
+
+    def _frontier(self):
+        """Live tiles plus empty neighbours that a live cell on the shared edge could spawn into."""
+        keys = set(self.tiles)
+        for key, (_, species, _) in self.tiles.items():
+            live = species >= 0
+            for (dr, dc), neighbor in self._neighbors(key):
+                if neighbor in keys:
+                    continue
+                # The row/column (or corner cell) of this tile that touches the neighbour
+                edge_rows = slice(None) if not dr else (0 if dr < 0 else -1)
+                edge_cols = slice(None) if not dc else (0 if dc < 0 else -1)
+                if live[edge_rows, edge_cols].any():
+                    keys.add(neighbor)
+        return keys
+
+    def _padded(self, key):
+        """The tile plus HALO cells of its surroundings, in global coordinates."""
+        tr, tc = key
+        h, w = self._shape(key)
+        r0, c0 = tr * self.tile - HALO, tc * self.tile - HALO
+        size = (h + 2 * HALO, w + 2 * HALO)
+        energy = np.zeros(size, np.int32)
+        species = np.full(size, EMPTY, np.int8)
+        age = np.zeros(size, np.int32)
+        # Outside the world is wall
+        rows, cols = np.arange(r0, r0 + size[0]), np.arange(c0, c0 + size[1])
+        species[(rows < 0) | (rows >= self.rows), :] = WALL
+        species[:, (cols < 0) | (cols >= self.cols)] = WALL
+        for _, neighbor in [((0, 0), key), *self._neighbors(key)]:
+            data = self.tiles.get(neighbor)
+            if data is None:
+                continue
+            nr, nc = neighbor[0] * self.tile, neighbor[1] * self.tile
+            nh, nw = data[1].shape
+            # Overlap of the neighbour tile with the padded window, in both frames
+            top, bottom = max(nr, r0), min(nr + nh, r0 + size[0])
+            left, right = max(nc, c0), min(nc + nw, c0 + size[1])
+            if top >= bottom or left >= right:
+                continue
+            dst = (slice(top - r0, bottom - r0), slice(left - c0, right - c0))
+            src = (slice(top - nr, bottom - nr), slice(left - nc, right - nc))
+            energy[dst], species[dst], age[dst] = data[0][src], data[1][src], data[2][src]
+        return energy, species, age, r0, c0
+
+    # ------------------- Evolution -------------------
+    def evolve(self):
+        """Evolves every live tile (and its frontier) by one generation."""
+        tasks = []
+        for key in sorted(self._frontier()):
+            energy, species, age, r0, c0 = self._padded(key)
+            tasks.append((key, energy, species, age, self.generation, self.seed, r0, c0))
+        if self.processes > 1 and len(tasks) > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.processes)
+            results = self._pool.map(_step_tile, tasks, chunksize=max(1, len(tasks) // (4 * self.processes)))
+        else:
+            results = map(_step_tile, tasks)
+        tiles = {}
+        for key, data in results:
+            if data is not None:
+                tiles[key] = data
+        self.tiles = tiles
+        self.generation += 1
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------- Inspection -------------------
+    def population(self):
+        """Live cells per species (index = species id)."""
+        counts = np.zeros(SPECIES, dtype=np.int64)
+        for _, species, _ in self.tiles.values():
+            counts += np.bincount(species[species >= 0], minlength=SPECIES)
+        return counts
+
+    def memory_bytes(self):
+        return sum(a.nbytes for data in self.tiles.values() for a in data)
+
+    def to_arrays(self):
+        """Dense (energy, species, age) copy; only sensible for small worlds."""
+        energy = np.zeros((self.rows, self.cols), np.int32)
+        species = np.full((self.rows, self.cols), EMPTY, np.int8)
+        age = np.zeros((self.rows, self.cols), np.int32)
+        for (tr, tc), data in self.tiles.items():
+            h, w = data[1].shape
+            block = (slice(tr * self.tile, tr * self.tile + h), slice(tc * self.tile, tc * self.tile + w))
+            energy[block], species[block], age[block] = data
+        return energy, species, age
+
+    def display(self):
+        """Prints a simplified representation of the grid."""
+        species = self.to_arrays()[1]
+        for row in species.tolist():
+            print("".join(" . " if s < 0 else f" {s} " for s in row))
+        print("-" * (self.cols * 3))
@@ -0,0 +1,211 @@
+# columnar_cache.py
+# Binary columnar sidecar for CSV inputs shared by the analysis scripts
+#
+# The first time a CSV is loaded it is parsed once and written next to it as a
+# directory of per-column .npy files plus a small meta.json:
+#
+#   data/sample_data.csv
+#   data/sample_data.csv.columns/
+#       meta.json                # CSV size, mtime, SHA-256, read_csv options and the column layout
+#       <build>-0000.npy         # numeric column (int64 / float64 / bool)
+#       <build>-0001.codes.npy   # text column as int32 category codes (-1 = missing)
+#       <build>-0001.json        # ... and its category labels
+#
+# Later loads memory-map the .npy files (copy-on-write, so in-place edits such as
+# fillna never touch the sidecar) instead of re-parsing text; text columns are
+# decoded back to the dtype read_csv gave them. Only columns whose values are
+# all numbers or all strings round-trip exactly; if any column holds anything
+# else (bools mixed with NaN, dates, ints mixed with strings) meta.json records
+# no columns and loads fall back to read_csv. The sidecar is rebuilt when the
+# CSV or the read_csv options change: a size/mtime mismatch triggers a hash
+# check, and only a different hash forces a rebuild. Each build writes into its
+# own temporary directory and is swapped in by rename; file names carry a
+# per-build id, so a load that read meta.json from one build and finds another
+# build's files in place notices, and reads meta.json again.
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+import numpy as np
+import pandas as pd
+
+SIDECAR_VERSION = 3
+SIDECAR_SUFFIX = ".columns"
+MAP_ATTEMPTS = 5
+
+
+def sidecar_path(csv_path):
+    return csv_path + SIDECAR_SUFFIX
+
+
+def _sha256_file(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _parse_options(read_csv_kwargs):
+    # What the parsed columns depend on besides the file itself, in JSON form for meta.json
+    return json.loads(json.dumps({"kwargs": read_csv_kwargs, "pandas": pd.__version__}, sort_keys=True, default=str))
+
+
+def _csv_signature(csv_path):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_meta(sidecar):
+    try:
+        with open(os.path.join(sidecar, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == SIDECAR_VERSION else None
+
+
+def _write_meta(sidecar, meta):
+    fd, tmp_path = tempfile.mkstemp(prefix="meta.", suffix=".tmp", dir=sidecar)
+    with os.fdopen(fd, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(sidecar, "meta.json"))
+
+
+def _install(tmp_dir, sidecar):
+    # rename() only replaces a missing or empty directory: move an existing sidecar aside and retry
+    while True:
+        try:
+            os.replace(tmp_dir, sidecar)
+            return
+        except OSError as e:
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                raise
+        aside = tempfile.mkdtemp(prefix=os.path.basename(sidecar) + ".", suffix=".old",
+                                 dir=os.path.dirname(os.path.abspath(sidecar)))
+        try:
+            os.replace(sidecar, aside)
+        except FileNotFoundError:
+            pass  # another builder moved it first
+        shutil.rmtree(aside, ignore_errors=True)
+
+
+# ------------------- Build -------------------
+def build_sidecar(csv_path, **read_csv_kwargs):
+    """Parse ``csv_path`` once and write its typed columnar sidecar. Returns the meta dict."""
+    return _build(csv_path, read_csv_kwargs)[0]
+
+
+def _build(csv_path, read_csv_kwargs, load=False):
+    # (meta, frame): with ``load`` the frame is mapped from the new files before they are installed,
+    # so a concurrent rebuild cannot pull them away from under this load
+    signature = _csv_signature(csv_path)
+    file_hash = _sha256_file(csv_path)
+    data = pd.read_csv(csv_path, **read_csv_kwargs)
+
+    sidecar = sidecar_path(csv_path)
+    tmp_dir = tempfile.mkdtemp(prefix=os.path.basename(sidecar) + ".", suffix=".tmp",
+                               dir=os.path.dirname(os.path.abspath(sidecar)))
+    try:
+        meta = _write_columns(tmp_dir, data, signature, file_hash, read_csv_kwargs)
+        frame = None
+        if load:
+            frame = data if meta["columns"] is None else _map_columns(tmp_dir, meta)
+        _install(tmp_dir, sidecar)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return meta, frame
+
+
+def _write_columns(tmp_dir, data, signature, file_hash, read_csv_kwargs):
+    build = uuid.uuid4().hex[:12]
+    text = {name: pd.Categorical(data[name]) for name in data.columns if data[name].dtype.kind not in "biuf"}
+    columns = []
+    if not all(isinstance(c, str) for categorical in text.values() for c in categorical.categories):
+        columns = None  # labels that are not all str would come back as strings: loads use read_csv instead
+    for i, name in enumerate(data.columns if columns is not None else []):
+        stem = f"{build}-{i:04d}"
+        if name not in text:
+            np.save(os.path.join(tmp_dir, stem + ".npy"), data[name].to_numpy())
+            columns.append({"name": name, "kind": "numeric", "file": stem + ".npy"})
+            continue
+        categorical = text[name]
+        np.save(os.path.join(tmp_dir, stem + ".codes.npy"), categorical.codes.astype(np.int32))
+        with open(os.path.join(tmp_dir, stem + ".json"), "w") as f:
+            json.dump(list(categorical.categories), f)
+        columns.append({"name": name, "kind": "text", "dtype": str(data[name].dtype), "file": stem + ".codes.npy",
+                        "categories": stem + ".json"})
+
+    meta = {
+        "version": SIDECAR_VERSION,
+        "csv": signature,
+        "sha256": file_hash,
+        "read_csv": _parse_options(read_csv_kwargs),
+        "rows": len(data),
+        "columns": columns,
+    }
+    _write_meta(tmp_dir, meta)
+    return meta
+
+
+def _fresh_meta(csv_path, read_csv_kwargs):
+    # Returns the sidecar's meta if it still describes csv_path parsed with read_csv_kwargs, else None.
+    sidecar = sidecar_path(csv_path)
+    meta = _read_meta(sidecar)
+    if meta is None or meta["read_csv"] != _parse_options(read_csv_kwargs):
+        return None
+    signature = _csv_signature(csv_path)
+    if meta["csv"] == signature:
+        return meta
+    # Touched or copied but possibly unchanged: fall back to the content hash.
+    if meta["sha256"] == _sha256_file(csv_path):
+        meta["csv"] = signature
+        try:
+            _write_meta(sidecar, meta)
+        except FileNotFoundError:
+            pass  # replaced by a concurrent build; the next load checks the hash again
+        return meta
+    return None
+
+
+# ------------------- Load -------------------
+def load_csv(csv_path, rebuild=False, **read_csv_kwargs):
+    """Drop-in for ``pd.read_csv(csv_path, **read_csv_kwargs)`` backed by a memory-mapped columnar sidecar.
+
+    Numeric columns come back as views over the mapped .npy files; text columns
+    are decoded from the mapped codes to the dtype read_csv gave them. A sidecar
+    built with different ``read_csv_kwargs`` is rebuilt; a CSV with columns the
+    sidecar cannot hold exactly is read with read_csv.
+    """
+    for attempt in range(MAP_ATTEMPTS):
+        meta = None if rebuild and not attempt else _fresh_meta(csv_path, read_csv_kwargs)
+        if meta is None:
+            return _build(csv_path, read_csv_kwargs, load=True)[1]
+        if meta["columns"] is None:
+            return pd.read_csv(csv_path, **read_csv_kwargs)
+        try:
+            return _map_columns(sidecar_path(csv_path), meta)
+        except FileNotFoundError:
+            if attempt == MAP_ATTEMPTS - 1:
+                raise
+            # A concurrent build replaced the sidecar after meta was read: start over from its meta.json
+
+
+def _map_columns(sidecar, meta):
+    columns = {}
+    for col in meta["columns"]:
+        # A plain ndarray view of the mapping, so pandas never sees the np.memmap subclass
+        values = np.load(os.path.join(sidecar, col["file"]), mmap_mode="c").view(np.ndarray)
+        if col["kind"] == "text":
+            with open(os.path.join(sidecar, col["categories"])) as f:
+                categories = json.load(f)
+            values = pd.Series(pd.Categorical.from_codes(values, categories=categories, validate=False))
+            values = values.astype(object if col["dtype"] == "object" else col["dtype"])
+        columns[col["name"]] = values
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,173 @@
+# event_log.py
+# Buffered, batched CSV event log shared by the focus and workflow tools
+#
+# write() only appends the row to an in-memory queue. A single background
+# flusher thread drains the queue and group-commits rows to disk when a batch
+# fills up or a time limit passes, so:
+#   - the per-event cost for callers is one enqueue
+#   - rows from concurrent threads never interleave (only the flusher writes)
+#   - close() (also registered with atexit) flushes and fsyncs what is left
+# Files can be rotated by size and/or by calendar day.
+
+import atexit
+import csv
+import datetime
+import io
+import os
+import queue
+import threading
+import time
+
+_CLOSE = object()
+
+
+class EventLogWriter:
+    """Thread-safe CSV appender with group commit, durable shutdown and rotation."""
+
+    def __init__(self, path, header=None, max_batch=256, flush_interval=1.0,
+                 rotate_bytes=None, rotate_daily=False, fsync=False):
+        self.path = path
+        self.header = list(header) if header else None
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_daily = rotate_daily
+        self.fsync = fsync
+
+        self._queue = queue.Queue()
+        self._file = None
+        self._opened_on = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"EventLogWriter({path})", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------- Public API -------------------
+    def write(self, row):
+        """Queue one row (a sequence of values); returns immediately."""
+        if self._closed:
+            raise ValueError(f"event log {self.path} is closed")
+        self._queue.put(list(row))
+
+    def flush(self):
+        """Block until every row queued so far is on disk (immediately true once closed)."""
+        if self._closed and not self._thread.is_alive():
+            return  # close() already wrote and synced everything
+        done = threading.Event()
+        self._queue.put(done)
+        # A close() racing with this call may stop the flusher before it sees the
+        # marker; by then it has synced every row queued before the marker.
+        while not done.wait(0.1):
+            if not self._thread.is_alive():
+                return
+
+    def close(self):
+        """Flush remaining rows, fsync and stop the flusher thread. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    # ------------------- Flusher Thread -------------------
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch, waiters, closing = [], [], False
+            deadline = None
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if closing or waiters or len(batch) >= self.max_batch:
+                    break
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._commit(batch)
+            if closing or waiters:
+                self._sync()
+            for waiter in waiters:
+                waiter.set()
+            if closing:
+                # Anything queued after close() is still written.
+                leftover = []
+                while not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    elif item is not _CLOSE:
+                        leftover.append(item)
+                if leftover:
+                    self._commit(leftover)
+                self._sync()
+                if self._file:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _commit(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        data = buffer.getvalue()
+        self._maybe_rotate(len(data))
+        self._open()
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _sync(self):
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    # ------------------- Files & Rotation -------------------
+    def _open(self):
+        if self._file:
+            return
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._opened_on = datetime.date.today()
+        if new_file and self.header:
+            csv.writer(self._file).writerow(self.header)
+
+    def _rotated_name(self, tag):
+        root, ext = os.path.splitext(self.path)
+        candidate = f"{root}.{tag}{ext}"
+        n = 1
+        while os.path.exists(candidate):
+            candidate = f"{root}.{tag}.{n}{ext}"
+            n += 1
+        return candidate
+
+    def _maybe_rotate(self, incoming):
+        if not os.path.exists(self.path):
+            return
+        today = datetime.date.today()
+        if self.rotate_daily:
+            opened_on = self._opened_on or datetime.date.fromtimestamp(os.path.getmtime(self.path))
+            if opened_on != today:
+                self._rotate(opened_on.isoformat())
+                return
+        if self.rotate_bytes and os.path.getsize(self.path) + incoming > self.rotate_bytes:
+            self._rotate(datetime.datetime.now().strftime("%Y%m%d-%H%M%S"))
+
+    def _rotate(self, tag):
+        if self._file:
+            self._sync()
+            self._file.close()
+            self._file = None
+        if os.path.getsize(self.path):
+            os.replace(self.path, self._rotated_name(tag))
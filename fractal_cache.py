@@ -0,0 +1,221 @@
+# fractal_cache.py
+# Tile cache and progressive rendering for the Mandelbrot explorer
+#
+# Instead of a free-floating rectangle, the explorer's view is a window onto a
+# fixed pixel lattice per zoom level:
+#   pixel (row, col) at zoom z sits where generate_fractal would put pixel
+#   (row / z, col / z) of the home view
+# so at zoom 1 with no pan the frame is exactly the original picture. A pan
+# moves the window by a whole number of pixels and a zoom rescales the lattice
+# about the centre of the window. Tiles of that lattice are cached under
+# (zoom, tile x, tile y), each with the max_iter it was rendered with:
+#   - after a pan only the newly exposed tiles are computed
+#   - zooming back to an earlier level finds its tiles still there; max_iter
+#     grows on the way in, so a tile is reused whenever it was rendered with
+#     at least the current max_iter (its counts clipped to it, which is exactly
+#     the lower-iteration result) and re-rendered only when it had fewer
+#   - least recently used tiles are evicted to stay within a byte budget
+# Tiles that are not cached are first drawn coarsely (every PREVIEW-th pixel,
+# each one stretched over a PREVIEW x PREVIEW block) and then refined, so a
+# frame appears quickly even when the full computation is slow.
+#
+# Zoom and position are exact (a Fraction and whole pixels), so the window
+# can be placed precisely far below float64 resolution; once pixels get
+# smaller than fractal_deep.DEEP_PITCH, tiles are rendered by perturbation
+# from a high-precision reference orbit at the window centre.
+
+import math
+from collections import OrderedDict
+from decimal import localcontext
+from fractions import Fraction
+
+import numpy as np
+
+from fractal_deep import DEEP_PITCH, digits_for, reference_orbit, render_deep_tile, to_decimal
+from fractal_render import MandelbrotRenderer, render_tile
+
+TILE = 16
+PREVIEW = 4
+HOME = (-2.0, 1.0, -1.5, 1.5)
+
+
+class TileCache:
+    """LRU map of (zoom, tile x, tile y) -> (max_iter, counts array), kept under ``budget`` bytes."""
+
+    def __init__(self, budget=64 << 20):
+        self.budget = budget
+        self.tiles = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def get(self, key, max_iter):
+        """Counts for ``key`` as rendered with ``max_iter``, or None if the tile needs (re-)rendering."""
+        entry = self.tiles.get(key)
+        if entry is None or entry[0] < max_iter:
+            self.misses += 1
+            return None
+        self.tiles.move_to_end(key)
+        self.hits += 1
+        rendered_with, counts = entry
+        # Counts of max_iter or more all mean "did not escape within max_iter"
+        return counts if rendered_with == max_iter else np.minimum(counts, max_iter)
+
+    def put(self, key, counts, max_iter):
+        if key in self.tiles:
+            self.nbytes -= self.tiles.pop(key)[1].nbytes
+        self.tiles[key] = (max_iter, counts)
+        self.nbytes += counts.nbytes
+        while self.nbytes > self.budget and len(self.tiles) > 1:
+            _, (_, evicted) = self.tiles.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        self.tiles.clear()
+        self.nbytes = 0
+
+
+class TiledView:
+    """The explorer's window: pan/zoom state on the tile lattice plus cached, progressive frames."""
+
+    def __init__(self, width=80, height=40, max_iter=50, home=HOME, renderer=None, cache=None, tile=TILE,
+                 deep=None):
+        self.width = width
+        self.height = height
+        self.home = tuple(home)
+        self.home_iter = max_iter
+        self.tile = tile
+        self.force_deep = deep  # None: perturbation only below DEEP_PITCH
+        self._reference = None
+        self.renderer = renderer or MandelbrotRenderer(processes=1)
+        self.cache = TileCache() if cache is None else cache
+        self.rendered = self.reused = 0
+        self.reset()
+
+    # ------------------- Navigation -------------------
+    def reset(self):
+        self.zoom = Fraction(1)
+        self.row = self.col = 0  # lattice pixel at the window's top-left
+        self.max_iter = self.home_iter
+
+    def pan(self, direction, amount):
+        """Move by ``amount`` of the window size, rounded to whole pixels."""
+        if direction == "left":
+            self.col -= round(amount * self.width)
+        elif direction == "right":
+            self.col += round(amount * self.width)
+        elif direction == "up":
+            self.row += round(amount * self.height)
+        elif direction == "down":
+            self.row -= round(amount * self.height)
+        else:
+            raise ValueError(f"unknown direction {direction!r}")
+
+    def zoom_by(self, factor):
+        """Magnify by ``factor`` about the centre of the window (more iterations when zooming in)."""
+        exact = Fraction(str(factor))  # 1.1 -> 11/10, so repeated zooms stay exact
+        self.col = round((self.col + Fraction(self.width, 2)) * exact - Fraction(self.width, 2))
+        self.row = round((self.row + Fraction(self.height, 2)) * exact - Fraction(self.height, 2))
+        self.zoom *= exact
+        # +10 per unit of factor as before up to 2x; logarithmic beyond, so a 1e12x jump adds ~400, not 1e13
+        factor = float(factor)
+        self.max_iter += int(10 * (factor - 1)) if factor <= 2 else int(10 * math.log2(factor))
+
+    def pitch(self):
+        """Exact (x, y) size of one pixel."""
+        x_min, x_max, y_min, y_max = map(Fraction, self.home)
+        return (x_max - x_min) / (self.width * self.zoom), (y_max - y_min) / (self.height * self.zoom)
+
+    @property
+    def deep(self):
+        """Whether frames are rendered by perturbation (pixels too small for float64 coordinates)."""
+        if self.force_deep is not None:
+            return self.force_deep
+        return min(self.pitch()) < DEEP_PITCH
+
+    def point(self, row, col):
+        """Exact (x, y) of lattice pixel (row, col)."""
+        pitch_x, pitch_y = self.pitch()
+        return Fraction(self.home[0]) + col * pitch_x, Fraction(self.home[2]) + row * pitch_y
+
+    def bounds(self):
+        """(x_min, x_max, y_min, y_max) of the window."""
+        x_min, y_min = self.point(self.row, self.col)
+        x_max, y_max = self.point(self.row + self.height, self.col + self.width)
+        return float(x_min), float(x_max), float(y_min), float(y_max)
+
+    def center(self):
+        """(x, y) of the window centre as decimal strings with enough digits for the zoom."""
+        x, y = self.point(self.row + Fraction(self.height, 2), self.col + Fraction(self.width, 2))
+        with localcontext() as ctx:
+            ctx.prec = digits_for(min(self.pitch())) - 15
+            return str(to_decimal(x)), str(to_decimal(y))
+
+    # ------------------- Rendering -------------------
+    def _keys(self):
+        t = self.tile
+        return [(self.zoom, tx, ty)
+                for ty in range(self.row // t, (self.row + self.height - 1) // t + 1)
+                for tx in range(self.col // t, (self.col + self.width - 1) // t + 1)]
+
+    def _task(self, key, stride=1):
+        zoom, tx, ty = key
+        return (ty * self.tile, tx * self.tile, self.tile, self.tile, float(self.width * zoom),
+                float(self.height * zoom), self.home, self.max_iter, stride)
+
+    def _deep_task(self, key, stride=1):
+        _, tx, ty = key
+        ref_row, ref_col, orbit = self._reference[1]
+        pitch_x, pitch_y = self.pitch()
+        row0, col0 = ty * self.tile, tx * self.tile
+        return (row0, col0, self.tile, self.tile, col0 - ref_col, row0 - ref_row, float(pitch_x), float(pitch_y),
+                orbit, self.max_iter, stride)
+
+    def _reference_orbit(self):
+        """High-precision orbit of the window centre, reused until the window or max_iter changes."""
+        row, col = self.row + self.height // 2, self.col + self.width // 2
+        key = (self.zoom, row, col, self.max_iter)
+        if self._reference is None or self._reference[0] != key:
+            x, y = self.point(row, col)
+            orbit = reference_orbit(x, y, self.max_iter, digits_for(min(self.pitch())))
+            self._reference = key, (row, col, orbit)
+        return self._reference[1]
+
+    def _assemble(self, tiles):
+        counts = np.empty((self.height, self.width), dtype=np.int32)
+        t = self.tile
+        for (_, tx, ty), block in tiles.items():
+            # Overlap of the tile with the window, in window and tile coordinates
+            top, bottom = max(ty * t, self.row), min((ty + 1) * t, self.row + self.height)
+            left, right = max(tx * t, self.col), min((tx + 1) * t, self.col + self.width)
+            counts[top - self.row:bottom - self.row, left - self.col:right - self.col] = \
+                block[top - ty * t:bottom - ty * t, left - tx * t:right - tx * t]
+        return counts
+
+    def frames(self, preview=PREVIEW):
+        """Yield the window's counts: a coarse preview first if tiles are missing, then the full frame."""
+        keys = self._keys()
+        tiles = {key: self.cache.get(key, self.max_iter) for key in keys}
+        missing = [key for key, block in tiles.items() if block is None]
+        self.rendered, self.reused = len(missing), len(keys) - len(missing)
+        make_task, fn = self._task, render_tile
+        if missing and self.deep:
+            self._reference_orbit()
+            make_task, fn = self._deep_task, render_deep_tile
+        if missing and preview > 1:
+            coarse = dict(tiles)
+            tasks = [make_task(key, preview) for key in missing]
+            for key, (_, _, block) in zip(missing, self.renderer.map(tasks, fn)):
+                coarse[key] = block.repeat(preview, 0).repeat(preview, 1)[:self.tile, :self.tile]
+            yield self._assemble(coarse)
+        for key, (_, _, block) in zip(missing, self.renderer.map([make_task(key) for key in missing], fn)):
+            self.cache.put(key, block, self.max_iter)
+            tiles[key] = block
+        yield self._assemble(tiles)
+
+    def render(self):
+        """The full frame, without a preview."""
+        return list(self.frames(preview=1))[-1]
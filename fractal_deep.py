@@ -0,0 +1,110 @@
+# fractal_deep.py
+# Perturbation rendering for deep zooms in the Mandelbrot explorer
+#
+# Below a pixel size of ~1e-13, float64 can no longer tell neighbouring pixels
+# apart: near |c| = 2 its spacing is ~4.4e-16, so such pixels are only a few
+# hundred units in the last place apart, and the rounding error the iteration
+# amplifies over a few hundred steps is larger than that. The explorer switches
+# a decade earlier, at DEEP_PITCH. Instead of iterating every pixel in high
+# precision:
+#   1. one reference point C (the window centre) is iterated with ``decimal``
+#      at enough digits for the zoom, giving its orbit Z_0, Z_1, ...
+#   2. every pixel c = C + dc is iterated as its offset from that orbit,
+#          dz' = 2 Z_m dz + dz^2 + dc,    z = Z_m + dz
+#      in plain complex128; dc and dz are tiny but float64 holds tiny values
+#      with full relative precision, so pixels stay distinct
+# The offset form loses precision where a pixel's orbit passes closer to 0
+# than to the reference (a "glitch"), and it cannot run past the end of the
+# reference orbit when C escapes early. Both cases are detected per pixel and
+# rebased: dz becomes the full value z and the pixel restarts from Z_0, which
+# is exact because Z_0 = 0. One reference orbit then serves the whole frame.
+#
+# Offsets are plain float64, so zooms work down to a pixel size of ~1e-290,
+# where they would underflow.
+
+import math
+from decimal import Decimal, localcontext
+
+import numpy as np
+
+# Pixel size below which the explorer switches to perturbation: ten times the
+# ~1e-13 where float64 breaks down, because the loss is gradual (edges turn grainy
+# and blocky before neighbouring pixels fully merge) and switching early costs
+# only one reference orbit per frame.
+DEEP_PITCH = 1e-12
+
+
+def digits_for(pitch):
+    """Decimal digits the reference orbit needs to resolve pixels of size ``pitch`` (a float or Fraction)."""
+    return max(20, len(str(math.floor(1 / pitch))) + 20)
+
+
+def to_decimal(value):
+    """Decimal from a Fraction, int, str or Decimal in the current context."""
+    if hasattr(value, "numerator") and not isinstance(value, int):
+        return Decimal(value.numerator) / Decimal(value.denominator)
+    return +Decimal(value)
+
+
+def reference_orbit(cx, cy, max_iter, digits):
+    """Orbit Z_0 = 0, Z_1, ... of C = cx + i*cy in ``digits``-digit decimal, as complex128.
+
+    Stops after max_iter steps, or at the first point with |Z| > 2.
+    """
+    orbit = [0j]
+    with localcontext() as ctx:
+        ctx.prec = digits
+        cx, cy = to_decimal(cx), to_decimal(cy)
+        zx = zy = Decimal(0)
+        for _ in range(max_iter):
+            zx, zy = zx * zx - zy * zy + cx, 2 * zx * zy + cy
+            z = complex(float(zx), float(zy))
+            orbit.append(z)
+            if z.real * z.real + z.imag * z.imag > 4.0:
+                break
+    return np.array(orbit, dtype=np.complex128)
+
+
+def perturbation_counts(dc, orbit, max_iter):
+    """Iteration counts for pixels at offsets ``dc`` from the reference point of ``orbit``.
+
+    Same meaning as fractal_render.escape_counts for the points C + dc.
+    """
+    dc = np.asarray(dc, dtype=np.complex128)
+    counts = np.full(dc.shape, max_iter, dtype=np.int32)
+    flat = counts.ravel()
+    dc = dc.ravel()
+    index = np.arange(len(dc))
+    dz = np.zeros_like(dc)
+    m = np.zeros(len(dc), dtype=np.intp)  # each pixel's position along the reference orbit
+    last = len(orbit) - 1
+    for i in range(max_iter):
+        if not len(index):
+            break
+        z = orbit[m] + dz
+        magnitude = z.real ** 2 + z.imag ** 2
+        escaped = magnitude > 4.0
+        if escaped.any():
+            flat[index[escaped]] = i
+            keep = ~escaped
+            index, dz, dc, m, z, magnitude = index[keep], dz[keep], dc[keep], m[keep], z[keep], magnitude[keep]
+        # Glitch (closer to 0 than to the reference) or end of the reference: rebase onto Z_0 = 0
+        rebase = (magnitude < dz.real ** 2 + dz.imag ** 2) | (m == last)
+        if rebase.any():
+            dz[rebase] = z[rebase]
+            m[rebase] = 0
+        dz = (2 * orbit[m] + dz) * dz + dc
+        m += 1
+    return counts
+
+
+def render_deep_tile(task):
+    """Counts for one tile: task is (row0, col0, rows, cols, dx, dy, pitch_x, pitch_y, orbit, max_iter, stride).
+
+    (row0, col0) is the tile's lattice position, as in render_tile; (dx, dy) is
+    its top-left pixel's offset in pixels from the reference point.
+    """
+    row0, col0, rows, cols, dx, dy, pitch_x, pitch_y, orbit, max_iter, stride = task
+    real = (dx + np.arange(0, cols, stride)) * pitch_x
+    imag = (dy + np.arange(0, rows, stride)) * pitch_y
+    return row0, col0, perturbation_counts(real[None, :] + 1j * imag[:, None], orbit, max_iter)
@@ -0,0 +1,314 @@
+# generative_backend.py
+# Headless, batched renderer shared by "Generative art" and "Fractal mosaic"
+#
+# A scene is first collected into a Primitives buffer, then drawn. Nothing is
+# drawn while the scene is being generated:
+#   segments  (x1, y1, x2, y2) with a width
+#   polygons  vertex lists stored back to back, with offsets per polygon
+# Every primitive carries a level (recursion depth) and a palette index. The
+# buffers are preallocated and double when full, so scenes are appended in
+# whole arrays (one call per recursion level) instead of one call per shape.
+#
+# Drawing groups primitives into batches of equal (level, kind, colour,
+# width) and rasterizes each batch in one NumPy pass into a coverage mask,
+# then paints the mask with the batch colour:
+#   segments  pixels whose centre lies within half the width of a segment
+#             (round caps), tested over small boxes along each segment
+#   polygons  even-odd scanline fill, all edges of the batch at once
+# Batches are painted from shallow to deep levels, so finer detail lies on
+# top. Large canvases are cut into tiles; each tile gets only the primitives
+# that overlap it and is rendered in a process pool. save_png() writes the
+# tiles band by band, so a 16k x 16k image never has to be held in memory.
+
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+TILE = 1024
+_MAX_POINTS = 1 << 20  # pixels tested per rasterizing pass
+
+
+class Primitives:
+    """Growable, preallocated arrays of segments and polygons with level and palette colour."""
+
+    def __init__(self, palette, segments=1024, polygons=256, vertices=2048):
+        self.palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        self.segments = np.empty((segments, 4))
+        self.segment_width = np.empty(segments, dtype=np.float32)
+        self.segment_level = np.empty(segments, dtype=np.int16)
+        self.segment_color = np.empty(segments, dtype=np.int16)
+        self.vertices = np.empty((vertices, 2))
+        self.polygon_start = np.zeros(polygons + 1, dtype=np.int64)  # offsets into vertices
+        self.polygon_level = np.empty(polygons, dtype=np.int16)
+        self.polygon_color = np.empty(polygons, dtype=np.int16)
+        self.n_segments = self.n_polygons = self.n_vertices = 0
+
+    @staticmethod
+    def _grow(array, needed):
+        if needed <= len(array):
+            return array
+        grown = np.empty((max(needed, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add_segments(self, coords, width, level, color):
+        """Append an (n, 4) array of segments; width, level and color are scalars or length-n arrays."""
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4)
+        start, stop = self.n_segments, self.n_segments + len(coords)
+        self.segments = self._grow(self.segments, stop)
+        self.segment_width = self._grow(self.segment_width, stop)
+        self.segment_level = self._grow(self.segment_level, stop)
+        self.segment_color = self._grow(self.segment_color, stop)
+        self.segments[start:stop] = coords
+        self.segment_width[start:stop] = width
+        self.segment_level[start:stop] = level
+        self.segment_color[start:stop] = color
+        self.n_segments = stop
+
+    def add_polygons(self, vertices, counts, level, color):
+        """Append polygons given as concatenated (m, 2) vertices and the vertex count of each."""
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        counts = np.asarray(counts, dtype=np.int64)
+        start, stop = self.n_polygons, self.n_polygons + len(counts)
+        self.vertices = self._grow(self.vertices, self.n_vertices + len(vertices))
+        self.polygon_start = self._grow(self.polygon_start, stop + 1)
+        self.polygon_level = self._grow(self.polygon_level, stop)
+        self.polygon_color = self._grow(self.polygon_color, stop)
+        self.vertices[self.n_vertices:self.n_vertices + len(vertices)] = vertices
+        self.polygon_start[start + 1:stop + 1] = self.n_vertices + np.cumsum(counts)
+        self.polygon_level[start:stop] = level
+        self.polygon_color[start:stop] = color
+        self.n_polygons, self.n_vertices = stop, self.n_vertices + len(vertices)
+
+    def arrays(self, segment_mask=None, polygon_mask=None):
+        """Trimmed copies of the buffers (optionally only the masked primitives), ready to pickle."""
+        ns, npoly = self.n_segments, self.n_polygons
+        seg = np.arange(ns) if segment_mask is None else np.flatnonzero(segment_mask)
+        poly = np.arange(npoly) if polygon_mask is None else np.flatnonzero(polygon_mask)
+        starts = self.polygon_start[poly]
+        counts = self.polygon_start[poly + 1] - starts
+        return {
+            "palette": self.palette,
+            "segments": self.segments[seg], "segment_width": self.segment_width[seg],
+            "segment_level": self.segment_level[seg], "segment_color": self.segment_color[seg],
+            "vertices": self.vertices[concat_ranges(starts, counts)], "polygon_counts": counts,
+            "polygon_level": self.polygon_level[poly], "polygon_color": self.polygon_color[poly],
+        }
+
+    def bounds(self):
+        """Bounding boxes (x0, y0, x1, y1) of every segment (including width) and polygon."""
+        seg = self.segments[:self.n_segments]
+        pad = self.segment_width[:self.n_segments, None] / 2 + 1
+        segment_boxes = np.hstack([np.minimum(seg[:, :2], seg[:, 2:]) - pad,
+                                   np.maximum(seg[:, :2], seg[:, 2:]) + pad])
+        starts = self.polygon_start[:self.n_polygons]
+        vertices = self.vertices[:self.n_vertices]
+        if self.n_polygons:
+            polygon_boxes = np.hstack([np.minimum.reduceat(vertices, starts), np.maximum.reduceat(vertices, starts)])
+        else:
+            polygon_boxes = np.empty((0, 4))
+        return segment_boxes, polygon_boxes
+
+
+def concat_ranges(starts, counts):
+    """Concatenated arange(start, start + count) for each pair, without a Python loop."""
+    return np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+
+
+def _batches(*keys):
+    """Group indices by equal key tuples; yields (key, indices) in sorted key order."""
+    if not len(keys[0]):
+        return
+    order = np.lexsort(keys[::-1])
+    sorted_keys = np.stack([np.asarray(k, dtype=np.float64)[order] for k in keys])
+    cuts = np.flatnonzero((np.diff(sorted_keys, axis=1) != 0).any(axis=0)) + 1
+    for group in np.split(order, cuts):
+        yield tuple(k[group[0]].item() for k in keys), group
+
+
+# ------------------- Rasterizing -------------------
+def _stroke_segments(mask, segments, width):
+    """Mark every pixel whose centre is within width / 2 of one of the segments (all of one width)."""
+    h, w = mask.shape
+    radius = max(width / 2, 0.5)
+    # Cut long segments into pieces no longer than max(width, 32), so every
+    # piece has a small bounding box and no box is mostly empty
+    delta = segments[:, 2:] - segments[:, :2]
+    pieces = np.maximum(1, np.ceil(np.hypot(delta[:, 0], delta[:, 1]) / max(width, 32))).astype(np.int64)
+    which = np.repeat(np.arange(len(segments)), pieces)
+    k = concat_ranges(np.zeros(len(segments), dtype=np.int64), pieces)
+    a = segments[which, :2] + (k / pieces[which])[:, None] * delta[which]
+    b = segments[which, :2] + ((k + 1) / pieces[which])[:, None] * delta[which]
+    # Pixel boxes around each piece, clipped to the mask
+    x0 = np.clip(np.floor(np.minimum(a[:, 0], b[:, 0]) - radius), 0, w).astype(np.int64)
+    x1 = np.clip(np.ceil(np.maximum(a[:, 0], b[:, 0]) + radius), 0, w).astype(np.int64)
+    y0 = np.clip(np.floor(np.minimum(a[:, 1], b[:, 1]) - radius), 0, h).astype(np.int64)
+    y1 = np.clip(np.ceil(np.maximum(a[:, 1], b[:, 1]) + radius), 0, h).astype(np.int64)
+    box_w, area = x1 - x0, (x1 - x0) * (y1 - y0)
+    # Visit the boxes in passes of at most _MAX_POINTS pixels
+    total = np.cumsum(area)
+    cuts = np.searchsorted(total, np.arange(_MAX_POINTS, total[-1], _MAX_POINTS), side="right")
+    edges = np.unique(np.concatenate([[0], cuts, [len(area)]]))
+    for first, last in zip(edges[:-1], edges[1:]):
+        n = area[first:last]
+        piece = np.repeat(np.arange(first, last), n)
+        local = concat_ranges(np.zeros(len(n), dtype=np.int64), n)
+        col = x0[piece] + local % box_w[piece]
+        row = y0[piece] + local // box_w[piece]
+        # Distance from the pixel centre to the piece
+        pa = np.column_stack([col + 0.5, row + 0.5]) - a[piece]
+        ab = b[piece] - a[piece]
+        t = np.clip((pa * ab).sum(axis=1) / np.maximum((ab * ab).sum(axis=1), 1e-12), 0, 1)
+        off = pa - t[:, None] * ab
+        near = (off * off).sum(axis=1) <= radius * radius
+        mask[row[near], col[near]] = True
+
+
+def _fill_polygons(mask, vertices, counts):
+    """Even-odd scanline fill of polygons (pixel centres at +0.5) into ``mask``."""
+    h, w = mask.shape
+    polygon = np.repeat(np.arange(len(counts)), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    following = np.arange(len(vertices)) + 1
+    following = np.where(following - starts == np.repeat(counts, counts), starts, following)
+    x0, y0 = vertices[:, 0], vertices[:, 1]
+    x1, y1 = vertices[following, 0], vertices[following, 1]
+    # Rows whose centre lies in [min y, max y) of each edge
+    low = np.clip(np.ceil(np.minimum(y0, y1) - 0.5), 0, h).astype(np.int64)
+    high = np.clip(np.ceil(np.maximum(y0, y1) - 0.5), 0, h).astype(np.int64)
+    rows = np.maximum(high - low, 0)
+    if not rows.sum():
+        return
+    edge = np.repeat(np.arange(len(vertices)), rows)
+    row = low[edge] + np.arange(rows.sum()) - np.repeat(np.cumsum(rows) - rows, rows)
+    yc = row + 0.5
+    x = x0[edge] + (yc - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+    order = np.lexsort((x, row, polygon[edge]))
+    x, row = x[order], row[order]
+    # Crossings come in pairs per (polygon, row); fill between each pair
+    c0 = np.clip(np.ceil(x[0::2] - 0.5), 0, w).astype(np.int64)
+    c1 = np.clip(np.ceil(x[1::2] - 0.5), 0, w).astype(np.int64)
+    r = row[0::2]
+    diff = np.bincount(r * (w + 1) + c0, minlength=h * (w + 1)) - np.bincount(r * (w + 1) + c1, minlength=h * (w + 1))
+    mask |= np.cumsum(diff.reshape(h, w + 1), axis=1)[:, :w] > 0
+
+
+def draw(arrays, width, height, x0=0, y0=0, background=(0, 0, 0)):
+    """Rasterize primitive ``arrays`` (from Primitives.arrays) into an RGB image of the given region."""
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = background
+    palette = arrays["palette"]
+    shift = np.array([x0, y0, x0, y0])
+    vertices = arrays["vertices"] - shift[:2]
+    counts = arrays["polygon_counts"]
+    vertex_start = np.cumsum(counts) - counts
+    polygons = _batches(arrays["polygon_level"], np.zeros(len(counts)), arrays["polygon_color"], np.zeros(len(counts)))
+    segments = _batches(arrays["segment_level"], np.ones(len(arrays["segments"])), arrays["segment_color"],
+                        arrays["segment_width"])
+    mask = np.empty((height, width), dtype=bool)
+    # Polygons before segments within a level, then by colour and width
+    for (level, kind, color, w), members in sorted([*polygons, *segments], key=lambda batch: batch[0]):
+        if kind == 0:
+            points = vertices[concat_ranges(vertex_start[members], counts[members])]
+            low, high = points.min(axis=0), points.max(axis=0)
+        else:
+            points = arrays["segments"][members] - shift
+            low = np.minimum(points[:, :2], points[:, 2:]).min(axis=0) - w / 2 - 1
+            high = np.maximum(points[:, :2], points[:, 2:]).max(axis=0) + w / 2 + 1
+        # Only the part of the tile the batch can touch is cleared, filled and painted
+        left, top = np.clip(np.floor(low).astype(int), 0, [width, height])
+        right, bottom = np.clip(np.ceil(high).astype(int) + 1, 0, [width, height])
+        if left >= right or top >= bottom:
+            continue
+        sub = mask[top:bottom, left:right]
+        sub[:] = False
+        if kind == 0:
+            _fill_polygons(sub, points - [left, top], counts[members])
+        else:
+            _stroke_segments(sub, points - [left, top, left, top], w)
+        np.copyto(image[top:bottom, left:right], palette[int(color)], where=sub[..., None])
+    return image
+
+
+def _draw_tile(task):
+    arrays, x0, y0, width, height, background = task
+    return x0, y0, draw(arrays, width, height, x0, y0, background)
+
+
+# ------------------- Tiled rendering -------------------
+def _overlapping(boxes, x0, y0, width, height):
+    return (boxes[:, 0] < x0 + width) & (boxes[:, 2] >= x0) & (boxes[:, 1] < y0 + height) & (boxes[:, 3] >= y0)
+
+
+class TiledRenderer:
+    """Renders Primitives tile by tile, in a process pool when there is more than one tile."""
+
+    def __init__(self, tile=TILE, processes=None):
+        self.tile = tile
+        self.processes = os.cpu_count() if processes is None else processes
+        self._pool = None
+
+    def _tasks(self, primitives, size, y0, background):
+        """One task per tile of the band starting at row y0, with just the primitives that overlap it."""
+        width, height = size
+        segment_boxes, polygon_boxes = primitives.bounds()
+        h = min(self.tile, height - y0)
+        for x0 in range(0, width, self.tile):
+            w = min(self.tile, width - x0)
+            arrays = primitives.arrays(_overlapping(segment_boxes, x0, y0, w, h),
+                                       _overlapping(polygon_boxes, x0, y0, w, h))
+            yield arrays, x0, y0, w, h, background
+
+    def _map(self, tasks):
+        tasks = list(tasks)
+        if self.processes > 1 and len(tasks) > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.processes)
+            return self._pool.map(_draw_tile, tasks)
+        return map(_draw_tile, tasks)
+
+    def bands(self, primitives, size, background=(0, 0, 0)):
+        """Yield (y0, band) RGB strips of one tile row each, top to bottom."""
+        width, height = size
+        for y0 in range(0, height, self.tile):
+            band = np.empty((min(self.tile, height - y0), width, 3), dtype=np.uint8)
+            for x0, _, block in self._map(self._tasks(primitives, size, y0, background)):
+                band[:, x0:x0 + block.shape[1]] = block
+            yield y0, band
+
+    def render(self, primitives, size, background=(0, 0, 0)):
+        """The whole (height, width, 3) image."""
+        return np.concatenate([band for _, band in self.bands(primitives, size, background)])
+
+    def save_png(self, primitives, size, path, background=(0, 0, 0)):
+        """Render straight to an RGB PNG, one band at a time (memory ~ one tile row)."""
+        width, height = size
+
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+        compressor = zlib.compressobj(6)
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+            for _, band in self.bands(primitives, size, background):
+                rows = np.empty((band.shape[0], 1 + 3 * width), dtype=np.uint8)
+                rows[:, 0] = 0  # no filter
+                rows[:, 1:] = band.reshape(band.shape[0], -1)
+                data = compressor.compress(rows.tobytes())
+                if data:
+                    f.write(chunk(b"IDAT", data))
+            f.write(chunk(b"IDAT", compressor.flush()) + chunk(b"IEND", b""))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,152 @@
+# levy_engine.py
+# Headless geometry engine for the Levy C curve
+#
+# The turtle version expands the L-system  F -> +F--F+  (turns of 45 degrees)
+# by recursion, one forward() call per segment. Expanded fully, segment k of
+# a depth-d curve is reached through d choices, one per binary digit of k: a
+# 0 bit takes the first branch (a net left turn of 45), a 1 bit the second (a
+# net right turn of 45). So its heading is
+#     45 * (d - 2 * popcount(k))  degrees
+# and all its segments have length length / 1.414**d. The engine computes the
+# headings of a whole range of k at once, looks up their step vectors in an
+# 8-entry table and takes a cumulative sum, giving the vertex array without any
+# turtle state. Ranges can be produced one after another (vertex_chunks), so a
+# depth-24 curve (16M segments) can be drawn or written chunk by chunk in
+# bounded memory.
+#
+# Raster output marks every pixel a segment passes through (points spaced at
+# most one pixel apart along each segment), accumulated chunk by chunk into
+# one boolean canvas. The canvas uses the turtle screen's frame: origin in the
+# centre, y up.
+
+import math
+
+import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:  # PNG output needs Pillow; SVG and arrays do not
+    Image = None
+
+CHUNK = 1 << 20
+SHRINK = 1.414  # per level, as in levy_c_curve
+
+_POP16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.int8)
+# Unit step for each multiple of 45 degrees
+_UNIT = np.array([(math.cos(math.radians(45 * i)), math.sin(math.radians(45 * i))) for i in range(8)])
+
+
+def segment_count(depth):
+    return 1 << depth
+
+
+def headings(depth, first=0, count=None):
+    """Heading of segments first..first+count-1, in multiples of 45 degrees (0-7, 0 = east)."""
+    if count is None:
+        count = segment_count(depth) - first
+    k = np.arange(first, first + count, dtype=np.int64)
+    ones = _POP16[k & 0xFFFF] + _POP16[(k >> 16) & 0xFFFF] + _POP16[(k >> 32) & 0xFFFF]
+    return (depth - 2 * ones.astype(np.int64)) % 8
+
+
+def vertex_chunks(depth, length=200, start=(-100, 0), heading=0, chunk=CHUNK):
+    """Yield (m + 1, 2) vertex arrays for consecutive runs of m segments.
+
+    Each chunk starts with the last vertex of the previous one, so chunks join
+    into one continuous polyline. ``heading`` is the starting direction in degrees.
+    """
+    step = length / SHRINK ** depth
+    c, s = math.cos(math.radians(heading)), math.sin(math.radians(heading))
+    steps = _UNIT @ np.array([[c, s], [-s, c]]) * step  # the table, rotated by ``heading``
+    position = np.array(start, dtype=np.float64)
+    total = segment_count(depth)
+    for first in range(0, total, chunk):
+        count = min(chunk, total - first)
+        points = np.empty((count + 1, 2))
+        points[0] = position
+        np.cumsum(steps[headings(depth, first, count)], axis=0, out=points[1:])
+        points[1:] += position
+        position = points[-1].copy()
+        yield points
+
+
+def vertices(depth, length=200, start=(-100, 0), heading=0):
+    """The whole curve as a (2**depth + 1, 2) vertex array."""
+    return np.concatenate([chunk if i == 0 else chunk[1:]
+                           for i, chunk in enumerate(vertex_chunks(depth, length, start, heading))])
+
+
+# ------------------- Output -------------------
+def rasterize(chunks, size=(800, 600), scale=1.0, thickness=1, canvas=None):
+    """Mark the pixels under a stream of vertex chunks on a (height, width) boolean canvas.
+
+    Coordinates are turtle-style (origin at the centre, y up) times ``scale``.
+    """
+    width, height = size
+    if canvas is None:
+        canvas = np.zeros((height, width), dtype=bool)
+    flat = canvas.ravel()
+    for points in chunks:
+        points = points * scale
+        delta = np.diff(points, axis=0)
+        # All segments of one curve have the same length, but allow any input
+        samples = max(1, int(np.ceil(np.abs(delta).max(initial=0))))
+        t = np.arange(samples) / samples
+        xs = (points[:-1, 0, None] + delta[:, 0, None] * t).ravel() + width / 2
+        ys = height / 2 - (points[:-1, 1, None] + delta[:, 1, None] * t).ravel()
+        xs, ys = np.append(xs, points[-1, 0] + width / 2), np.append(ys, height / 2 - points[-1, 1])
+        col, row = np.floor(xs).astype(np.intp), np.floor(ys).astype(np.intp)
+        inside = (col >= 0) & (col < width) & (row >= 0) & (row < height)
+        flat[row[inside] * width + col[inside]] = True
+    if thickness > 1:
+        canvas = _thicken(canvas, thickness)
+    return canvas
+
+
+def _thicken(canvas, thickness):
+    """Grow marked pixels into thickness x thickness squares."""
+    out = canvas.copy()
+    for dr in range(thickness):
+        for dc in range(thickness):
+            if dr or dc:
+                out[dr:, dc:] |= canvas[:canvas.shape[0] - dr, :canvas.shape[1] - dc]
+    return out
+
+
+def save_png(canvas, path, color=(0, 0, 255), background=(255, 255, 255)):
+    """Write a boolean canvas as an RGB PNG (blue on white, like the turtle drawing)."""
+    if Image is None:
+        raise RuntimeError("PNG output needs Pillow (pip install pillow)")
+    rgb = np.where(canvas[..., None], np.array(color, np.uint8), np.array(background, np.uint8))
+    Image.fromarray(rgb.astype(np.uint8), "RGB").save(path)
+
+
+def save_svg(chunks, path, size=(800, 600), scale=1.0, color="blue", stroke_width=2):
+    """Stream vertex chunks to an SVG file, one <polyline> per chunk."""
+    width, height = size
+    with open(path, "w") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'viewBox="{-width / 2} {-height / 2} {width} {height}">\n'
+                f'<rect x="{-width / 2}" y="{-height / 2}" width="{width}" height="{height}" fill="white"/>\n'
+                f'<g fill="none" stroke="{color}" stroke-width="{stroke_width}" stroke-linejoin="round" '
+                f'transform="scale({scale},{-scale})">\n')
+        for points in chunks:
+            f.write('<polyline points="')
+            np.savetxt(f, points, fmt="%.3f", delimiter=",", newline=" ")
+            f.write('"/>\n')
+        f.write("</g>\n</svg>\n")
+
+
+def benchmark(depth=24, size=(4000, 3000), scale=5.0):
+    """Stream a deep curve into a raster and report time and peak chunk memory."""
+    import time
+    t0 = time.perf_counter()
+    canvas = rasterize(vertex_chunks(depth), size, scale)
+    t1 = time.perf_counter()
+    print(f"depth {depth}: {segment_count(depth):,} segments rasterized to {size[0]}x{size[1]} in {t1 - t0:.2f}s "
+          f"({segment_count(depth) / (t1 - t0) / 1e6:.1f}M segments/s, {int(canvas.sum()):,} pixels set, "
+          f"chunks of {CHUNK:,} segments = {(CHUNK + 1) * 16 / 2 ** 20:.0f} MB of vertices)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,299 @@
+# markov_model.py
+# Compact transition tables for the Markov text generator
+#
+# The original word map is a dict of lists with one string reference per
+# follower occurrence, so it grows with the corpus. Here:
+#   - tokens are interned once (Vocabulary) and the corpus becomes an int32 array
+#   - a state is the tuple of the last ``order`` token ids; every distinct
+#     (state, follower) pair is counted once
+#   - the table is stored CSR-style: states sorted, and the followers of state
+#     s with their cumulative counts at offsets[s]:offsets[s + 1]
+# A follower is sampled by drawing r below the state's total and bisecting the
+# cumulative counts. Each transition also stores the index of the state it
+# leads to, so generation walks the table by index without building keys or
+# lists. Memory is proportional to the number of distinct transitions, not
+# to the length of the corpus.
+#
+# save() writes the table to a versioned binary file: a fixed header, the
+# tokens as one newline-separated UTF-8 blob, then each array raw and 8-byte
+# aligned. load() memory-maps that file and views the arrays in place, so a
+# generator starts without parsing or copying, and every process that loads
+# the same file shares one copy of it in the page cache.
+
+import mmap
+import os
+import random
+import struct
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
+MAGIC = b"MARKOVTT"
+VERSION = 1
+# magic, version, order, token count, state count, transition count, token blob bytes
+_HEADER = struct.Struct("<8sIIQQQQ")
+
+
+class _Ids(dict):
+    """token -> id; looking up an unseen token assigns it the next id."""
+
+    def __init__(self, tokens):
+        super().__init__()
+        self.tokens = tokens
+
+    def __missing__(self, token):
+        index = self[token] = len(self.tokens)
+        self.tokens.append(token)
+        return index
+
+
+class Vocabulary:
+    """Interns tokens to consecutive integer ids."""
+
+    def __init__(self, tokens=()):
+        self.tokens = []
+        self.ids = _Ids(self.tokens)  # known tokens are found without leaving C
+        for token in tokens:
+            self.intern(token)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def intern(self, token):
+        return self.ids[token]
+
+    def encode(self, lines):
+        """Int32 ids of the whitespace-separated tokens in ``lines`` (a string or an iterable of strings)."""
+        if isinstance(lines, str):
+            lines = [lines]
+        ids = array("i")
+        for line in lines:
+            ids.extend(map(self.ids.__getitem__, line.split()))
+        return np.array(ids, dtype=np.int32)
+
+
+# ------------------- Counting -------------------
+def _pack(rows):
+    """Rows of token ids as one int64 key each, ordered like the rows; None if they would not fit."""
+    base = int(rows.max()) + 1 if rows.size else 1
+    if base ** rows.shape[1] >= 1 << 63:
+        return None
+    keys = np.zeros(len(rows), dtype=np.int64)
+    for column in rows.T:
+        keys *= base
+        keys += column
+    return keys
+
+
+def merge_counts(grams, counts):
+    """Sum the counts of equal rows of ``grams``; rows come back sorted, first column most significant."""
+    if not len(grams):
+        return grams, counts
+    keys = _pack(grams)
+    sort = np.lexsort(grams.T[::-1]) if keys is None else np.argsort(keys, kind="stable")
+    grams, counts = grams[sort], counts[sort]
+    first = np.ones(len(grams), dtype=bool)
+    first[1:] = (grams[1:] != grams[:-1]).any(axis=1)
+    starts = np.flatnonzero(first)
+    return grams[starts], np.add.reduceat(counts, starts)
+
+
+def count_transitions(ids, order=1):
+    """Distinct n-grams (order tokens of state, then the follower) of an id array and their counts.
+
+    Returns (grams, counts): grams is a sorted (T, order + 1) int32 array.
+    """
+    ids = np.asarray(ids, dtype=np.int32)
+    n = max(len(ids) - order, 0)
+    grams = np.stack([ids[i:i + n] for i in range(order + 1)], axis=1)
+    return merge_counts(grams, np.ones(n, dtype=np.int64))
+
+
+def _find_rows(table, rows):
+    """Index in the sorted, distinct ``table`` of each of ``rows``, or -1 where a row is not there."""
+    both = np.concatenate([table, rows])
+    keys = _pack(both)
+    if keys is not None:
+        found = np.searchsorted(keys[:len(table)], keys[len(table):])
+        hit = found < len(table)
+        hit[hit] = keys[:len(table)][found[hit]] == keys[len(table):][hit]
+        return np.where(hit, found, -1).astype(np.int32)
+    _, inverse = np.unique(both, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    position = np.full(len(both), -1, dtype=np.int32)
+    position[inverse[:len(table)]] = np.arange(len(table), dtype=np.int32)
+    return position[inverse[len(table):]]
+
+
+# ------------------- Model -------------------
+def _sections(order, states, transitions):
+    """(attribute, dtype, length) of the arrays stored after the token blob, in file order."""
+    return [("states", "<i4", states * order), ("offsets", "<i8", states + 1), ("followers", "<i4", transitions),
+            ("cumulative", "<i8", transitions), ("next_state", "<i4", transitions)]
+
+
+class MarkovModel:
+    """An order-n transition table in CSR form.
+
+    tokens      token strings, indexed by id
+    states      (S, order) int32 token ids, sorted
+    offsets     (S + 1,) int64: the transitions of state s are offsets[s]:offsets[s + 1]
+    followers   (T,) int32 token id that each transition emits
+    cumulative  (T,) int64 running total of transition counts over the whole table
+    next_state  (T,) int32 state each transition leads to, -1 where that state has no followers
+    """
+
+    def __init__(self, tokens, states, offsets, followers, cumulative, next_state):
+        self.tokens = tokens
+        self.states = states
+        self.offsets = offsets
+        self.followers = followers
+        self.cumulative = cumulative
+        self.next_state = next_state
+        self._ids = None
+
+    @classmethod
+    def from_counts(cls, tokens, grams, counts):
+        """Build from sorted, distinct n-grams and their counts (as returned by count_transitions)."""
+        order = grams.shape[1] - 1
+        new = np.ones(len(grams), dtype=bool)
+        new[1:] = (grams[1:, :order] != grams[:-1, :order]).any(axis=1)
+        starts = np.flatnonzero(new)
+        states = np.ascontiguousarray(grams[starts, :order])
+        # The state after a transition is its own state shifted by one token, then the follower
+        return cls(list(tokens), states, np.append(starts, len(grams)).astype(np.int64),
+                   np.ascontiguousarray(grams[:, order]), np.cumsum(counts, dtype=np.int64),
+                   _find_rows(states, grams[:, 1:]))
+
+    @classmethod
+    def train(cls, lines, order=1):
+        """Build from a string or an iterable of lines (e.g. an open file), read once."""
+        if order < 1:
+            raise ValueError("order must be at least 1")
+        vocabulary = Vocabulary()
+        ids = vocabulary.encode(lines)
+        grams, counts = count_transitions(ids, order)
+        return cls.from_counts(vocabulary.tokens, grams.reshape(-1, order + 1), counts)
+
+    # ------------------- Model files -------------------
+    def save(self, path):
+        """Write the model to a binary file for load(); the file is replaced atomically."""
+        blob = "\n".join(self.tokens).encode("utf-8")
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.order, len(self.tokens), len(self.states), len(self.followers),
+                                 len(blob)))
+            f.write(blob + bytes(-len(blob) % 8))
+            for name, dtype, _ in _sections(self.order, len(self.states), len(self.followers)):
+                data = np.ascontiguousarray(getattr(self, name), dtype=dtype)
+                f.write(data)
+                f.write(bytes(-data.nbytes % 8))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a file written by save(); the arrays are read-only views into the mapping."""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < _HEADER.size or buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a Markov model file")
+        _, version, order, n_tokens, n_states, n_transitions, n_bytes = _HEADER.unpack_from(buffer)
+        if version != VERSION:
+            raise ValueError(f"{path}: model file version {version}, this reader supports {VERSION}")
+        offset = _HEADER.size
+        tokens = buffer[offset:offset + n_bytes].decode("utf-8").split("\n") if n_tokens else []
+        offset += n_bytes + -n_bytes % 8
+        arrays = {}
+        for name, dtype, length in _sections(order, n_states, n_transitions):
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=length, offset=offset)
+            offset += arrays[name].nbytes + -arrays[name].nbytes % 8
+        arrays["states"] = arrays["states"].reshape(n_states, order)
+        return cls(tokens, **arrays)
+
+    def __len__(self):
+        return len(self.states)
+
+    @property
+    def ids(self):
+        """token -> id, built on first use so that loading a model file does not pay for it."""
+        if self._ids is None:
+            self._ids = {token: i for i, token in enumerate(self.tokens)}
+        return self._ids
+
+    @property
+    def order(self):
+        return self.states.shape[1]
+
+    @property
+    def nbytes(self):
+        """Bytes held by the table arrays (the token strings not included)."""
+        return sum(a.nbytes for a in (self.states, self.offsets, self.followers, self.cumulative, self.next_state))
+
+    # ------------------- Sampling -------------------
+    def random_state(self, rng=random):
+        return rng.randrange(len(self.states))
+
+    def find_state(self, token, rng=random):
+        """A random state whose first token is ``token``, or None if there is none."""
+        index = self.ids.get(token)
+        if index is None:
+            return None
+        first = self.states[:, 0]
+        lo, hi = np.searchsorted(first, index, "left"), np.searchsorted(first, index, "right")
+        return rng.randrange(int(lo), int(hi)) if hi > lo else None
+
+    def sample(self, state, rng=random):
+        """Index of a random transition out of ``state``, weighted by its count."""
+        lo, hi = int(self.offsets[state]), int(self.offsets[state + 1])
+        base = int(self.cumulative[lo - 1]) if lo else 0
+        r = base + rng.randrange(int(self.cumulative[hi - 1]) - base)
+        return bisect_right(self.cumulative, r, lo, hi)
+
+    def generate(self, length, start=None, rng=random):
+        """Token ids of a random walk of ``length`` tokens, beginning with the tokens of state ``start``.
+
+        ``start`` defaults to a random state. A state without followers
+        continues from a random state, whose tokens are emitted as well.
+        """
+        state = self.random_state(rng) if start is None else start
+        out = self.states[state].tolist()
+        while len(out) < length:
+            transition = self.sample(state, rng)
+            out.append(int(self.followers[transition]))
+            state = int(self.next_state[transition])
+            if state < 0:
+                state = self.random_state(rng)
+                out.extend(self.states[state].tolist())
+        return out[:length]
+
+    def text(self, ids):
+        return " ".join(self.tokens[i] for i in ids)
+
+
+def benchmark(tokens=2_000_000, vocabulary=50_000, order=2, seed=0):
+    """Train on a synthetic Zipf-distributed corpus and compare the table with a dict-of-lists word map."""
+    import sys
+    import time
+    from collections import defaultdict
+    rng = np.random.default_rng(seed)
+    words = [f"w{i}" for i in np.minimum(rng.zipf(1.3, tokens), vocabulary)]
+    corpus = " ".join(words)
+    t0 = time.perf_counter()
+    model = MarkovModel.train(corpus, order)
+    t1 = time.perf_counter()
+    ids = model.generate(100_000, rng=random.Random(seed))
+    t2 = time.perf_counter()
+    word_map = defaultdict(list)
+    for i in range(len(words) - order):
+        word_map[tuple(words[i:i + order])].append(words[i + order])
+    t3 = time.perf_counter()
+    map_bytes = sys.getsizeof(word_map) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in word_map.items())
+    print(f"{tokens:,} tokens, order {order}: {len(model):,} states, {len(model.followers):,} transitions")
+    print(f"  table: built in {t1 - t0:.2f}s, {model.nbytes / 2 ** 20:.1f} MB; "
+          f"{len(ids) / (t2 - t1) / 1e3:.0f}k tokens/s generated")
+    print(f"  word map: built in {t3 - t2:.2f}s, {map_bytes / 2 ** 20:.1f} MB of keys and lists")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,140 @@
+# markov_train.py
+# Parallel, streaming training of markov_model tables from many corpus files
+#
+# Map-reduce over byte ranges of the input files:
+#   map     each shard (path, start, end) is read line by line in a worker,
+#           tokenized against its own Vocabulary and counted with
+#           count_transitions; it returns its tokens, n-grams and counts
+#   reduce  the parent maps each shard's token ids into one shared
+#           Vocabulary and sums equal n-grams with merge_counts
+# A shard owns the lines that start inside its byte range and also reads the
+# first ``order`` tokens after it, so the n-grams that straddle a shard
+# boundary are counted exactly once. Separate files are separate texts: no
+# n-gram spans two files. Only a few shards are in flight at a time, and
+# shard results are merged in batches as large as the table built so far,
+# so memory follows the number of distinct n-grams, not the corpus size.
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from markov_model import MarkovModel, Vocabulary, count_transitions, merge_counts
+
+SHARD_BYTES = 64 << 20
+
+
+def shards(paths, shard_bytes=SHARD_BYTES):
+    """(path, start, end) byte ranges of at most shard_bytes covering every file."""
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), shard_bytes):
+            yield path, start, min(start + shard_bytes, size)
+
+
+def _lines(f, start, end):
+    """Decoded lines of binary file ``f`` whose first byte lies in [start, end)."""
+    position = start
+    if start:
+        f.seek(start - 1)
+        position += len(f.readline()) - 1  # the line holding byte start - 1 belongs to the previous shard
+    while position < end:
+        line = f.readline()
+        if not line:
+            return
+        position += len(line)
+        yield line.decode("utf-8")
+
+
+def count_shard(task):
+    """Map step: (tokens, grams, counts) for task = (path, start, end, order), ids local to the shard."""
+    path, start, end, order = task
+    vocabulary = Vocabulary()
+    with open(path, "rb") as f:
+        ids = vocabulary.encode(_lines(f, start, end))
+        # The next ``order`` tokens complete the n-grams that start near the end of the shard
+        tail = []
+        while len(tail) < order:
+            line = f.readline()
+            if not line:
+                break
+            tail += line.decode("utf-8").split()
+    ids = np.concatenate([ids, vocabulary.encode(" ".join(tail[:order]))])
+    grams, counts = count_transitions(ids, order)
+    return vocabulary.tokens, grams.reshape(-1, order + 1), counts
+
+
+def _in_order(pool, fn, tasks, window):
+    """pool.map with at most ``window`` tasks submitted ahead of the consumer."""
+    futures = deque()
+    for task in tasks:
+        futures.append(pool.submit(fn, task))
+        if len(futures) >= window:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+def train_files(paths, order=1, processes=None, shard_bytes=SHARD_BYTES):
+    """A MarkovModel of the given text files, counted shard by shard in a process pool."""
+    if order < 1:
+        raise ValueError("order must be at least 1")
+    tasks = [(path, start, end, order) for path, start, end in shards(paths, shard_bytes)]
+    processes = os.cpu_count() if processes is None else processes
+    vocabulary = Vocabulary()
+    grams, counts = np.zeros((0, order + 1), dtype=np.int32), np.zeros(0, dtype=np.int64)
+    pending, rows = [], 0
+    pool = ProcessPoolExecutor(processes) if processes > 1 and len(tasks) > 1 else None
+    try:
+        results = _in_order(pool, count_shard, tasks, 2 * processes) if pool else map(count_shard, tasks)
+        for tokens, shard_grams, shard_counts in results:
+            remap = np.fromiter(map(vocabulary.intern, tokens), dtype=np.int32, count=len(tokens))
+            pending.append((remap[shard_grams], shard_counts))
+            rows += len(shard_grams)
+            # Merging only once the new rows outnumber the merged ones keeps re-sorting to O(log shards) per row
+            if rows >= len(grams):
+                grams, counts = merge_counts(np.concatenate([grams] + [g for g, _ in pending]),
+                                             np.concatenate([counts] + [c for _, c in pending]))
+                pending, rows = [], 0
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if pending:
+        grams, counts = merge_counts(np.concatenate([grams] + [g for g, _ in pending]),
+                                     np.concatenate([counts] + [c for _, c in pending]))
+    return MarkovModel.from_counts(vocabulary.tokens, grams, counts)
+
+
+def benchmark(tokens=4_000_000, files=8, vocabulary=50_000, order=2, seed=0):
+    """Train on synthetic corpus files, save the model and time loading it back."""
+    import resource
+    import tempfile
+    import time
+    rng = np.random.default_rng(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(files):
+            paths.append(os.path.join(directory, f"corpus{i}.txt"))
+            words = np.minimum(rng.zipf(1.3, tokens // files), vocabulary)
+            with open(paths[-1], "w") as f:
+                for line in np.array_split(words, len(words) // 12):
+                    f.write(" ".join(f"w{w}" for w in line) + "\n")
+        size = sum(os.path.getsize(path) for path in paths)
+        for processes in sorted({1, os.cpu_count()}):
+            t0 = time.perf_counter()
+            model = train_files(paths, order, processes, shard_bytes=size // (4 * files) + 1)
+            print(f"{size / 2 ** 20:.0f} MB in {files} files, {processes} process(es): trained in "
+                  f"{time.perf_counter() - t0:.2f}s, {len(model.followers):,} transitions")
+        path = os.path.join(directory, "model.bin")
+        model.save(path)
+        t0 = time.perf_counter()
+        loaded = MarkovModel.load(path)
+        t1 = time.perf_counter()
+        loaded.text(loaded.generate(50))
+        print(f"model file {os.path.getsize(path) / 2 ** 20:.1f} MB, loaded in {(t1 - t0) * 1e3:.1f} ms "
+              f"(max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,245 @@
+# productivity_log.py
+# Day-partitioned productivity log with a per-day / per-event count index
+#
+#   productivity_log/
+#       2025-11-06.csv    # Timestamp,Event,Details rows for that day only
+#       2025-11-06.json   # {"Task Added": 3, "Task Completed": 1, ...} for that day
+#       2025-11-07.csv
+#       2025-11-07.json
+#
+# Rows are written through the batched EventLogWriter flusher; each batch is
+# split by day, and only the count files of the days in the batch are
+# rewritten, so a commit costs the same however long the history is. Count
+# reports load only the count files for the days asked for, and row queries
+# only open the partitions in range, so cost scales with the range, not the
+# history.
+#
+# Importing an old single-file log (and the files it was rotated into) is
+# all-or-nothing: the new partitions and counts are written to *.import files,
+# then import.json, listing the renames that install them, is renamed into
+# place as the commit point and applied. On start an import.json left by a
+# crash is applied again, and *.import files without one are discarded, so
+# rows are never imported twice.
+
+import csv
+import datetime
+import glob
+import json
+import os
+import threading
+from collections import Counter
+
+from event_log import EventLogWriter
+
+HEADER = ["Timestamp", "Event", "Details"]
+IMPORT_MANIFEST = "import.json"
+
+
+def _as_date(day):
+    if isinstance(day, datetime.datetime):
+        return day.date()
+    if isinstance(day, datetime.date):
+        return day
+    return datetime.date.fromisoformat(day)
+
+
+def _days(start, end):
+    start, end = _as_date(start), _as_date(end)
+    for offset in range((end - start).days + 1):
+        yield start + datetime.timedelta(days=offset)
+
+
+def _write_file(path, text, replace=True):
+    """Write ``text`` durably; with ``replace``, through a temporary file so readers never see half of it."""
+    target = path + ".tmp" if replace else path
+    with open(target, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    if replace:
+        os.replace(target, path)
+
+
+def _read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return list(reader)
+
+
+def legacy_files(legacy_file):
+    """An old single-file log plus the files EventLogWriter rotated it into (name.<tag>.csv), oldest first."""
+    root, ext = os.path.splitext(legacy_file)
+    rotated = sorted(glob.glob(glob.escape(root) + ".*" + glob.escape(ext)))
+    return [path for path in rotated if path != legacy_file] + ([legacy_file] if os.path.exists(legacy_file) else [])
+
+
+class ProductivityLog(EventLogWriter):
+    """EventLogWriter that writes one CSV per day and keeps per-day event counts up to date."""
+
+    def __init__(self, directory="productivity_log", legacy_file=None, **kwargs):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._index_lock = threading.Lock()   # guards _counts
+        self._write_lock = threading.RLock()  # held while partitions change (flusher commits, imports)
+        self._counts = {}                     # day -> {event: count}, loaded on first use
+        self._day = None
+        self._recover()
+        super().__init__(self.partition_path(datetime.date.today()), header=HEADER, **kwargs)
+        if legacy_file:
+            self.import_legacy(legacy_file)
+
+    def partition_path(self, day):
+        return os.path.join(self.directory, f"{_as_date(day).isoformat()}.csv")
+
+    def counts_path(self, day):
+        return os.path.join(self.directory, f"{_as_date(day).isoformat()}.json")
+
+    def _day_counts(self, day):
+        # Caller holds _index_lock
+        counts = self._counts.get(day)
+        if counts is None:
+            try:
+                with open(self.counts_path(day)) as f:
+                    counts = json.load(f)
+            except FileNotFoundError:
+                counts = {}
+            self._counts[day] = counts
+        return counts
+
+    # ------------------- Writing (flusher thread) -------------------
+    def _commit(self, rows):
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(str(row[0])[:10], []).append(row)
+        with self._write_lock:
+            for day, day_rows in sorted(by_day.items()):
+                self._open_day(day)
+                csv.writer(self._file).writerows(day_rows)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                with self._index_lock:
+                    counts = self._day_counts(day)
+                    for row in day_rows:
+                        counts[row[1]] = counts.get(row[1], 0) + 1
+                    snapshot = json.dumps(counts, sort_keys=True)
+                _write_file(self.counts_path(day), snapshot)
+
+    def _sync(self):
+        with self._write_lock:
+            super()._sync()
+
+    def _open_day(self, day):
+        if self._day == day and self._file:
+            return
+        self._close_day()
+        self.path = self.partition_path(day)
+        self._day = day
+        self._open()
+
+    def _close_day(self):
+        if self._file:
+            super()._sync()
+            self._file.close()
+            self._file = None
+        self._day = None
+
+    # ------------------- Legacy import -------------------
+    def import_legacy(self, csv_path):
+        """Move rows from an old single-file log and its rotated files into day partitions, all at once."""
+        sources = legacy_files(csv_path)
+        if not sources:
+            return
+        self.flush()
+        with self._write_lock:
+            by_day = {}
+            for source in sources:
+                for row in _read_rows(source):
+                    if len(row) >= 2:
+                        by_day.setdefault(row[0][:10], []).append(row)
+            renames = []
+            for day, rows in sorted(by_day.items()):
+                path, counts_path = self.partition_path(day), self.counts_path(day)
+                merged = sorted(_read_rows(path) + rows, key=lambda row: row[0]) if os.path.exists(path) else rows
+                with open(path + ".import", "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(HEADER)
+                    writer.writerows(merged)
+                    f.flush()
+                    os.fsync(f.fileno())
+                _write_file(counts_path + ".import", json.dumps(Counter(row[1] for row in merged), sort_keys=True),
+                            replace=False)
+                renames += [[path + ".import", path], [counts_path + ".import", counts_path]]
+            renames += [[source, source + ".imported"] for source in sources]
+            # Commit point: once the manifest exists the import is completed, if need be on the next start
+            _write_file(os.path.join(self.directory, IMPORT_MANIFEST), json.dumps(renames))
+            self._close_day()  # the open partition may be one of those being replaced
+            self._apply_import()
+
+    def _apply_import(self):
+        manifest = os.path.join(self.directory, IMPORT_MANIFEST)
+        with open(manifest) as f:
+            renames = json.load(f)
+        for source, target in renames:
+            if os.path.exists(source):
+                os.replace(source, target)
+        with self._index_lock:
+            self._counts.clear()
+        os.remove(manifest)
+
+    def _recover(self):
+        # Finish a committed import, drop an uncommitted one, and split an old index.json into count files
+        if os.path.exists(os.path.join(self.directory, IMPORT_MANIFEST)):
+            self._apply_import()
+        for leftover in glob.glob(os.path.join(glob.escape(self.directory), "*.import")):
+            os.remove(leftover)
+        old_index = os.path.join(self.directory, "index.json")
+        if os.path.exists(old_index):
+            with open(old_index) as f:
+                for day, counts in json.load(f).items():
+                    _write_file(self.counts_path(day), json.dumps(counts, sort_keys=True))
+            os.remove(old_index)
+
+    # ------------------- Queries -------------------
+    def counts(self, day):
+        """``{event: count}`` for one day, straight from the index."""
+        with self._index_lock:
+            return dict(self._day_counts(_as_date(day).isoformat()))
+
+    def range_counts(self, start, end, event=None):
+        """Summed ``{event: count}`` (or a single int if ``event`` is given) over [start, end]."""
+        totals = {}
+        with self._index_lock:
+            for day in _days(start, end):
+                for name, n in self._day_counts(day.isoformat()).items():
+                    totals[name] = totals.get(name, 0) + n
+        return totals.get(event, 0) if event is not None else totals
+
+    def daily_series(self, event, start, end):
+        """``[(date, count)]`` for one event type, one entry per day in range."""
+        with self._index_lock:
+            return [(day, self._day_counts(day.isoformat()).get(event, 0)) for day in _days(start, end)]
+
+    def events(self, start, end=None, event=None):
+        """Yield rows from the partitions in [start, end], optionally filtered by event type."""
+        self.flush()
+        for day in _days(start, end or start):
+            if event is not None and not self.counts(day).get(event):
+                continue  # the index says there is nothing to find in this partition
+            path = self.partition_path(day)
+            if not os.path.exists(path):
+                continue
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    if event is None or row[1] == event:
+                        yield row
+
+    def report(self, start, end):
+        """Multi-line text summary of event counts over [start, end]."""
+        totals = self.range_counts(start, end)
+        lines = [f"{_as_date(start)} → {_as_date(end)}"]
+        lines += [f"  {name}: {n}" for name, n in sorted(totals.items(), key=lambda kv: -kv[1])]
+        return "\n".join(lines if totals else lines + ["  (no events)"])
@@ -0,0 +1,157 @@
+# reminder_scheduler.py
+# Heap-based reminder scheduler driven by Tk's after() loop
+#
+# Replaces one-sleeping-thread-per-reminder with a single min-heap of due times:
+#   - schedule()/reschedule() are O(log n) heap pushes
+#   - cancel() is O(1) (the stale heap entry is skipped when it surfaces)
+#   - only one Tk after() timer is armed, always for the earliest reminder
+# Callbacks run on the Tk thread, so they may touch widgets directly. Any object
+# with after(ms, fn) / after_cancel(id) can drive it, which keeps it testable.
+
+import heapq
+import itertools
+import math
+import time
+import traceback
+
+
+class Reminder:
+    """Handle returned by :meth:`ReminderScheduler.schedule`."""
+
+    __slots__ = ("id", "name", "callback", "args", "interval", "due", "version", "active")
+
+    def __init__(self, id, name, callback, args, interval, due):
+        self.id = id
+        self.name = name
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.due = due
+        self.version = 0
+        self.active = True
+
+    def __repr__(self):
+        kind = f"every {self.interval}s" if self.interval else "once"
+        return f"Reminder({self.name or self.id}, {kind}, active={self.active})"
+
+
+class ReminderScheduler:
+    """Recurring and one-shot reminders on one heap, fired from ``root.after``."""
+
+    def __init__(self, root, clock=time.monotonic):
+        self.root = root
+        self.clock = clock
+        self._heap = []   # (due, seq, reminder, version)
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._stale = 0
+        self._timer = None
+        self._timer_due = None
+        self.active = {}  # id -> Reminder
+
+    # ------------------- Public API -------------------
+    def schedule(self, delay, callback, *args, interval=None, name=None):
+        """Fire ``callback(*args)`` after ``delay`` seconds, then every ``interval`` seconds if given."""
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive")
+        reminder = Reminder(next(self._ids), name, callback, args, interval, self.clock() + delay)
+        self.active[reminder.id] = reminder
+        self._push(reminder)
+        return reminder
+
+    def every(self, interval, callback, *args, name=None, first=None):
+        """Recurring reminder; first fires after ``first`` seconds (default: one interval)."""
+        return self.schedule(interval if first is None else first, callback, *args, interval=interval, name=name)
+
+    def cancel(self, reminder):
+        if reminder.active:
+            reminder.active = False
+            self.active.pop(reminder.id, None)
+            self._stale += 1
+
+    def reschedule(self, reminder, delay=None, interval=None):
+        """Change a live reminder's next due time and/or its interval, effective immediately.
+
+        With only ``interval`` given, the next due time is moved to
+        ``last start + new interval`` (never earlier than now).
+        """
+        if not reminder.active:
+            raise ValueError(f"{reminder!r} is not active")
+        now = self.clock()
+        if interval is not None:
+            if interval <= 0:
+                raise ValueError("interval must be positive")
+            if delay is None and reminder.interval:
+                last_start = reminder.due - reminder.interval
+                delay = max(0.0, last_start + interval - now)
+            reminder.interval = interval
+        if delay is not None:
+            reminder.version += 1
+            self._stale += 1
+            reminder.due = now + delay
+            self._push(reminder)
+
+    def __len__(self):
+        return len(self.active)
+
+    # ------------------- Heap & Timer -------------------
+    def _push(self, reminder):
+        heapq.heappush(self._heap, (reminder.due, next(self._seq), reminder, reminder.version))
+        if self._stale > 64 and self._stale > len(self._heap) // 2:
+            self._compact()
+        self._arm()
+
+    def _compact(self):
+        self._heap = [e for e in self._heap if e[2].active and e[3] == e[2].version]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _discard_stale(self):
+        while self._heap:
+            _, _, reminder, version = self._heap[0]
+            if reminder.active and version == reminder.version:
+                return
+            heapq.heappop(self._heap)
+            self._stale = max(0, self._stale - 1)
+
+    def _arm(self):
+        self._discard_stale()
+        if not self._heap:
+            self._disarm()
+            return
+        due = self._heap[0][0]
+        if self._timer is not None and self._timer_due is not None and self._timer_due <= due:
+            return  # the armed timer already fires early enough
+        self._disarm()
+        # Round up so the timer never fires just before the reminder is due.
+        delay_ms = max(0, math.ceil((due - self.clock()) * 1000))
+        self._timer_due = due
+        self._timer = self.root.after(delay_ms, self._tick)
+
+    def _disarm(self):
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+        self._timer = self._timer_due = None
+
+    def _tick(self):
+        self._timer = self._timer_due = None
+        now = self.clock()
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, reminder, _ = heapq.heappop(self._heap)
+            if reminder.interval:
+                # Skip any missed periods instead of firing a burst.
+                missed = int((now - reminder.due) // reminder.interval) + 1
+                reminder.due += missed * reminder.interval
+                reminder.version += 1
+                heapq.heappush(self._heap, (reminder.due, next(self._seq), reminder, reminder.version))
+            else:
+                reminder.active = False
+                self.active.pop(reminder.id, None)
+            try:
+                reminder.callback(*reminder.args)
+            except Exception:
+                traceback.print_exc()
+        self._arm()
@@ -0,0 +1,159 @@
+# report_cache.py
+# Content-addressed incremental build cache for the automation.py report
+#
+# Each report artifact is a named stage with a list of inputs (file digests,
+# plotting parameters, library versions, ...). The stage key is the hash of
+# those inputs; an artifact is rebuilt only when its key changes or the file on
+# disk no longer matches what was built. Every run writes a manifest listing
+# which stages were hits or misses.
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_VERSION = 1
+
+
+# ------------------- Hashing -------------------
+def sha256_file(path, block_size=1 << 20):
+    """Hex SHA-256 of a file, read in blocks so large CSVs are not loaded whole."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def digest(*parts):
+    """Stable hash of JSON-serialisable stage inputs."""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+# ------------------- Build Cache -------------------
+class BuildCache:
+    """Per-stage rebuild decisions backed by ``<root>/index.json``."""
+
+    def __init__(self, root="results/.cache"):
+        self.root = root
+        self.objects = os.path.join(root, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        self.index_path = os.path.join(root, "index.json")
+        self.index = {"version": CACHE_VERSION, "stages": {}, "files": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                stored = json.load(f)
+            if stored.get("version") == CACHE_VERSION:
+                self.index = stored
+        self.records = []
+        # Stages may be checked or stored from worker threads (see report_executor).
+        self._lock = threading.RLock()
+
+    def file_digest(self, path):
+        """SHA-256 of ``path``, re-hashed only when its size or mtime changed."""
+        st = os.stat(path)
+        signature = [st.st_size, st.st_mtime_ns]
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self.index["files"].get(key)
+        if entry and entry["signature"] == signature:
+            return entry["digest"]
+        file_hash = sha256_file(path)
+        with self._lock:
+            self.index["files"][key] = {"signature": signature, "digest": file_hash}
+        return file_hash
+
+    def _record(self, name, status, key, seconds):
+        with self._lock:
+            self.records.append({
+                "stage": name,
+                "status": status,
+                "key": key[:16],
+                "seconds": round(seconds, 4),
+            })
+
+    def lookup(self, name, inputs, path):
+        """Return the output digest if ``path`` is still up to date for ``inputs``, else None.
+
+        A hit is recorded in the manifest; on a miss the caller builds ``path``
+        (possibly in another process) and then calls :meth:`store`.
+        """
+        started = time.perf_counter()
+        key = digest(CACHE_VERSION, name, inputs)
+        with self._lock:
+            entry = self.index["stages"].get(name)
+        if (entry and entry["key"] == key and os.path.exists(path)
+                and self.file_digest(path) == entry["output"]):
+            self._record(name, "hit", key, time.perf_counter() - started)
+            return entry["output"]
+        return None
+
+    def store(self, name, inputs, path, seconds=0.0):
+        """Record a freshly built ``path`` for ``inputs``; returns its digest."""
+        key = digest(CACHE_VERSION, name, inputs)
+        output = self.file_digest(path)
+        with self._lock:
+            self.index["stages"][name] = {"key": key, "output": output}
+        self._record(name, "miss", key, seconds)
+        return output
+
+    def artifact(self, name, inputs, path, build):
+        """Run ``build(path)`` unless the stored key and output digest still match.
+
+        Returns the digest of the output file so later stages can depend on it.
+        """
+        output = self.lookup(name, inputs, path)
+        if output is not None:
+            return output
+        started = time.perf_counter()
+        build(path)
+        return self.store(name, inputs, path, time.perf_counter() - started)
+
+    def text(self, name, inputs, build):
+        """Cache a string-valued stage (e.g. an HTML table fragment) by its input key."""
+        started = time.perf_counter()
+        key = digest(CACHE_VERSION, name, inputs)
+        object_path = os.path.join(self.objects, key)
+        with self._lock:
+            entry = self.index["stages"].get(name)
+        if entry and entry["key"] == key and os.path.exists(object_path):
+            with open(object_path, encoding="utf-8") as f:
+                value = f.read()
+            self._record(name, "hit", key, time.perf_counter() - started)
+            return value
+
+        value = build()
+        with open(object_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        with self._lock:
+            self.index["stages"][name] = {"key": key, "output": digest(value)}
+        self._record(name, "miss", key, time.perf_counter() - started)
+        return value
+
+    def _prune(self):
+        # Drop text objects no longer referenced by any stage.
+        live = {entry["key"] for entry in self.index["stages"].values()}
+        for name in os.listdir(self.objects):
+            if name not in live:
+                os.remove(os.path.join(self.objects, name))
+
+    def save(self, manifest_path="results/build_manifest.json"):
+        """Persist the index and write the hit/miss manifest for this run."""
+        self._prune()
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+        manifest = {
+            "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+            "hits": sum(1 for r in self.records if r["status"] == "hit"),
+            "misses": sum(1 for r in self.records if r["status"] == "miss"),
+            "stages": self.records,
+        }
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
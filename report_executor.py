@@ -0,0 +1,104 @@
+# report_executor.py
+# Staged executor for the automation.py report pipeline
+#
+# CPU-bound figure rendering goes to a process pool; I/O-bound stages (PDF
+# conversion, CSV export) go to a small thread pool so they overlap with
+# rendering. Every stage's start/end wall-clock time is recorded so nightly
+# batch runs can see where the time goes. One executor can be reused across
+# many reports, which lets the PDF of one report overlap the figures of the next.
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+def _run_timed(fn, args, kwargs):
+    # Runs inside the worker; time.time() is comparable across processes.
+    start = time.time()
+    result = fn(*args, **kwargs)
+    return result, start, time.time(), os.getpid()
+
+
+# ------------------- Stage Timings -------------------
+class StageTimings:
+    """Thread-safe log of (stage, start, end, worker) relative to the executor's start."""
+
+    def __init__(self):
+        self.origin = time.time()
+        self.stages = []
+        self._lock = threading.Lock()
+
+    def add(self, name, start, end, worker="main"):
+        with self._lock:
+            self.stages.append({
+                "stage": name,
+                "start": round(start - self.origin, 4),
+                "seconds": round(end - start, 4),
+                "worker": worker,
+            })
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block that runs on the calling thread."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.time())
+
+    def summary(self):
+        lines = [f"{'stage':<28}{'start':>9}{'seconds':>10}  worker"]
+        for s in sorted(self.stages, key=lambda s: s["start"]):
+            lines.append(f"{s['stage']:<28}{s['start']:>9.3f}{s['seconds']:>10.3f}  {s['worker']}")
+        lines.append(f"{'wall clock':<28}{'':>9}{time.time() - self.origin:>10.3f}")
+        return "\n".join(lines)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"wall_seconds": round(time.time() - self.origin, 4), "stages": self.stages}, f, indent=2)
+
+
+# ------------------- Executor -------------------
+class ReportExecutor:
+    """Process pool for figures, thread pool for I/O, with per-stage timings."""
+
+    def __init__(self, max_workers=None, io_workers=2):
+        self.timings = StageTimings()
+        self._processes = ProcessPoolExecutor(max_workers=max_workers)
+        self._threads = ThreadPoolExecutor(max_workers=io_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        self._threads.shutdown(wait=wait)
+        self._processes.shutdown(wait=wait)
+
+    def _submit(self, pool, name, fn, args, kwargs, worker_label):
+        outer = Future()
+
+        def done(inner):
+            try:
+                result, start, end, pid = inner.result()
+            except BaseException as e:
+                outer.set_exception(e)
+                return
+            self.timings.add(name, start, end, worker_label(pid))
+            outer.set_result(result)
+
+        pool.submit(_run_timed, fn, args, kwargs).add_done_callback(done)
+        return outer
+
+    def submit_figure(self, name, fn, *args, **kwargs):
+        """Render a figure in the process pool; ``fn`` must be a picklable top-level function."""
+        return self._submit(self._processes, name, fn, args, kwargs, lambda pid: f"process {pid}")
+
+    def submit_io(self, name, fn, *args, **kwargs):
+        """Run an I/O-bound stage (PDF conversion, CSV export) on a background thread."""
+        return self._submit(self._threads, name, fn, args, kwargs, lambda pid: "io thread")
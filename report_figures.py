@@ -0,0 +1,57 @@
+# report_figures.py
+# Report figures drawn with the object-oriented Agg API
+#
+# Each renderer builds its own Figure/FigureCanvasAgg instead of going through the
+# global pyplot state machine, so figures can be drawn concurrently in separate
+# worker processes (see report_executor.py). Arguments are plain pandas/NumPy
+# objects so they pickle cheaply into the pool.
+
+import pandas as pd
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+def _new_axes(figsize):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _save(fig, path):
+    fig.tight_layout()
+    fig.savefig(path)
+    return path
+
+
+def render_avg_salary(path, dept_salary, figsize, title):
+    """Bar plot of the per-department mean salary Series."""
+    fig, ax = _new_axes(figsize)
+    sns.barplot(x=dept_salary.index, y=dept_salary.values, ax=ax)
+    ax.set_title(title)
+    ax.set_ylabel("Salary")
+    ax.set_xlabel("Department")
+    return _save(fig, path)
+
+
+def render_age_distribution(path, ages, figsize, bins, kde, title):
+    """Histogram of ``ages``: either the raw column or ``(counts, edges)`` from a streaming pass."""
+    fig, ax = _new_axes(figsize)
+    if isinstance(ages, tuple):
+        counts, edges = ages
+        binned = pd.DataFrame({"Age": (edges[:-1] + edges[1:]) / 2, "Count": counts})
+        sns.histplot(data=binned, x="Age", weights="Count", bins=edges.tolist(), kde=kde, ax=ax)
+    else:
+        sns.histplot(ages, bins=bins, kde=kde, ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel("Age")
+    ax.set_ylabel("Frequency")
+    return _save(fig, path)
+
+
+def render_correlation(path, corr, figsize, annot, cmap, title):
+    """Annotated heatmap of a correlation matrix."""
+    fig, ax = _new_axes(figsize)
+    sns.heatmap(corr, annot=annot, cmap=cmap, ax=ax)
+    ax.set_title(title)
+    return _save(fig, path)
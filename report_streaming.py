@@ -0,0 +1,295 @@
+# report_streaming.py
+# Out-of-core (chunked) statistics for the automated report pipeline in automation.py
+#
+# The in-memory pipeline loads the whole CSV into one DataFrame. This module reads
+# it in bounded chunks instead and keeps running accumulators, so peak memory is
+# set by the chunk size rather than the file size:
+#
+#   pass 1 -> per-column means (numeric) and modes (categorical) used to fill NaNs
+#   pass 2 -> fill each chunk, then update describe-style statistics, per-department
+#             means, the co-moments behind the correlation matrix and (optionally)
+#             append the cleaned chunk to the output CSV
+#
+# Categorical modes come from a space-saving summary of at most MODE_CAPACITY
+# values per column: exact while a column has that few distinct values, and
+# bounded (approximate) beyond, so a free-text or ID column cannot pull the
+# whole column into memory. Per-group means keep one entry per group.
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_DTYPES = [np.float64, np.int64]
+DEFAULT_CHUNKSIZE = 100_000
+
+# Fine histogram used for the 25%/50%/75% estimates. 4000 is divisible by the
+# 5 bins of the age histogram, so the plot can be re-binned exactly.
+QUANTILE_BINS = 4000
+
+# Distinct values tracked per categorical column when looking for its mode.
+MODE_CAPACITY = 10_000
+
+
+# ------------------- Accumulators -------------------
+class RunningMoments:
+    """Count, mean, variance, min and max of a stream of numbers (Chan et al. merge)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        n = values.size
+        if n == 0:
+            return
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+    def std(self):
+        """Sample standard deviation (ddof=1), like ``DataFrame.describe``."""
+        if self.count < 2:
+            return np.nan
+        return np.sqrt(self.m2 / (self.count - 1))
+
+
+class BinnedQuantiles:
+    """Fixed-width histogram over a known [lo, hi] range used to estimate quantiles."""
+
+    def __init__(self, lo, hi, bins=QUANTILE_BINS):
+        if not np.isfinite(lo) or not np.isfinite(hi):
+            lo, hi = 0.0, 0.0
+        if hi <= lo:
+            hi = lo + 1.0
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            self.counts += np.histogram(values, bins=self.edges)[0]
+
+    def quantile(self, q):
+        """Linearly interpolated quantile estimate; error is at most one bin width."""
+        total = self.counts.sum()
+        if total == 0:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        target = q * total
+        i = int(np.searchsorted(cumulative, target, side="left"))
+        i = min(i, len(self.counts) - 1)
+        before = cumulative[i - 1] if i > 0 else 0
+        inside = self.counts[i]
+        fraction = (target - before) / inside if inside else 0.0
+        return self.edges[i] + fraction * (self.edges[i + 1] - self.edges[i])
+
+    def rebin(self, bins):
+        """Collapse the fine histogram into ``bins`` equal-width bins (must divide evenly)."""
+        if len(self.counts) % bins:
+            raise ValueError(f"{len(self.counts)} fine bins cannot be split into {bins} bins")
+        counts = self.counts.reshape(bins, -1).sum(axis=1)
+        edges = self.edges[:: len(self.counts) // bins]
+        return counts, edges
+
+
+class CoMoments:
+    """Running mean vector and co-moment matrix of several columns, for ``corr()``."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    def update(self, matrix):
+        matrix = np.asarray(matrix, dtype=np.float64)
+        matrix = matrix[~np.isnan(matrix).any(axis=1)]
+        n = matrix.shape[0]
+        if n == 0:
+            return
+        chunk_mean = matrix.mean(axis=0)
+        centered = matrix - chunk_mean
+        chunk_comoment = centered.T @ centered
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.comoment += chunk_comoment + np.outer(delta, delta) * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+    def corr(self):
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.comoment / np.outer(std, std)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+class HeavyHitters:
+    """Most frequent values of a stream in bounded memory (space-saving summary, merged chunk by chunk).
+
+    Counts are exact until more than ``capacity`` distinct values have been
+    seen. After that only the ``capacity`` largest counts are kept, and a value
+    seen for the first time starts from ``floor`` (the largest count dropped so
+    far), so tracked counts are upper bounds and a frequent value is not
+    displaced by a long tail of rare ones.
+    """
+
+    def __init__(self, capacity=MODE_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.floor = 0
+
+    def update(self, values):
+        counts = self.counts
+        for value, n in pd.Series(values, dtype=object).value_counts(sort=False).items():
+            counts[value] = counts.get(value, self.floor) + int(n)
+        if len(counts) > self.capacity:
+            kept = heapq.nlargest(self.capacity + 1, counts.items(), key=lambda item: item[1])
+            self.floor = max(self.floor, kept.pop()[1])
+            self.counts = dict(kept)
+
+    def mode(self):
+        """The most frequent value; ties go to the smallest, like ``Series.mode()[0]``."""
+        if not self.counts:
+            return None
+        top = max(self.counts.values())
+        return min((value for value, count in self.counts.items() if count == top), key=str)
+
+
+class GroupMeans:
+    """Running per-group sums and counts, for ``groupby(key)[value].mean()``."""
+
+    def __init__(self):
+        self.sums = {}
+        self.counts = {}
+
+    def update(self, keys, values):
+        grouped = pd.DataFrame({"key": keys, "value": values}).groupby("key")["value"].agg(["sum", "count"])
+        for key, row in grouped.iterrows():
+            self.sums[key] = self.sums.get(key, 0.0) + row["sum"]
+            self.counts[key] = self.counts.get(key, 0) + row["count"]
+
+    def means(self, name=None):
+        keys = sorted(self.counts)
+        values = [self.sums[k] / self.counts[k] if self.counts[k] else np.nan for k in keys]
+        return pd.Series(values, index=pd.Index(keys), name=name)
+
+
+# ------------------- Helpers -------------------
+def _coerce_numeric(chunk, numeric_cols):
+    # Column kinds are decided from the first chunk; later chunks follow them so
+    # a stray non-numeric cell does not flip a column to "categorical" mid-stream.
+    for col in numeric_cols:
+        if chunk[col].dtype not in NUMERIC_DTYPES:
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+    return chunk
+
+
+# ------------------- Pass 1: fill values -------------------
+def scan_fill_values(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Return ``(numeric_cols, fill_values, moments)`` computed in one chunked pass."""
+    numeric_cols = None
+    moments = {}
+    counters = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        if numeric_cols is None:
+            numeric_cols = [c for c in chunk.columns if chunk[c].dtype in NUMERIC_DTYPES]
+            moments = {c: RunningMoments() for c in numeric_cols}
+            counters = {c: HeavyHitters() for c in chunk.columns if c not in moments}
+        chunk = _coerce_numeric(chunk, numeric_cols)
+        for col, acc in moments.items():
+            acc.update(chunk[col].to_numpy())
+        for col, counter in counters.items():
+            counter.update(chunk[col].dropna())
+
+    fill_values = {}
+    for col, acc in moments.items():
+        if acc.count:
+            fill_values[col] = acc.mean
+    for col, counter in counters.items():
+        mode = counter.mode()
+        if mode is not None:
+            fill_values[col] = mode
+    return numeric_cols or [], fill_values, moments
+
+
+# ------------------- Pass 2: cleaned CSV -------------------
+def write_cleaned(csv_path, cleaned_csv, chunksize=DEFAULT_CHUNKSIZE):
+    """Write the NaN-filled CSV on its own (pass 1 for the fill values, then fill and append chunk by chunk)."""
+    numeric_cols, fill_values, _ = scan_fill_values(csv_path, chunksize)
+    header = True
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        chunk = _coerce_numeric(chunk, numeric_cols).fillna(fill_values)
+        chunk.to_csv(cleaned_csv, mode="w" if header else "a", header=header, index=False)
+        header = False
+
+
+# ------------------- Pass 2: report statistics -------------------
+def stream_report_data(csv_path, chunksize=DEFAULT_CHUNKSIZE, cleaned_csv=None,
+                       group_col="Department", value_col="Salary", hist_col="Age", hist_bins=5):
+    """Compute everything the HTML report needs without loading the whole CSV.
+
+    Returns a dict with ``descriptive`` (like ``describe()``), ``dept_salary``
+    (like ``groupby(group_col)[value_col].mean()``), ``corr`` (numeric columns
+    only) and ``age_hist`` as ``(counts, edges)``. When ``cleaned_csv`` is given
+    the NaN-filled chunks are appended to it as they are processed.
+    """
+    numeric_cols, fill_values, first_pass = scan_fill_values(csv_path, chunksize)
+
+    moments = {c: RunningMoments() for c in numeric_cols}
+    quantiles = {c: BinnedQuantiles(first_pass[c].min, first_pass[c].max) for c in numeric_cols}
+    comoments = CoMoments(numeric_cols)
+    groups = GroupMeans()
+
+    header = True
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        chunk = _coerce_numeric(chunk, numeric_cols).fillna(fill_values)
+        for col in numeric_cols:
+            values = chunk[col].to_numpy(dtype=np.float64)
+            moments[col].update(values)
+            quantiles[col].update(values)
+        comoments.update(chunk[numeric_cols].to_numpy(dtype=np.float64))
+        if group_col in chunk.columns and value_col in chunk.columns:
+            groups.update(chunk[group_col].to_numpy(), chunk[value_col].to_numpy(dtype=np.float64))
+        if cleaned_csv is not None:
+            chunk.to_csv(cleaned_csv, mode="w" if header else "a", header=header, index=False)
+            header = False
+
+    descriptive = pd.DataFrame(
+        {
+            col: [
+                moments[col].count,
+                moments[col].mean if moments[col].count else np.nan,
+                moments[col].std(),
+                moments[col].min if moments[col].count else np.nan,
+                quantiles[col].quantile(0.25),
+                quantiles[col].quantile(0.50),
+                quantiles[col].quantile(0.75),
+                moments[col].max if moments[col].count else np.nan,
+            ]
+            for col in numeric_cols
+        },
+        index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+    )
+
+    age_hist = quantiles[hist_col].rebin(hist_bins) if hist_col in quantiles else None
+
+    return {
+        "descriptive": descriptive,
+        "dept_salary": groups.means(name=value_col).rename_axis(group_col),
+        "corr": comoments.corr(),
+        "age_hist": age_hist,
+    }
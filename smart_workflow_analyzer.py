@@ -4,8 +4,8 @@
 import datetime
 import random
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+from task_clustering import TaskClusterEngine
+from task_scheduler import Scheduler, group_by_day
 
 # ------------------- Sample Tasks -------------------
 # In real-world, tasks can be imported from CSV, Google Calendar, Email API, etc.
@@ -19,16 +19,22 @@ tasks = [
 ]
 
 # ------------------- NLP-based Task Clustering -------------------
-def cluster_tasks(tasks):
-    task_texts = [t["task"] for t in tasks]
-    vectorizer = TfidfVectorizer(stop_words='english')
-    X = vectorizer.fit_transform(task_texts)
+# Fitted vocabulary + centroids persist in task_clusters.pkl; only new tasks are
+# transformed and folded in, and a full refit happens only on vocabulary drift.
+_cluster_engine = None
+
+def get_cluster_engine():
+    global _cluster_engine
+    if _cluster_engine is None:
+        _cluster_engine = TaskClusterEngine.load()
+    return _cluster_engine
 
+def cluster_tasks(tasks):
+    engine = get_cluster_engine()
     # Cluster tasks into 2 groups: urgent/important vs less urgent
-    kmeans = KMeans(n_clusters=2, random_state=42)
-    kmeans.fit(X)
-    clusters = kmeans.labels_
-    
+    clusters = engine.assign(t["task"] for t in tasks)
+    engine.save()
+
     for i, t in enumerate(tasks):
         t["cluster"] = clusters[i]
     return tasks
@@ -50,26 +56,28 @@ def prioritize_tasks(tasks):
     return tasks
 
 # ------------------- Schedule Suggestion -------------------
-def generate_schedule(tasks, work_start="09:00", work_end="17:00"):
-    schedule = []
-    current_time = datetime.datetime.strptime(work_start, "%H:%M")
-    work_end_time = datetime.datetime.strptime(work_end, "%H:%M")
-
-    for t in tasks:
-        task_duration = datetime.timedelta(minutes=t["estimated_time"])
-        if current_time + task_duration <= work_end_time:
-            schedule.append({"task": t["task"], "start_time": current_time.time(), "end_time": (current_time + task_duration).time()})
-            current_time += task_duration
-        else:
-            # Task cannot fit today, suggest for next day
-            schedule.append({"task": t["task"], "start_time": "Tomorrow", "end_time": "Tomorrow"})
-    return schedule
+def generate_schedule(tasks, work_start="09:00", work_end="17:00", start_date=None, daily_capacity=None):
+    # Tasks are placed earliest deadline first (ties by priority) on the earliest
+    # working day with room, back-filling earlier gaps; each slot is {"task", "day", "start_time",
+    # "end_time", "minutes", "part", "late"}.
+    scheduler = Scheduler(start_date=start_date, work_start=work_start, work_end=work_end,
+                          daily_capacity=daily_capacity)
+    return scheduler.schedule(tasks)
 
 # ------------------- Reporting -------------------
+def format_schedule(schedule):
+    lines = []
+    for day, slots in group_by_day(schedule).items():
+        lines.append(f"{day:%a %Y-%m-%d}")
+        for s in slots:
+            part = f" (part {s['part']})" if s["part"] != "1/1" else ""
+            late = " ⚠️ after deadline" if s["late"] else ""
+            lines.append(f"  {s['start_time']} - {s['end_time']} : {s['task']}{part}{late}")
+    return "\n".join(lines)
+
 def display_schedule(schedule):
-    print("\n📊 Suggested Work Schedule for Today:\n")
-    for s in schedule:
-        print(f"{s['start_time']} - {s['end_time']} : {s['task']}")
+    print("\n📊 Suggested Work Schedule:\n")
+    print(format_schedule(schedule))
 
 def display_prioritized_tasks(tasks):
     print("\n🔥 Prioritized Tasks:\n")
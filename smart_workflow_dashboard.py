@@ -5,14 +5,31 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import simpledialog
 import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+import queue
+import threading
 import pandas as pd
+from event_log import EventLogWriter
+from smart_workflow_analyzer import get_cluster_engine, format_schedule
+from smart_workflow_analyzer import generate_schedule as plan_schedule
 
 # ------------------- Global Variables -------------------
 tasks = []  # Each task: {"task": str, "deadline": str, "estimated_time": int, "cluster": int, "priority": float}
+tasks_version = 0  # bumped on every edit so stale background results can be detected
+
+# Background prioritization: one worker at a time, results come back through
+# results_queue and are picked up on the Tk thread by poll_results (root.after).
+results_queue = queue.Queue()
+job = {"running": False, "rerun": False}
+schedule_view = {"window": None, "text": None}  # reusable Toplevel holding the full schedule
+
+task_log = EventLogWriter("task_log.csv", rotate_bytes=10 * 1024 * 1024)
 
 # ------------------- Task Management -------------------
+def tasks_changed():
+    global tasks_version
+    tasks_version += 1
+    update_task_list()
+
 def add_task():
     task_name = simpledialog.askstring("Add Task", "Enter Task Name:")
     if not task_name: return
@@ -20,12 +37,11 @@ def add_task():
     estimated_time = simpledialog.askinteger("Estimated Time", "Enter estimated time in minutes:")
     tasks.append({"task": task_name, "deadline": deadline, "estimated_time": estimated_time})
     log_task(task_name, deadline, estimated_time)
-    update_task_list()
+    tasks_changed()
 
 def edit_task():
-    selected = task_listbox.curselection()
-    if not selected: return
-    idx = selected[0]
+    idx = task_view.selected_index()
+    if idx is None: return
     task = tasks[idx]
     new_name = simpledialog.askstring("Edit Task", "Enter new task name:", initialvalue=task["task"])
     if new_name: task["task"] = new_name
@@ -33,73 +49,225 @@ def edit_task():
     if new_deadline: task["deadline"] = new_deadline
     new_time = simpledialog.askinteger("Edit Time", "Enter new estimated time in minutes:", initialvalue=task["estimated_time"])
     if new_time: task["estimated_time"] = new_time
-    update_task_list()
+    tasks_changed()
 
 def delete_task():
-    selected = task_listbox.curselection()
-    if not selected: return
-    idx = selected[0]
+    idx = task_view.selected_index()
+    if idx is None: return
     tasks.pop(idx)
-    update_task_list()
+    tasks_changed()
 
 def complete_task():
-    selected = task_listbox.curselection()
-    if not selected: return
-    idx = selected[0]
+    idx = task_view.selected_index()
+    if idx is None: return
     tasks[idx]["completed"] = True
-    update_task_list()
+    tasks_changed()
+
+def format_task(t):
+    status = "✅" if t.get("completed") else "❌"
+    prio = f"{t.get('priority', 0):.2f}"
+    return f"{t['task']} | Deadline: {t['deadline']} | Time: {t['estimated_time']} min | Priority: {prio} | {status}"
 
 def update_task_list():
-    task_listbox.delete(0, tk.END)
-    for t in tasks:
-        status = "✅" if t.get("completed") else "❌"
-        prio = f"{t.get('priority', 0):.2f}"
-        task_listbox.insert(tk.END, f"{t['task']} | Deadline: {t['deadline']} | Time: {t['estimated_time']} min | Priority: {prio} | {status}")
+    task_view.refresh()
+
+# ------------------- Virtualized Task List -------------------
+class VirtualTaskList:
+    """Listbox that only holds the visible window of a (possibly huge) task list.
+
+    refresh() re-formats just the visible rows and patches the Listbox with the
+    rows that actually changed, so edits and scrolling cost O(visible rows)
+    instead of O(all tasks).
+    """
+
+    def __init__(self, parent, rows, format_row, height=15, width=100):
+        self.rows = rows
+        self.format_row = format_row
+        self.height = height
+        self.top = 0
+        self.shown = []       # strings currently in the Listbox
+        self.selected = None  # absolute index into rows
+
+        self.frame = tk.Frame(parent)
+        self.listbox = tk.Listbox(self.frame, height=height, width=width, exportselection=False)
+        self.scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-1))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(1))
+        self.listbox.bind("<Up>", lambda e: self.move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self.move_selection(1))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    # Scrolling
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(amount) * len(self.rows)))
+        elif unit == tk.PAGES:
+            self.scroll_by(int(amount) * self.height)
+        else:
+            self.scroll_by(int(amount))
+
+    def scroll_by(self, delta):
+        self.scroll_to(self.top + delta)
+        return "break"
+
+    def scroll_to(self, top):
+        self.top = max(0, min(top, len(self.rows) - self.height))
+        self.refresh()
+
+    # Selection
+    def on_select(self, event=None):
+        picked = self.listbox.curselection()
+        if picked:
+            self.selected = self.top + picked[0]
+
+    def move_selection(self, delta):
+        if self.selected is None or not self.rows:
+            return "break"
+        self.selected = max(0, min(self.selected + delta, len(self.rows) - 1))
+        if not self.top <= self.selected < self.top + self.height:
+            self.top = self.selected if delta < 0 else self.selected - self.height + 1
+        self.refresh()
+        return "break"
+
+    def selected_index(self):
+        if self.selected is not None and self.selected < len(self.rows):
+            return self.selected
+        return None
+
+    def select(self, index):
+        """Select absolute row ``index`` (or nothing, for None), scrolling it into view."""
+        self.selected = index
+        if index is not None and not self.top <= index < self.top + self.height:
+            self.top = index - self.height // 2
+        self.refresh()
+
+    # Rendering
+    def refresh(self):
+        self.top = max(0, min(self.top, len(self.rows) - self.height))
+        end = min(self.top + self.height, len(self.rows))
+        wanted = [self.format_row(self.rows[i]) for i in range(self.top, end)]
+
+        for i, text in enumerate(wanted):
+            if i < len(self.shown) and self.shown[i] == text:
+                continue
+            if i < len(self.shown):
+                self.listbox.delete(i)
+            self.listbox.insert(i, text)
+        if len(self.shown) > len(wanted):
+            self.listbox.delete(len(wanted), tk.END)
+        self.shown = wanted
+
+        self.listbox.selection_clear(0, tk.END)
+        if self.selected is not None and self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        if self.rows:
+            self.scrollbar.set(self.top / len(self.rows), end / len(self.rows))
+        else:
+            self.scrollbar.set(0, 1)
 
 # ------------------- Priority Scoring -------------------
-def cluster_tasks():
-    if not tasks: return
-    task_texts = [t["task"] for t in tasks]
-    vectorizer = TfidfVectorizer(stop_words='english')
-    X = vectorizer.fit_transform(task_texts)
-    kmeans = KMeans(n_clusters=min(2,len(tasks)), random_state=42)
-    kmeans.fit(X)
-    for i, t in enumerate(tasks):
-        t["cluster"] = kmeans.labels_[i]
-
-def prioritize_tasks():
+def cluster_tasks(task_list):
+    if not task_list: return
+    engine = get_cluster_engine()  # persistent model shared with smart_workflow_analyzer
+    labels = engine.assign(t["task"] for t in task_list)
+    engine.save()
+    for i, t in enumerate(task_list):
+        t["cluster"] = labels[i]
+
+def prioritize_tasks(task_list):
     today = datetime.date.today()
-    cluster_tasks()
-    for t in tasks:
+    cluster_tasks(task_list)
+    for t in task_list:
         deadline = datetime.datetime.strptime(t["deadline"], "%Y-%m-%d").date()
         days_left = (deadline - today).days
         urgency_score = max(0, 10 - days_left)
         effort_score = t["estimated_time"] / 60
         cluster_score = 5 if t["cluster"] == 0 else 3
         t["priority"] = urgency_score * 0.5 + effort_score * 0.3 + cluster_score * 0.2
-    tasks.sort(key=lambda x: x["priority"], reverse=True)
+    task_list.sort(key=lambda x: x["priority"], reverse=True)
+    return task_list
 
 # ------------------- Scheduling -------------------
+def schedule_worker(snapshot, version):
+    # Runs off the Tk thread: never touch widgets here.
+    try:
+        position = {id(t): i for i, t in enumerate(snapshot)}
+        prioritized = prioritize_tasks(snapshot)
+        order = [position[id(t)] for t in prioritized]  # new row -> row it had in the snapshot
+        schedule = plan_schedule(prioritized, work_start="09:00", work_end="17:00")
+        days = len({s["day"] for s in schedule})
+        late = sum(1 for s in schedule if s["late"])
+        summary = f"Scheduled {len(prioritized)} tasks over {days} days" + (f", {late} after deadline" if late else "")
+        results_queue.put(("done", version, (prioritized, order), (summary, format_schedule(schedule))))
+    except Exception as e:
+        results_queue.put(("error", version, e, None))
+
 def generate_schedule():
-    prioritize_tasks()
-    work_start = datetime.datetime.strptime("09:00", "%H:%M")
-    work_end = datetime.datetime.strptime("17:00", "%H:%M")
-    schedule = []
-    current_time = work_start
-    for t in tasks:
-        duration = datetime.timedelta(minutes=t["estimated_time"])
-        if current_time + duration <= work_end:
-            schedule.append(f"{current_time.time()} - {(current_time + duration).time()} : {t['task']}")
-            current_time += duration
-        else:
-            schedule.append(f"Tomorrow : {t['task']}")
-    schedule_text = "\n".join(schedule)
-    messagebox.showinfo("Today's Schedule", schedule_text)
+    if job["running"]:
+        job["rerun"] = True
+        return
+    if not tasks:
+        messagebox.showinfo("Schedule", "No tasks to schedule.")
+        return
+    job["running"], job["rerun"] = True, False
+    status_var.set(f"Prioritizing {len(tasks)} tasks…")
+    snapshot = [dict(t) for t in tasks]
+    threading.Thread(target=schedule_worker, args=(snapshot, tasks_version), daemon=True).start()
+
+def poll_results():
+    try:
+        while True:
+            kind, version, payload, schedule = results_queue.get_nowait()
+            job["running"] = False
+            if kind == "error":
+                status_var.set("Ready")
+                messagebox.showerror("Scheduling Failed", str(payload))
+            elif version != tasks_version or job["rerun"]:
+                # Tasks changed while the worker ran: recompute from the current list.
+                generate_schedule()
+            else:
+                prioritized, order = payload
+                summary, text = schedule
+                # Rows are re-sorted by priority: keep the same task selected, wherever it moved to
+                selected = task_view.selected_index()
+                tasks[:] = prioritized
+                task_view.select(None if selected is None else order.index(selected))
+                status_var.set(summary)
+                show_schedule(text)
+    except queue.Empty:
+        pass
+    root.after(100, poll_results)
+
+def show_schedule(text):
+    # A modal with tens of thousands of lines would block the Tk loop and overflow the screen,
+    # so the full schedule goes into a scrollable window that stays open between runs.
+    window = schedule_view["window"]
+    if window is None or not window.winfo_exists():
+        window = schedule_view["window"] = tk.Toplevel(root)
+        window.title("Schedule")
+        window.geometry("600x400")
+        body = schedule_view["text"] = tk.Text(window, wrap=tk.NONE)
+        scrollbar = tk.Scrollbar(window, orient=tk.VERTICAL, command=body.yview)
+        body.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        body.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    body = schedule_view["text"]
+    body.config(state=tk.NORMAL)
+    body.delete("1.0", tk.END)
+    body.insert("1.0", text)
+    body.config(state=tk.DISABLED)
+    window.lift()
 
 # ------------------- Logging -------------------
 def log_task(task_name, deadline, estimated_time):
-    with open("task_log.csv", "a") as f:
-        f.write(f"{datetime.datetime.now()},{task_name},{deadline},{estimated_time}\n")
+    task_log.write([datetime.datetime.now(), task_name, deadline, estimated_time])
 
 # ------------------- GUI -------------------
 root = tk.Tk()
@@ -117,9 +285,14 @@ tk.Button(frame_buttons, text="Delete Task", command=delete_task).grid(row=0, co
 tk.Button(frame_buttons, text="Complete Task", command=complete_task).grid(row=0, column=3, padx=5)
 tk.Button(frame_buttons, text="Generate Schedule", command=generate_schedule).grid(row=0, column=4, padx=5)
 
-task_listbox = tk.Listbox(root, width=100)
-task_listbox.pack(pady=20)
+task_view = VirtualTaskList(root, tasks, format_task, height=15, width=100)
+task_view.pack(pady=20, fill=tk.BOTH, expand=True)
+
+status_var = tk.StringVar(value="Ready")
+tk.Label(root, textvariable=status_var, anchor="w").pack(fill=tk.X, padx=10)
 
 tk.Button(root, text="Exit", command=root.destroy).pack(pady=10)
 
+root.after(100, poll_results)
 root.mainloop()
+task_log.close()
@@ -0,0 +1,199 @@
+# task_clustering.py
+# Persistent, incremental task clustering for the Smart Workflow tools
+#
+# cluster_tasks used to build a new TfidfVectorizer + KMeans and refit both on
+# every call. This engine keeps the fitted vocabulary and centroids on disk:
+#   - tasks seen before are answered from a label cache
+#   - new tasks are transformed with the stored vocabulary, assigned with
+#     predict() and folded into the centroids with MiniBatchKMeans.partial_fit
+#   - a full refit only happens when drift (share of out-of-vocabulary words in
+#     tasks added since the last fit) crosses a threshold
+# Until there are at least n_clusters distinct tasks there is nothing to fit;
+# those first tasks all get cluster 0 and are clustered by the first fit.
+#
+# Run `python task_clustering.py` for a refit vs incremental latency benchmark.
+
+import os
+import pickle
+import random
+import time
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+MODEL_FILE = "task_clusters.pkl"
+
+
+class TaskClusterEngine:
+    """TF-IDF + mini-batch k-means with persistence, online updates and drift-triggered refits."""
+
+    def __init__(self, n_clusters=2, model_path=MODEL_FILE, drift_threshold=0.3,
+                 min_drift_tokens=50, batch_size=1024, random_state=42):
+        self.n_clusters = n_clusters
+        self.model_path = model_path
+        self.drift_threshold = drift_threshold
+        self.min_drift_tokens = min_drift_tokens
+        self.batch_size = batch_size
+        self.random_state = random_state
+
+        self.vectorizer = None
+        self.kmeans = None
+        self.labels = {}       # task text -> cluster id
+        self.oov_tokens = 0    # tokens since last fit that were not in the vocabulary
+        self.seen_tokens = 0   # all tokens since last fit
+        self.refits = 0
+        self.dirty = False     # changed since the last save()
+
+    # ------------------- Persistence -------------------
+    @classmethod
+    def load(cls, model_path=MODEL_FILE, **kwargs):
+        """Load a saved engine, or return a fresh one if there is none."""
+        if model_path and os.path.exists(model_path):
+            with open(model_path, "rb") as f:
+                engine = pickle.load(f)
+            engine.model_path = model_path
+            return engine
+        return cls(model_path=model_path, **kwargs)
+
+    def save(self):
+        """Write the model to ``model_path`` if it changed since it was loaded or saved."""
+        if not self.model_path or not self.dirty:
+            return
+        self.dirty = False
+        tmp_path = self.model_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f)
+        os.replace(tmp_path, self.model_path)
+
+    # ------------------- Fitting -------------------
+    @property
+    def drift(self):
+        """Share of tokens since the last full fit that fell outside the vocabulary."""
+        return self.oov_tokens / self.seen_tokens if self.seen_tokens else 0.0
+
+    def fit(self, texts):
+        """Full refit of vocabulary and centroids; keeps cluster ids aligned with the old model."""
+        texts = list(dict.fromkeys(texts))
+        old_centroids = self._centroids_in_vocab(self.vectorizer.vocabulary_) if self.kmeans else None
+
+        vectorizer = TfidfVectorizer(stop_words="english")
+        X = vectorizer.fit_transform(texts)
+        n_clusters = min(self.n_clusters, len(texts))
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=self.random_state,
+                                 batch_size=self.batch_size, n_init=3)
+        kmeans.fit(X)
+
+        self.vectorizer, self.kmeans = vectorizer, kmeans
+        if old_centroids is not None:
+            self._align_labels(old_centroids)
+        self.labels = dict(zip(texts, kmeans.predict(X).tolist()))
+        self.oov_tokens = self.seen_tokens = 0
+        self.refits += 1
+        self.dirty = True
+        return self
+
+    def _centroids_in_vocab(self, vocabulary):
+        # Old centroids as {term: weight} dicts so they can be compared in a new vocabulary.
+        terms = sorted(vocabulary, key=vocabulary.get)
+        return [dict(zip(terms, row)) for row in self.kmeans.cluster_centers_]
+
+    def _align_labels(self, old_centroids):
+        # Greedy matching of new centroids to old ones so "cluster 0" keeps its meaning.
+        # Ids stay in range(len(new)) even when the refit has fewer clusters than before.
+        vocab = self.vectorizer.vocabulary_
+        old = np.zeros((len(old_centroids), len(vocab)))
+        for i, centroid in enumerate(old_centroids):
+            for term, weight in centroid.items():
+                if term in vocab:
+                    old[i, vocab[term]] = weight
+        new = self.kmeans.cluster_centers_
+        similarity = new @ old.T
+        order = [-1] * len(new)
+        free_old = set(range(min(len(old), len(new))))
+        for flat in np.argsort(-similarity, axis=None):
+            n, o = divmod(int(flat), similarity.shape[1])
+            if order[n] == -1 and o in free_old:
+                order[n] = o
+                free_old.discard(o)
+        leftovers = iter(sorted(set(range(len(new))) - set(order)))
+        order = np.array([o if o != -1 else next(leftovers) for o in order])
+        # New cluster n becomes cluster order[n]; per-center counts (the partial_fit
+        # learning rates) and the fit labels move with their centers.
+        source = np.argsort(order)
+        self.kmeans.cluster_centers_ = new[source]
+        self.kmeans._counts = self.kmeans._counts[source]
+        self.kmeans.labels_ = order[self.kmeans.labels_]
+
+    def _update(self, texts):
+        # Assign unseen texts and fold them into the centroids in mini-batches.
+        analyzer = self.vectorizer.build_analyzer()
+        vocab = self.vectorizer.vocabulary_
+        for text in texts:
+            tokens = analyzer(text)
+            self.seen_tokens += len(tokens)
+            self.oov_tokens += sum(1 for tok in tokens if tok not in vocab)
+
+        if self.seen_tokens >= self.min_drift_tokens and self.drift > self.drift_threshold:
+            self.fit(list(self.labels) + texts)
+            return
+
+        X = self.vectorizer.transform(texts)
+        for start in range(0, X.shape[0], self.batch_size):
+            # A fitted model accepts batches of any size, down to the single task the dashboard adds
+            self.kmeans.partial_fit(X[start:start + self.batch_size])
+        self.labels.update(zip(texts, self.kmeans.predict(X).tolist()))
+        self.dirty = True
+
+    # ------------------- Public API -------------------
+    def assign(self, texts):
+        """Cluster ids for ``texts``; only texts not seen before cost a transform."""
+        texts = list(texts)
+        new = [t for t in dict.fromkeys(texts) if t not in self.labels]
+        if self.kmeans is None:
+            if len(self.labels) + len(new) >= self.n_clusters:
+                self.fit(list(self.labels) + new)
+            elif new:
+                # Too few tasks for n_clusters centroids yet; fitting now would stick at fewer clusters
+                self.labels.update(dict.fromkeys(new, 0))
+                self.dirty = True
+        elif new:
+            self._update(new)
+        return [self.labels[t] for t in texts]
+
+
+# ------------------- Benchmark -------------------
+def _random_tasks(n, seed=0):
+    rng = random.Random(seed)
+    verbs = ["Finish", "Review", "Prepare", "Update", "Reply to", "Plan", "Fix", "Write", "Test", "Deploy"]
+    nouns = ["project report", "client emails", "presentation slides", "team meeting", "code review",
+             "project plan", "budget", "release notes", "bug backlog", "design doc", "invoice", "roadmap"]
+    clients = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka"]
+    return [f"{rng.choice(verbs)} {rng.choice(nouns)} for {rng.choice(clients)} week {rng.randint(1, 52)} "
+            f"item {i}" for i in range(n)]
+
+
+def benchmark(task_counts=(1_000, 10_000, 50_000), new_per_call=50):
+    """Latency of a full refit vs. an incremental update when ``new_per_call`` tasks arrive."""
+    print(f"{'tasks':>8}{'refit (s)':>12}{'incremental (s)':>18}{'repeat call (s)':>18}")
+    for n in task_counts:
+        tasks = _random_tasks(n + new_per_call)
+        base = tasks[:n]
+
+        start = time.perf_counter()
+        TaskClusterEngine(model_path=None).fit(tasks)
+        refit = time.perf_counter() - start
+
+        engine = TaskClusterEngine(model_path=None).fit(base)
+        start = time.perf_counter()
+        engine.assign(tasks)
+        incremental = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.assign(tasks)
+        repeat = time.perf_counter() - start
+        print(f"{n:>8}{refit:>12.4f}{incremental:>18.4f}{repeat:>18.4f}")
+
+
+if __name__ == "__main__":
+    benchmark()
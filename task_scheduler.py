@@ -0,0 +1,156 @@
+# task_scheduler.py
+# Multi-day, capacity-aware scheduling engine for the Smart Workflow tools
+#
+# Tasks are placed earliest deadline first (EDF; ties by priority, then in the
+# order given) on the earliest working day that still has room for them, so a
+# short task can back-fill a day that a longer one skipped, and an urgent task
+# is never pushed past its deadline by a less urgent one listed ahead of it.
+# Each day's free capacity lives in a max segment tree, so "earliest day with
+# >= N free minutes" is O(log days) and placing n tasks is O(n log n). Tasks
+# longer than a whole day are split across days.
+
+import datetime
+
+WEEKDAYS = (0, 1, 2, 3, 4)  # Monday..Friday
+
+
+class _CapacityTree:
+    """Max segment tree over per-day free minutes; doubles in size as days are added."""
+
+    def __init__(self, size=64):
+        self.size = 1
+        while self.size < size:
+            self.size *= 2
+        self.tree = [0] * (2 * self.size)
+
+    def _grow(self):
+        leaves = self.tree[self.size:]
+        self.size *= 2
+        self.tree = [0] * (2 * self.size)
+        self.tree[self.size:self.size + len(leaves)] = leaves
+        for i in range(self.size - 1, 0, -1):
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def set(self, index, value):
+        while index >= self.size:
+            self._grow()
+        i = index + self.size
+        self.tree[i] = value
+        i //= 2
+        while i:
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+    def get(self, index):
+        return self.tree[index + self.size]
+
+    def first_at_least(self, lo, need):
+        """Smallest index >= lo whose value is >= need, or -1."""
+        return self._find(1, 0, self.size - 1, lo, need)
+
+    def _find(self, node, left, right, lo, need):
+        if right < lo or self.tree[node] < need:
+            return -1
+        if left == right:
+            return left
+        mid = (left + right) // 2
+        found = self._find(2 * node, left, mid, lo, need)
+        if found != -1:
+            return found
+        return self._find(2 * node + 1, mid + 1, right, lo, need)
+
+
+class Scheduler:
+    """Places tasks on working days with a per-day capacity and reports deadline misses."""
+
+    def __init__(self, start_date=None, work_start="09:00", work_end="17:00",
+                 daily_capacity=None, workdays=WEEKDAYS):
+        self.work_start = datetime.datetime.strptime(work_start, "%H:%M").time()
+        work_end = datetime.datetime.strptime(work_end, "%H:%M").time()
+        window = (datetime.datetime.combine(datetime.date.min, work_end)
+                  - datetime.datetime.combine(datetime.date.min, self.work_start))
+        self.window_minutes = int(window.total_seconds() // 60)
+        self.capacity = min(daily_capacity or self.window_minutes, self.window_minutes)
+        if self.capacity <= 0:
+            raise ValueError("work_end must be after work_start and capacity must be positive")
+        self.workdays = set(workdays)
+
+        self.dates = []       # working-day index -> date
+        self.next_free = []   # working-day index -> minutes after work_start of the free tail
+        self.free = _CapacityTree()
+        self._cursor = start_date or datetime.date.today()
+
+    def _add_day(self):
+        while self._cursor.weekday() not in self.workdays:
+            self._cursor += datetime.timedelta(days=1)
+        index = len(self.dates)
+        self.dates.append(self._cursor)
+        self.next_free.append(0)
+        self.free.set(index, self.capacity)
+        self._cursor += datetime.timedelta(days=1)
+        return index
+
+    def _earliest_day(self, lo, need):
+        need = max(need, 1)  # unopened days are 0-valued leaves; never match them
+        day = self.free.first_at_least(lo, need)
+        while day == -1:
+            # Nothing in the horizon fits: open a fresh day (which always has full capacity).
+            self._add_day()
+            day = self.free.first_at_least(lo, need)
+        return day
+
+    def _clock(self, day, offset):
+        start = datetime.datetime.combine(self.dates[day], self.work_start)
+        return (start + datetime.timedelta(minutes=offset)).time()
+
+    def place(self, name, minutes, deadline=None):
+        """Schedule one task; returns a list of slot dicts (several if it spans days)."""
+        if not self.dates:
+            self._add_day()
+        slots = []
+        remaining, lo = int(minutes), 0
+        parts = max(1, -(-remaining // self.capacity))
+        while remaining > 0 or not slots:
+            chunk = min(remaining, self.capacity)
+            day = self._earliest_day(lo, chunk)
+            offset = self.next_free[day]
+            self.next_free[day] = offset + chunk
+            self.free.set(day, self.free.get(day) - chunk)
+            slots.append({
+                "task": name,
+                "day": self.dates[day],
+                "start_time": self._clock(day, offset),
+                "end_time": self._clock(day, offset + chunk),
+                "minutes": chunk,
+                "part": f"{len(slots) + 1}/{parts}",
+                "late": deadline is not None and self.dates[day] > deadline,
+            })
+            remaining -= chunk
+            lo = day + 1
+        return slots
+
+    def schedule(self, tasks):
+        """Place ``tasks`` (dicts with task/estimated_time and optional YYYY-MM-DD deadline and priority).
+
+        Earliest deadline first; tasks with equal deadlines go by descending
+        ``priority``, then in the order given. Tasks without a deadline come last.
+        """
+        queue = []
+        for t in tasks:
+            deadline = t.get("deadline")
+            if isinstance(deadline, str) and deadline:
+                deadline = datetime.datetime.strptime(deadline, "%Y-%m-%d").date()
+            queue.append((deadline or datetime.date.max, -t.get("priority", 0), len(queue), t, deadline or None))
+        queue.sort(key=lambda entry: entry[:3])
+        plan = []
+        for *_, t, deadline in queue:
+            plan.extend(self.place(t["task"], t["estimated_time"], deadline))
+        return plan
+
+
+def group_by_day(plan):
+    """``{date: [slots sorted by start time]}`` for display."""
+    days = {}
+    for slot in plan:
+        days.setdefault(slot["day"], []).append(slot)
+    return {day: sorted(slots, key=lambda s: s["start_time"]) for day, slots in sorted(days.items())}
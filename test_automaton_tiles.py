@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from automaton_engine import HALO, ArrayAutomaton
+from automaton_tiles import TiledWorld
+
+
+def assert_same_state(world, automaton):
+    energy, species, age = world.to_arrays()
+    np.testing.assert_array_equal(species, automaton.species)
+    np.testing.assert_array_equal(energy, automaton.energy)
+    np.testing.assert_array_equal(age, automaton.age)
+    np.testing.assert_array_equal(world.population(), automaton.population())
+
+
+@pytest.mark.parametrize("rows, cols, tile, density", [(37, 53, 8, 0.3), (40, 40, 16, 0.05), (30, 70, 64, 0.5),
+                                                       (25, 25, HALO, 0.2)])
+def test_tiled_world_matches_array_automaton(rows, cols, tile, density):
+    automaton = ArrayAutomaton(rows, cols, initial_density=density, seed=11)
+    with TiledWorld(rows, cols, initial_density=density, seed=11, tile=tile, processes=1) as world:
+        assert_same_state(world, automaton)
+        for _ in range(15):
+            automaton.evolve()
+            world.evolve()
+            assert_same_state(world, automaton)
+
+
+def test_process_pool_gives_the_same_world():
+    automaton = ArrayAutomaton(48, 48, initial_density=0.3, seed=5)
+    with TiledWorld(48, 48, initial_density=0.3, seed=5, tile=16, processes=2) as world:
+        for _ in range(5):
+            automaton.evolve()
+            world.evolve()
+        assert_same_state(world, automaton)
+
+
+def test_from_arrays_continues_a_dense_run():
+    automaton = ArrayAutomaton(33, 41, initial_density=0.4, seed=3)
+    for _ in range(4):
+        automaton.evolve()
+    world = TiledWorld.from_arrays(automaton.energy, automaton.species, automaton.age, automaton.seed,
+                                   automaton.generation, tile=10, processes=1)
+    for _ in range(6):
+        automaton.evolve()
+        world.evolve()
+    assert_same_state(world, automaton)
+
+
+def test_empty_tiles_are_not_stored():
+    with TiledWorld(256, 256, initial_density=0, seed=0, tile=32, processes=1) as world:
+        assert world.memory_bytes() == 0
+        world.evolve()
+        assert not world.tiles
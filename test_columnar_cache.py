@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from columnar_cache import load_csv, sidecar_path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "sample_data.csv"
+    path.write_text("Name,Age,Department,Salary,Active\n"
+                    "Alice,30,HR,50000,True\n"
+                    "Bob,,IT,70000.5,False\n"
+                    "Charlie,28,,55000,True\n"
+                    ",40,IT,,False\n"
+                    "Eve,25,HR,48000,True\n")
+    return str(path)
+
+
+def built_at(csv_path):
+    return os.stat(os.path.join(sidecar_path(csv_path), "meta.json")).st_mtime_ns
+
+
+def test_matches_read_csv(csv_path):
+    expected = pd.read_csv(csv_path)
+    pd.testing.assert_frame_equal(load_csv(csv_path), expected)  # builds the sidecar
+    loaded = load_csv(csv_path)  # maps it
+    pd.testing.assert_frame_equal(loaded, expected)
+    # Downstream cleaning behaves as on a plain read_csv frame
+    for frame in (loaded, expected):
+        frame["Department"] = frame["Department"].fillna(frame["Department"].mode()[0])
+        frame["Age"] = frame["Age"].fillna(frame["Age"].mean())
+    pd.testing.assert_frame_equal(loaded, expected)
+    pd.testing.assert_series_equal(loaded.groupby("Department")["Salary"].mean(),
+                                   expected.groupby("Department")["Salary"].mean())
+
+
+def test_sidecar_reused_until_csv_changes(csv_path):
+    load_csv(csv_path)
+    first = built_at(csv_path)
+    load_csv(csv_path)
+    assert built_at(csv_path) == first
+
+    # Same content, new mtime: the hash check keeps the columns
+    os.utime(csv_path, ns=(1, 1))
+    load_csv(csv_path)
+    with open(os.path.join(sidecar_path(csv_path), "meta.json")) as f:
+        assert json.load(f)["csv"]["mtime_ns"] == 1
+
+    with open(csv_path, "a") as f:
+        f.write("Frank,33,Finance,61000,True\n")
+    assert len(load_csv(csv_path)) == 6
+
+
+def test_read_csv_options_are_part_of_the_key(csv_path):
+    load_csv(csv_path)
+    narrow = load_csv(csv_path, usecols=["Name", "Salary"])
+    pd.testing.assert_frame_equal(narrow, pd.read_csv(csv_path, usecols=["Name", "Salary"]))
+    as_float = load_csv(csv_path, dtype={"Age": np.float32})
+    assert as_float["Age"].dtype == np.float32
+    pd.testing.assert_frame_equal(load_csv(csv_path), pd.read_csv(csv_path))
+
+
+def test_columns_that_are_not_all_strings_match_read_csv(tmp_path):
+    path = tmp_path / "mixed.csv"
+    path.write_text("flag,when,n\n"
+                    "True,2025-11-03,1\n"
+                    ",2025-11-04,2\n"
+                    "False,,3\n")
+    for kwargs in ({}, {"parse_dates": ["when"]}, {"dtype": {"n": object}}):
+        expected = pd.read_csv(path, **kwargs)
+        pd.testing.assert_frame_equal(load_csv(str(path), **kwargs), expected)
+        pd.testing.assert_frame_equal(load_csv(str(path), **kwargs), expected)
+    assert load_csv(str(path))["flag"].tolist()[::2] == [True, False]
+
+
+def test_concurrent_builds_and_loads(csv_path):
+    errors = []
+
+    def load(rebuild):
+        try:
+            for _ in range(10):
+                pd.testing.assert_frame_equal(load_csv(csv_path, rebuild=rebuild), pd.read_csv(csv_path))
+        except Exception as e:  # surfaced below, in the test thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=load, args=(rebuild,)) for rebuild in (True, True, True, False, False)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    # No staging or set-aside directories left behind
+    assert sorted(os.listdir(os.path.dirname(csv_path))) == sorted([os.path.basename(csv_path),
+                                                                     os.path.basename(sidecar_path(csv_path))])
+    pd.testing.assert_frame_equal(load_csv(csv_path), pd.read_csv(csv_path))
@@ -0,0 +1,90 @@
+import csv
+import os
+import threading
+
+import pytest
+
+from event_log import EventLogWriter
+from productivity_log import ProductivityLog
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_rows_from_many_threads_are_written_whole(tmp_path):
+    path = str(tmp_path / "log.csv")
+    log = EventLogWriter(path, header=["thread", "n", "text"], max_batch=7, flush_interval=0.01)
+
+    def writer(name):
+        for n in range(200):
+            log.write([name, n, "a, quoted \"value\""])
+
+    threads = [threading.Thread(target=writer, args=(f"t{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.flush()
+    rows = read_rows(path)
+    assert rows[0] == ["thread", "n", "text"]
+    assert len(rows) == 801
+    for i in range(4):
+        assert [int(r[1]) for r in rows[1:] if r[0] == f"t{i}"] == list(range(200))
+    log.close()
+
+
+def test_flush_and_close_after_close_return(tmp_path):
+    path = str(tmp_path / "log.csv")
+    log = EventLogWriter(path, flush_interval=60)
+    log.write(["a", 1])
+    log.close()
+    finished = threading.Event()
+    thread = threading.Thread(target=lambda: (log.flush(), log.close(), finished.set()), daemon=True)
+    thread.start()
+    assert finished.wait(5), "flush() after close() blocked"
+    assert read_rows(path) == [["a", "1"]]
+    with pytest.raises(ValueError):
+        log.write(["b", 2])
+
+
+def test_productivity_log_queries_after_close(tmp_path):
+    log = ProductivityLog(str(tmp_path / "log"), flush_interval=60)
+    log.write(["2025-11-06 09:00:00", "Task Added", "report"])
+    log.close()
+    finished = threading.Event()
+    rows = []
+    thread = threading.Thread(target=lambda: (rows.extend(log.events("2025-11-06")), log.flush(), finished.set()),
+                              daemon=True)
+    thread.start()
+    assert finished.wait(5), "events()/flush() after close() blocked"
+    assert rows == [["2025-11-06 09:00:00", "Task Added", "report"]]
+
+
+def test_flush_racing_close_returns(tmp_path):
+    for _ in range(20):
+        log = EventLogWriter(str(tmp_path / "race.csv"), flush_interval=60)
+        log.write(["x"])
+        closer = threading.Thread(target=log.close)
+        closer.start()
+        log.flush()
+        closer.join()
+
+
+def test_rotation_by_size(tmp_path):
+    path = str(tmp_path / "log.csv")
+    log = EventLogWriter(path, header=["n"], max_batch=10, rotate_bytes=200, flush_interval=0.01)
+    for n in range(300):
+        log.write([n])
+        if n % 10 == 9:
+            log.flush()
+    log.close()
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) > 1
+    values = []
+    for name in files:
+        rows = read_rows(tmp_path / name)
+        assert rows[0] == ["n"]
+        values += [int(r[0]) for r in rows[1:]]
+    assert sorted(values) == list(range(300))
@@ -0,0 +1,52 @@
+import numpy as np
+
+from fractal_cache import TileCache, TiledView
+from fractal_render import MandelbrotRenderer
+
+RENDERER = MandelbrotRenderer(processes=1)
+
+
+def fresh(view):
+    """The same window rendered with an empty cache."""
+    other = TiledView(view.width, view.height, max_iter=view.home_iter, renderer=RENDERER)
+    other.zoom, other.row, other.col, other.max_iter = view.zoom, view.row, view.col, view.max_iter
+    return other.render()
+
+
+def test_home_frame_is_the_plain_render():
+    view = TiledView(48, 24, renderer=RENDERER)
+    np.testing.assert_array_equal(view.render(), RENDERER.render(48, 24, -2.0, 1.0, -1.5, 1.5, 50))
+
+
+def test_zooming_back_out_reuses_tiles_rendered_with_more_iterations():
+    view = TiledView(48, 24, renderer=RENDERER)
+    view.zoom_by(2)
+    view.render()
+    view.max_iter = 80  # e.g. the user raised it while zoomed in
+    view.render()
+    assert view.reused == 0  # rendered with fewer iterations than now wanted
+    view.zoom_by(0.5)
+    view.zoom_by(2)
+    view.max_iter = 70  # never rendered at this level, but below the 80 the tiles have
+    frame = view.render()
+    assert view.rendered == 0 and view.reused > 0
+    np.testing.assert_array_equal(frame, fresh(view))
+
+
+def test_tiles_with_fewer_iterations_are_rerendered():
+    cache = TileCache()
+    counts = np.array([[3, 50]], dtype=np.int32)
+    cache.put(("z", 0, 0), counts, 50)
+    np.testing.assert_array_equal(cache.get(("z", 0, 0), 20), [[3, 20]])
+    assert cache.get(("z", 0, 0), 50) is counts
+    assert cache.get(("z", 0, 0), 51) is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_pan_renders_only_exposed_tiles():
+    view = TiledView(48, 24, renderer=RENDERER, tile=8)
+    view.render()
+    view.pan("right", 1 / 6)  # 8 pixels: one new column of tiles
+    frame = view.render()
+    assert view.rendered == 3 and view.reused == 15
+    np.testing.assert_array_equal(frame, fresh(view))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from fractal_deep import perturbation_counts, reference_orbit
+from fractal_render import escape_counts
+
+MAX_ITER = 200
+
+
+def offsets(half_width, n=81):
+    axis = np.linspace(-half_width, half_width, n)
+    return axis[None, :] + 1j * axis[:, None]
+
+
+def assert_mostly_equal(counts, expected, tolerance=0.01):
+    # Pixels next to the set's boundary may round differently along the two
+    # paths; anywhere else the counts must agree
+    assert counts.shape == expected.shape
+    assert np.mean(counts != expected) <= tolerance
+
+
+@pytest.mark.parametrize("cx, cy, half_width", [(-0.5, 0.0, 1.5), (-0.7435, 0.1314, 1e-3), (-1.25, 0.02, 1e-2)])
+def test_matches_escape_counts_where_float64_is_exact(cx, cy, half_width):
+    orbit = reference_orbit(cx, cy, MAX_ITER, digits=30)
+    dc = offsets(half_width)
+    counts = perturbation_counts(dc, orbit, MAX_ITER)
+    expected = escape_counts(complex(cx, cy) + dc, MAX_ITER)
+    assert (expected == MAX_ITER).any() and (expected < MAX_ITER).any()
+    assert_mostly_equal(counts, expected)
+
+
+def test_rebases_when_the_reference_escapes_early():
+    # C = 0.4 + 0.3i escapes after 15 steps, but the frame around it
+    # reaches into the set, so those pixels must run past the end of the orbit
+    orbit = reference_orbit(0.4, 0.3, MAX_ITER, digits=30)
+    assert len(orbit) - 1 < MAX_ITER
+    dc = offsets(0.5)
+    counts = perturbation_counts(dc, orbit, MAX_ITER)
+    expected = escape_counts(0.4 + 0.3j + dc, MAX_ITER)
+    assert (counts > len(orbit)).any() and (counts == MAX_ITER).any()
+    assert_mostly_equal(counts, expected)
@@ -0,0 +1,34 @@
+import runpy
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fractal_render import escape_counts
+
+HERE = Path(__file__).resolve().parent
+mandelbrot = runpy.run_path(str(HERE / "Fractal generator and explorer"), run_name="fractal_explorer")["mandelbrot"]
+
+
+@pytest.mark.parametrize("max_iter", [1, 30, 150])
+def test_escape_counts_match_the_scalar_loop(max_iter):
+    real = np.linspace(-2.2, 0.8, 61)
+    imag = np.linspace(-1.3, 1.3, 47)
+    c = real[None, :] + 1j * imag[:, None]
+    counts = escape_counts(c, max_iter)
+    assert counts.dtype == np.int32 and counts.shape == c.shape
+    expected = np.array([[mandelbrot(complex(point), max_iter) for point in row] for row in c])
+    np.testing.assert_array_equal(counts, expected)
+
+
+def test_points_inside_and_outside_the_set():
+    points = np.array([
+        0, -0.5 + 0.3j, 0.25,  # main cardioid (0.25 is its cusp)
+        -1, -1.1 + 0.1j,  # period-2 bulb
+        -0.12 + 0.75j, -1.75,  # in the set but outside both shortcuts
+        0.3 + 0.6j, 1, -2.1, 2j,  # escape
+    ])
+    counts = escape_counts(points, 200)
+    np.testing.assert_array_equal(counts, [mandelbrot(complex(point), 200) for point in points])
+    assert (counts[:7] == 200).all() and (counts[7:] < 200).all()
+    np.testing.assert_array_equal(counts[8:], [3, 1, 2])
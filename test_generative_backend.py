@@ -0,0 +1,72 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from generative_backend import Primitives, TiledRenderer, draw
+
+PALETTE = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+
+def scene():
+    shapes = Primitives(PALETTE)
+    shapes.add_polygons([(2, 2), (6, 2), (6, 6), (2, 6)], [4], level=0, color=0)  # square
+    shapes.add_polygons([(10, 1), (18, 1), (10, 9)], [3], level=0, color=1)  # right triangle
+    shapes.add_segments([(1, 12.5, 15, 12.5)], width=2, level=1, color=2)
+    shapes.add_polygons([(4, 4), (8, 4), (8, 8), (4, 8)], [4], level=1, color=1)  # over the square
+    return shapes
+
+
+def read_png(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, idat = 8, b""
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        assert struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])[0] == zlib.crc32(kind + body)
+        if kind == b"IHDR":
+            width, height = struct.unpack(">II", body[:8])
+        elif kind == b"IDAT":
+            idat += body
+        pos += 12 + length
+    rows = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(height, 1 + 3 * width)
+    assert not rows[:, 0].any()  # no filter
+    return rows[:, 1:].reshape(height, width, 3)
+
+
+def test_draw_fills_polygons_and_strokes_segments():
+    image = draw(scene().arrays(), 20, 16)
+    red, green, blue = (image == np.array(PALETTE)[:, None, None]).all(axis=-1)
+    rows, cols = np.mgrid[0:16, 0:20] + 0.5  # pixel centres
+
+    # Square: pixels with centres inside, minus the part the deeper square covers
+    square = (rows > 2) & (rows < 6) & (cols > 2) & (cols < 6)
+    top_square = (rows > 4) & (rows < 8) & (cols > 4) & (cols < 8)
+    np.testing.assert_array_equal(red, square & ~top_square)
+    # Triangle with legs along x = 10 and y = 1, hypotenuse x + y = 19
+    triangle = (cols > 10) & (rows > 1) & (cols + rows < 19)
+    np.testing.assert_array_equal(green, triangle | top_square)
+    # Segment of width 2 with round caps: centres within 1 of it
+    distance = np.hypot(cols - np.clip(cols, 1, 15), rows - 12.5)
+    np.testing.assert_array_equal(blue, distance <= 1)
+    assert (image[~(red | green | blue)] == 0).all()
+
+
+def test_draw_region_is_a_crop_of_the_whole_image():
+    whole = draw(scene().arrays(), 20, 16, background=(9, 9, 9))
+    part = draw(scene().arrays(), 7, 5, x0=3, y0=10, background=(9, 9, 9))
+    np.testing.assert_array_equal(part, whole[10:15, 3:10])
+
+
+@pytest.mark.parametrize("tile, processes", [(7, 1), (5, 2), (64, 1)])
+def test_save_png_streams_the_same_image_in_tiles(tmp_path, tile, processes):
+    shapes = scene()
+    expected = draw(shapes.arrays(), 20, 16, background=(1, 2, 3))
+    path = tmp_path / "scene.png"
+    with TiledRenderer(tile=tile, processes=processes) as renderer:
+        np.testing.assert_array_equal(renderer.render(shapes, (20, 16), background=(1, 2, 3)), expected)
+        renderer.save_png(shapes, (20, 16), path, background=(1, 2, 3))
+    np.testing.assert_array_equal(read_png(path), expected)
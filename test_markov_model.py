@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from markov_model import MarkovModel
+from markov_train import train_files
+
+rng = random.Random(0)
+WORDS = [f"w{i}" for i in range(40)] + ["naïve", "café", "—"]
+
+
+def corpus(lines):
+    return "".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 12))) + rng.choice(["\n", " \n", "\n\n"])
+                   for _ in range(lines))
+
+
+def transitions(model):
+    """{(state tokens..., follower): count}, independent of how token ids were assigned."""
+    counts = np.diff(model.cumulative, prepend=0)
+    table = {}
+    for state, tokens in enumerate(model.states.tolist()):
+        for t in range(model.offsets[state], model.offsets[state + 1]):
+            key = tuple(model.tokens[i] for i in tokens) + (model.tokens[model.followers[t]],)
+            table[key] = int(counts[t])
+    return table
+
+
+def assert_same_model(a, b):
+    assert a.tokens == b.tokens
+    for name in ("states", "offsets", "followers", "cumulative", "next_state"):
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+
+
+@pytest.mark.parametrize("order", [1, 2, 3])
+@pytest.mark.parametrize("shard_bytes, processes", [(1, 1), (37, 1), (500, 2), (10 ** 6, 1)])
+def test_sharded_training_matches_single_pass(tmp_path, order, shard_bytes, processes):
+    path = tmp_path / "corpus.txt"
+    path.write_text(corpus(150), encoding="utf-8")
+    with open(path, encoding="utf-8") as f:
+        expected = MarkovModel.train(f, order)
+    assert_same_model(train_files([str(path)], order, processes, shard_bytes), expected)
+
+
+def test_files_are_separate_texts(tmp_path):
+    texts = [corpus(40) for _ in range(3)]
+    paths = []
+    for i, text in enumerate(texts):
+        paths.append(str(tmp_path / f"part{i}.txt"))
+        with open(paths[-1], "w", encoding="utf-8") as f:
+            f.write(text)
+    expected = {}
+    for text in texts:
+        for key, n in transitions(MarkovModel.train(text, 2)).items():
+            expected[key] = expected.get(key, 0) + n
+    assert transitions(train_files(paths, 2, processes=2, shard_bytes=101)) == expected
+
+
+def test_saved_model_loads_as_the_same_table(tmp_path):
+    model = MarkovModel.train(corpus(200), 2)
+    path = str(tmp_path / "model.bin")
+    model.save(path)
+    loaded = MarkovModel.load(path)
+    assert_same_model(loaded, model)
+    assert loaded.generate(200, rng=random.Random(1)) == model.generate(200, rng=random.Random(1))
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_model.bin"
+    path.write_bytes(b"hello world" * 10)
+    with pytest.raises(ValueError):
+        MarkovModel.load(str(path))
@@ -0,0 +1,44 @@
+import os
+import random
+import runpy
+
+import pytest
+
+engine = runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Micro prediction engine"),
+                        run_name="engine")
+MicroPredictionEngine = engine["MicroPredictionEngine"]
+StreamingPredictionEngine = engine["StreamingPredictionEngine"]
+
+rng = random.Random(0)
+EVENTS = [rng.choice("abcd") if rng.random() < 0.3 else "xyz"[i % 3] for i in range(5000)]
+SEGMENTS = [tuple(EVENTS[i:i + 3]) for i in range(0, 4000, 7)] + [("q", "q", "q")]
+
+
+def test_streaming_observe_matches_list_observe():
+    listed = MicroPredictionEngine(history_size=3)
+    listed.observe(EVENTS)
+    streamed = StreamingPredictionEngine(history_size=3, max_patterns=10**6, top_k=10)
+    for start in range(0, len(EVENTS), 333):  # the window carries over between calls
+        streamed.observe(iter(EVENTS[start:start + 333]))
+    assert dict(streamed.patterns) == listed.patterns
+    assert streamed.evicted == 0
+    assert streamed.predict_many(SEGMENTS) == listed.predict_many(SEGMENTS) == [listed.predict(list(s))
+                                                                                for s in SEGMENTS]
+
+
+def test_bounds_keep_the_frequent_followers():
+    streamed = StreamingPredictionEngine(history_size=3, max_patterns=50, top_k=2)
+    streamed.observe(EVENTS)
+    assert len(streamed.patterns) <= 50
+    assert all(len(followers) <= 2 for followers in streamed.patterns.values())
+    assert streamed.predict(["x", "y", "z"]) == "x"
+
+
+@pytest.mark.parametrize("segment", ["xyz", 123, ("x", "y")])
+def test_predict_many_rejects_what_predict_rejects(segment):
+    predictor = MicroPredictionEngine(history_size=3)
+    predictor.observe(EVENTS)
+    with pytest.raises(ValueError):
+        predictor.predict(segment)
+    with pytest.raises(ValueError):
+        predictor.predict_many([("x", "y", "z"), segment])
@@ -0,0 +1,126 @@
+import csv
+import json
+import os
+
+import pytest
+
+import productivity_log
+from productivity_log import IMPORT_MANIFEST, ProductivityLog
+
+LEGACY_ROWS = [
+    ["2025-11-04 09:00:00", "Task Added", "old a"],
+    ["2025-11-05 10:00:00", "Task Completed", "old b"],
+]
+ROTATED_ROWS = [
+    ["2025-11-03 08:00:00", "Task Added", "rotated a"],
+    ["2025-11-03 17:00:00", "Focus Session", "rotated b"],
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([["Timestamp", "Event", "Details"]] + rows)
+
+
+@pytest.fixture
+def legacy(tmp_path):
+    """An old single-file log plus one file EventLogWriter rotated it into."""
+    path = tmp_path / "productivity_log.csv"
+    write_csv(path, LEGACY_ROWS)
+    write_csv(tmp_path / "productivity_log.2025-11-03.csv", ROTATED_ROWS)
+    return str(path)
+
+
+def test_counts_are_kept_per_day(tmp_path):
+    directory = str(tmp_path / "log")
+    log = ProductivityLog(directory, flush_interval=0.01)
+    log.write(["2025-11-06 09:00:00", "Task Added", "a"])
+    log.write(["2025-11-06 10:00:00", "Task Added", "b"])
+    log.write(["2025-11-07 09:00:00", "Task Completed", "a"])
+    log.flush()
+    assert log.counts("2025-11-06") == {"Task Added": 2}
+    assert log.range_counts("2025-11-06", "2025-11-07") == {"Task Added": 2, "Task Completed": 1}
+    assert [row[2] for row in log.events("2025-11-06", "2025-11-07", event="Task Added")] == ["a", "b"]
+
+    # A commit rewrites only the count files of the days it touches
+    untouched = os.stat(os.path.join(directory, "2025-11-06.json")).st_mtime_ns
+    log.write(["2025-11-07 11:00:00", "Task Completed", "b"])
+    log.flush()
+    assert os.stat(os.path.join(directory, "2025-11-06.json")).st_mtime_ns == untouched
+    log.close()
+
+    assert not os.path.exists(os.path.join(directory, "index.json"))
+    reopened = ProductivityLog(directory)
+    assert [n for _, n in reopened.daily_series("Task Completed", "2025-11-06", "2025-11-08")] == [0, 2, 0]
+    reopened.close()
+
+
+def test_old_index_is_split_into_day_files(tmp_path):
+    directory = tmp_path / "log"
+    directory.mkdir()
+    (directory / "index.json").write_text(json.dumps({"2025-11-01": {"Task Added": 4}}))
+    log = ProductivityLog(str(directory))
+    assert log.counts("2025-11-01") == {"Task Added": 4}
+    assert not (directory / "index.json").exists()
+    log.close()
+
+
+def test_import_includes_rotated_files(tmp_path, legacy):
+    log = ProductivityLog(str(tmp_path / "log"), legacy_file=legacy)
+    assert list(log.events("2025-11-03", "2025-11-05")) == ROTATED_ROWS + LEGACY_ROWS
+    assert log.range_counts("2025-11-03", "2025-11-05") == {"Task Added": 2, "Task Completed": 1,
+                                                           "Focus Session": 1}
+    assert sorted(os.listdir(tmp_path)) == ["log", "productivity_log.2025-11-03.csv.imported",
+                                            "productivity_log.csv.imported"]
+    log.close()
+
+
+def test_import_merges_with_existing_partition(tmp_path, legacy):
+    directory = str(tmp_path / "log")
+    log = ProductivityLog(directory)
+    log.write(["2025-11-04 12:00:00", "Task Completed", "new"])
+    log.import_legacy(legacy)
+    log.write(["2025-11-04 13:00:00", "Task Added", "newer"])
+    assert [row[2] for row in log.events("2025-11-04")] == ["old a", "new", "newer"]
+    assert log.counts("2025-11-04") == {"Task Added": 2, "Task Completed": 1}
+    log.close()
+
+
+def test_crash_before_commit_point_leaves_nothing_imported(tmp_path, legacy, monkeypatch):
+    directory = str(tmp_path / "log")
+    real_write = productivity_log._write_file
+
+    def crash_on_manifest(path, text, replace=True):
+        if path.endswith(IMPORT_MANIFEST):
+            raise OSError("disk gone")
+        real_write(path, text, replace)
+
+    monkeypatch.setattr(productivity_log, "_write_file", crash_on_manifest)
+    with pytest.raises(OSError):
+        ProductivityLog(directory, legacy_file=legacy)
+    monkeypatch.setattr(productivity_log, "_write_file", real_write)
+    assert not any(name.endswith(".csv") for name in os.listdir(directory))
+
+    log = ProductivityLog(directory, legacy_file=legacy)
+    assert list(log.events("2025-11-03", "2025-11-05")) == ROTATED_ROWS + LEGACY_ROWS
+    assert not any(name.endswith(".import") for name in os.listdir(directory))
+    log.close()
+
+
+def test_crash_after_commit_point_is_finished_once(tmp_path, legacy, monkeypatch):
+    directory = str(tmp_path / "log")
+
+    def power_cut(self):
+        raise OSError("power cut")
+
+    monkeypatch.setattr(ProductivityLog, "_apply_import", power_cut)
+    with pytest.raises(OSError):
+        ProductivityLog(directory, legacy_file=legacy)
+    monkeypatch.undo()
+    assert os.path.exists(os.path.join(directory, IMPORT_MANIFEST))
+
+    log = ProductivityLog(directory, legacy_file=legacy)
+    assert list(log.events("2025-11-03", "2025-11-05")) == ROTATED_ROWS + LEGACY_ROWS
+    assert log.counts("2025-11-03") == {"Task Added": 1, "Focus Session": 1}
+    assert not os.path.exists(legacy)
+    log.close()
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from report_streaming import QUANTILE_BINS, HeavyHitters, scan_fill_values, stream_report_data, write_cleaned
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 2500
+    frame = pd.DataFrame({
+        "Name": [f"name{i}" for i in rng.integers(0, 2000, n)],
+        "Age": rng.integers(20, 65, n).astype(float),
+        "Department": rng.choice(["HR", "IT", "Finance", "Sales"], n, p=[0.1, 0.5, 0.2, 0.2]),
+        "Salary": rng.normal(60000, 12000, n).round(),
+    })
+    for col in frame.columns:
+        frame.loc[rng.random(n) < 0.05, col] = np.nan
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def in_memory(path):
+    """The in-memory pipeline of automation.py."""
+    data = pd.read_csv(path)
+    for col in data.columns:
+        if data[col].dtype in [np.float64, np.int64]:
+            data[col] = data[col].fillna(data[col].mean())
+        else:
+            data[col] = data[col].fillna(data[col].mode()[0])
+    return data
+
+
+@pytest.mark.parametrize("chunksize", [97, 1000, 100_000])
+def test_chunked_statistics_match_pandas(csv_path, tmp_path, chunksize):
+    data = in_memory(csv_path)
+    cleaned = tmp_path / "cleaned.csv"
+    summary = stream_report_data(csv_path, chunksize, cleaned_csv=cleaned)
+
+    expected = data.describe()
+    exact = ["count", "mean", "std", "min", "max"]
+    pd.testing.assert_frame_equal(summary["descriptive"].loc[exact], expected.loc[exact], check_dtype=False)
+    for col in expected.columns:
+        # Histogram quantiles land within one bin of the order statistics around the quantile's rank
+        values = np.sort(data[col].to_numpy())
+        width = (values[-1] - values[0]) / QUANTILE_BINS
+        for q in [0.25, 0.5, 0.75]:
+            rank = q * len(values)
+            low, high = values[max(int(rank) - 1, 0)], values[min(int(rank) + 1, len(values) - 1)]
+            assert low - width <= summary["descriptive"].loc[f"{q:.0%}", col] <= high + width
+
+    pd.testing.assert_series_equal(summary["dept_salary"], data.groupby("Department")["Salary"].mean(),
+                                   check_index_type=False)
+    pd.testing.assert_frame_equal(summary["corr"], data.corr(numeric_only=True))
+    pd.testing.assert_frame_equal(pd.read_csv(cleaned), data)
+
+
+def test_write_cleaned_matches_in_memory_cleaning(csv_path, tmp_path):
+    cleaned = tmp_path / "cleaned.csv"
+    write_cleaned(csv_path, cleaned, chunksize=333)
+    pd.testing.assert_frame_equal(pd.read_csv(cleaned), in_memory(csv_path))
+
+
+def test_fill_values_use_pandas_modes(csv_path):
+    data = pd.read_csv(csv_path)
+    _, fill_values, _ = scan_fill_values(csv_path, chunksize=300)
+    assert fill_values["Department"] == data["Department"].mode()[0]
+    assert fill_values["Name"] == data["Name"].mode()[0]
+    assert fill_values["Age"] == pytest.approx(data["Age"].mean())
+
+
+def test_heavy_hitters_exact_below_capacity():
+    values = [f"v{i % 7}" for i in range(1000)] + ["v3"] * 5
+    sketch = HeavyHitters(capacity=10)
+    for start in range(0, len(values), 64):
+        sketch.update(values[start:start + 64])
+    assert sketch.floor == 0
+    assert sketch.counts == pd.Series(values).value_counts().to_dict()
+    assert sketch.mode() == "v3"
+
+
+def test_heavy_hitters_bounded_on_high_cardinality():
+    rng = np.random.default_rng(1)
+    sketch = HeavyHitters(capacity=50)
+    for _ in range(200):
+        chunk = [f"id{i}" for i in rng.integers(0, 10**9, 500)] + ["frequent"] * 20
+        sketch.update(chunk)
+        assert len(sketch.counts) <= 50
+    assert sketch.mode() == "frequent"
@@ -0,0 +1,75 @@
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from task_clustering import TaskClusterEngine, _random_tasks
+
+GROUPS = [
+    ["Reply to client emails", "Answer client emails today", "Send emails to the client",
+     "Client emails follow up", "Draft emails for the client"],
+    ["Fix login bug", "Fix crash bug in parser", "Debug and fix payment bug", "Fix bug in export",
+     "Triage bug reports and fix"],
+    ["Prepare quarterly budget", "Review budget forecast", "Update budget spreadsheet",
+     "Budget planning meeting", "Approve budget changes"],
+]
+
+
+def raw_kmeans(engine, texts):
+    """The fit TaskClusterEngine.fit makes internally, before label alignment."""
+    X = engine.vectorizer.transform(list(dict.fromkeys(texts)))
+    return MiniBatchKMeans(n_clusters=engine.kmeans.n_clusters, random_state=engine.random_state,
+                           batch_size=engine.batch_size, n_init=3).fit(X)
+
+
+def test_refit_keeps_cluster_ids_and_moves_counts_with_centers():
+    texts = [t for group in GROUPS for t in group]
+    engine = TaskClusterEngine(n_clusters=3, model_path=None).fit(texts)
+    before = engine.assign(texts)
+
+    engine.random_state = 7  # a different initialisation, so the raw cluster order can change
+    engine.fit(texts)
+    assert engine.assign(texts) == before
+
+    raw = raw_kmeans(engine, texts)
+    for center, count in zip(engine.kmeans.cluster_centers_, engine.kmeans._counts):
+        match = np.flatnonzero(np.isclose(raw.cluster_centers_, center).all(axis=1))
+        assert len(match) == 1 and raw._counts[match[0]] == count
+    assert (engine.kmeans.predict(engine.vectorizer.transform(texts)) == engine.kmeans.labels_).all()
+
+
+def test_refit_with_fewer_clusters():
+    texts = _random_tasks(200)
+    engine = TaskClusterEngine(n_clusters=5, model_path=None).fit(texts)
+    engine.n_clusters = 2
+    engine.fit(texts)
+    assert set(engine.assign(texts)) <= {0, 1}
+    assert len(engine.kmeans._counts) == 2
+
+
+def test_single_new_tasks_update_the_centroids():
+    engine = TaskClusterEngine(n_clusters=3, model_path=None).fit(_random_tasks(100))
+    for i, task in enumerate(_random_tasks(5, seed=1)):
+        centers, counts = engine.kmeans.cluster_centers_.copy(), engine.kmeans._counts.sum()
+        engine.assign([task])
+        assert engine.kmeans._counts.sum() == counts + 1
+        assert not np.allclose(engine.kmeans.cluster_centers_, centers)
+
+
+def test_first_fit_waits_for_enough_tasks():
+    engine = TaskClusterEngine(n_clusters=3, model_path=None)
+    assert engine.assign(["Reply to client emails"]) == [0]
+    assert engine.kmeans is None
+    engine.assign(["Fix login bug"])
+    assert engine.kmeans is None
+    labels = engine.assign(["Prepare quarterly budget", "Reply to client emails"])
+    assert engine.kmeans.n_clusters == 3
+    assert len(labels) == 2 and labels[1] == engine.labels["Reply to client emails"]
+    assert len(engine.labels) == 3
+
+
+def test_saved_engine_round_trips(tmp_path):
+    path = str(tmp_path / "clusters.pkl")
+    texts = [t for group in GROUPS for t in group]
+    engine = TaskClusterEngine(n_clusters=3, model_path=path)
+    labels = engine.assign(texts)
+    engine.save()
+    assert TaskClusterEngine.load(path).assign(texts) == labels
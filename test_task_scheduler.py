@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+
+from task_scheduler import Scheduler, group_by_day
+
+MONDAY = datetime.date(2025, 11, 3)
+
+
+def scheduler(**kwargs):
+    return Scheduler(start_date=MONDAY, work_start="09:00", work_end="17:00", **kwargs)
+
+
+def days_of(plan):
+    days = {}
+    for slot in plan:
+        days.setdefault(slot["task"], []).append(slot["day"])
+    return days
+
+
+def test_urgent_task_listed_second_still_meets_its_deadline():
+    tasks = [
+        {"task": "Quarterly report", "deadline": "2025-11-14", "estimated_time": 480},
+        {"task": "Client call prep", "deadline": "2025-11-03", "estimated_time": 120},
+    ]
+    plan = scheduler().schedule(tasks)
+    assert days_of(plan) == {"Client call prep": [MONDAY],
+                             "Quarterly report": [MONDAY + datetime.timedelta(days=1)]}
+    assert not any(slot["late"] for slot in plan)
+
+
+def test_equal_deadlines_go_by_priority_then_input_order():
+    tasks = [
+        {"task": "low", "deadline": "2025-11-05", "estimated_time": 240, "priority": 1.0},
+        {"task": "high", "deadline": "2025-11-05", "estimated_time": 240, "priority": 4.0},
+        {"task": "also low", "deadline": "2025-11-05", "estimated_time": 240, "priority": 1.0},
+        {"task": "undated", "estimated_time": 60, "priority": 9.0},
+    ]
+    plan = scheduler().schedule(tasks)
+    assert [slot["task"] for slot in plan] == ["high", "low", "also low", "undated"]
+    assert [slot["start_time"] for slot in group_by_day(plan)[MONDAY]] == [datetime.time(9), datetime.time(13)]
+
+
+def test_capacity_weekends_and_split_tasks():
+    plan = scheduler(daily_capacity=240).schedule([
+        {"task": "big", "deadline": "2025-11-20", "estimated_time": 600},
+        {"task": "small", "deadline": "2025-11-20", "estimated_time": 30},
+    ])
+    for day, slots in group_by_day(plan).items():
+        assert day.weekday() < 5
+        assert sum(slot["minutes"] for slot in slots) <= 240
+    big = [slot for slot in plan if slot["task"] == "big"]
+    assert [slot["part"] for slot in big] == ["1/3", "2/3", "3/3"]
+    assert sum(slot["minutes"] for slot in big) == 600
+    # The short task back-fills the first day the long one left room on
+    assert days_of(plan)["small"] == [MONDAY + datetime.timedelta(days=2)]
+
+
+def test_missed_deadlines_are_flagged():
+    plan = scheduler().schedule([
+        {"task": "a", "deadline": "2025-11-03", "estimated_time": 480},
+        {"task": "b", "deadline": "2025-11-03", "estimated_time": 60},
+    ])
+    assert [slot["late"] for slot in plan] == [False, True]
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        Scheduler(start_date=MONDAY, work_start="17:00", work_end="09:00")
@@ -0,0 +1,51 @@
+import os
+import runpy
+
+import numpy as np
+import pytest
+
+annealing = runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Traveling sales person"),
+                           run_name="annealing")
+quantum_inspired_annealing = annealing["quantum_inspired_annealing"]
+objective_function = annealing["objective_function"]
+objective_function_batch = annealing["objective_function_batch"]
+BOUNDS = annealing["solution_bounds"]
+
+
+def test_scalar_objective_with_the_original_call():
+    calls = []
+
+    def objective(solution):
+        assert isinstance(solution, list) and len(solution) == 2
+        calls.append(solution)
+        return objective_function(solution)
+
+    solution, energy = quantum_inspired_annealing(objective, BOUNDS, 1000, 100.0, 0.99)
+    assert len(calls) == 1001
+    assert energy == pytest.approx(objective_function(solution))
+    assert all(low <= x <= high for x, (low, high) in zip(solution, BOUNDS))
+
+
+def test_default_result_is_solution_and_energy():
+    final_solution, min_energy = quantum_inspired_annealing(objective_function, BOUNDS)
+    assert len(final_solution) == 2 and min_energy == pytest.approx(objective_function(final_solution))
+    solution, energy, stats = quantum_inspired_annealing(objective_function_batch, BOUNDS, 50, batched=True,
+                                                         return_stats=True)
+    assert stats["chains"] == 256 and stats["evaluations"] == 256 * 51
+
+
+def test_positional_cooling_rate_is_not_taken_as_min_temp():
+    fast = quantum_inspired_annealing(objective_function, BOUNDS, 300, 100.0, 0.5, seed=1)
+    slow = quantum_inspired_annealing(objective_function, BOUNDS, 300, 100.0, 0.999, seed=1)
+    assert fast != slow
+    with pytest.raises(TypeError):
+        quantum_inspired_annealing(objective_function, BOUNDS, 300, 100.0, 0.99, 0.01, 16)
+
+
+def test_batched_objective_matches_row_by_row():
+    batched = quantum_inspired_annealing(objective_function_batch, BOUNDS, 200, chains=32, batched=True, seed=3,
+                                         return_stats=True)
+    scalar = quantum_inspired_annealing(objective_function, BOUNDS, 200, chains=32, seed=3, return_stats=True)
+    np.testing.assert_allclose(batched[0], scalar[0])
+    assert batched[1] == pytest.approx(scalar[1])
+    assert batched[2]["swap_acceptance"] == scalar[2]["swap_acceptance"]
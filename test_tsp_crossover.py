@@ -0,0 +1,68 @@
+import os
+import runpy
+
+import numpy as np
+import pytest
+
+from tsp_crossover import Crossover, _legacy_ox
+from tsp_distance import DistanceMatrix
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def script(name):
+    return runpy.run_path(os.path.join(HERE, name), run_name="tsp_script")
+
+
+@pytest.mark.parametrize("operator", ["ox", "pmx", "erx"])
+def test_children_are_permutations(operator):
+    rng = np.random.default_rng(0)
+    ops = Crossover(200, rng)
+    for _ in range(20):
+        child = ops(operator, rng.permutation(200), rng.permutation(200))
+        assert sorted(child.tolist()) == list(range(200))
+
+
+def test_ox_matches_the_list_scanning_version():
+    rng = np.random.default_rng(1)
+    ops = Crossover(50)
+    for start, end in [(0, 0), (0, 50), (10, 30), (49, 50)]:
+        parent1, parent2 = rng.permutation(50), rng.permutation(50)
+        assert ops.ox(parent1, parent2, cut=(start, end)).tolist() == _legacy_ox(parent1.tolist(), parent2.tolist(),
+                                                                                 start, end)
+
+
+@pytest.mark.parametrize("operator", ["ox", "pmx", "erx"])
+def test_same_seed_same_children(operator):
+    parents = np.random.default_rng(2).permutation(100), np.random.default_rng(3).permutation(100)
+    first, second = Crossover(100, rng=5), Crossover(100, rng=np.random.default_rng(5))
+    for _ in range(10):
+        assert (first(operator, *parents) == second(operator, *parents)).all()
+
+
+def test_tsp_script_is_reproducible_under_np_random_seed():
+    tsp = script("Tsp")
+
+    def run():
+        np.random.seed(42)
+        distances = DistanceMatrix(np.random.randint(0, 201, size=(25, 2)))
+        population = tsp["Population"](distances, 30)
+        for _ in range(15):
+            population = tsp["evolve_population"](population, 0.02)
+        return population.orders.copy()
+
+    assert (run() == run()).all()
+
+
+def test_ga_script_is_reproducible_with_a_seed():
+    ga_module = script("Travelling sales person 2")
+    coords = np.random.default_rng(0).integers(0, 201, size=(25, 2))
+
+    def run(seed):
+        ga = ga_module["GeneticAlgorithm"](DistanceMatrix(coords), population_size=30, crossover="erx", seed=seed)
+        population = ga.new_population()
+        for _ in range(15):
+            population = ga.evolve_population(population)
+        return population.orders.copy()
+
+    assert (run(7) == run(7)).all()
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from tsp_distance import DistanceMatrix
+from tsp_local_search import LocalSearch, neighbor_lists, space_filling_tour
+
+
+def edges(tour):
+    return {frozenset((tour[i], tour[(i + 1) % len(tour)])) for i in range(len(tour))}
+
+
+def moved_by_rebuilding(tour, p1, seg_len, c, end, after):
+    """The Or-opt move written out directly: cut the segment, reinsert it beside c."""
+    rotated = tour[p1:] + tour[:p1]
+    segment, rest = rotated[:seg_len], rotated[seg_len:]
+    at = rest.index(c)
+    if after:
+        rest[at + 1:at + 1] = segment if segment[0] == end else segment[::-1]
+    else:
+        rest[at:at] = segment if segment[-1] == end else segment[::-1]
+    return rest
+
+
+def test_segment_move_by_reversals_matches_cut_and_insert():
+    rng = random.Random(0)
+    for _ in range(3000):
+        n = rng.randint(6, 25)
+        tour = rng.sample(range(n), n)
+        p1, seg_len = rng.randrange(n), rng.randint(1, 3)
+        segment = [tour[(p1 + k) % n] for k in range(seg_len)]
+        c = rng.choice([city for city in tour if city not in segment])
+        after = rng.random() < 0.5
+        e = tour[(tour.index(c) + 1) % n] if after else tour[tour.index(c) - 1]
+        if e in segment:
+            continue
+        end = rng.choice([segment[0], segment[-1]])
+
+        ls = object.__new__(LocalSearch)
+        ls._t, ls._pos = list(tour), [0] * n
+        for i, city in enumerate(tour):
+            ls._pos[city] = i
+        ls._move_segment(p1, seg_len, c, end, after)
+        assert edges(ls._t) == edges(moved_by_rebuilding(tour, p1, seg_len, c, end, after))
+        assert all(ls._pos[city] == i for i, city in enumerate(ls._t))
+
+
+@pytest.mark.parametrize("or_opt", [True, False])
+def test_improve_returns_a_shorter_permutation_and_its_length(or_opt):
+    coords = np.random.default_rng(1).random((400, 2)) * 100
+    distances = DistanceMatrix(coords)
+    order = np.random.default_rng(2).permutation(400)
+    start = distances.tour_length(order)
+    length = LocalSearch(distances, or_opt=or_opt).improve(order)
+    assert sorted(order.tolist()) == list(range(400))
+    assert length == pytest.approx(distances.tour_length(order))
+    assert length < 0.5 * start
+
+
+def test_neighbor_lists_are_nearest_first_without_self():
+    coords = np.random.default_rng(3).random((200, 2))
+    nbrs = neighbor_lists(coords, k=5)
+    d = np.hypot(*(coords[:, None, :] - coords[None, :, :]).transpose(2, 0, 1))
+    np.fill_diagonal(d, np.inf)
+    np.testing.assert_array_equal(nbrs, np.argsort(d, axis=1, kind="stable")[:, :5])
+
+
+def test_space_filling_tour_is_a_permutation():
+    coords = np.random.default_rng(4).random((500, 2))
+    assert sorted(space_filling_tour(coords).tolist()) == list(range(500))
@@ -0,0 +1,129 @@
+# tsp_distance.py
+# Array-backed distances and tour lengths shared by the TSP scripts
+#
+# Cities are an (n, 2) float array and tours are integer permutations of city
+# indices. Up to `dense_limit` cities the full distance matrix is precomputed
+# (n² float64s, 32 MB at 2048); above that, distances are computed on demand
+# from the coordinates, which costs about the same as a matrix gather and keeps
+# memory linear in n.
+#
+# share() copies the arrays into a SharedMemory block; the shared copy pickles
+# as just the block's name, so worker processes attach to one read-only copy
+# instead of each receiving their own.
+
+import math
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+class DistanceMatrix:
+    """Euclidean distances between cities, with vectorized tour-length helpers."""
+
+    def __init__(self, coords, dense_limit=2048):
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        self.n = len(self.coords)
+        self.matrix = None
+        self._shm = None
+        self._owner = False
+        if self.n <= dense_limit:
+            diff = self.coords[:, None, :] - self.coords[None, :, :]
+            self.matrix = np.sqrt((diff ** 2).sum(axis=-1))
+
+    # ------------------- Shared Memory -------------------
+    def share(self):
+        """Return a copy backed by shared memory (call close() on it when done)."""
+        size = self.coords.nbytes + (self.matrix.nbytes if self.matrix is not None else 0)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = DistanceMatrix._attach(shm, self.n, self.matrix is not None)
+        shared.coords[:] = self.coords
+        if self.matrix is not None:
+            shared.matrix[:] = self.matrix
+        shared._owner = True
+        return shared
+
+    @classmethod
+    def _attach(cls, shm, n, dense):
+        shared = cls.__new__(cls)
+        shared.n = n
+        shared._shm = shm
+        shared._owner = False
+        shared.coords = np.ndarray((n, 2), dtype=np.float64, buffer=shm.buf)
+        shared.matrix = None
+        if dense:
+            shared.matrix = np.ndarray((n, n), dtype=np.float64, buffer=shm.buf, offset=shared.coords.nbytes)
+        return shared
+
+    def __reduce__(self):
+        if self._shm is None:
+            return super().__reduce__()
+        return _attach_shared, (self._shm.name, self.n, self.matrix is not None)
+
+    def close(self):
+        """Release the shared block (and free it, in the process that created it)."""
+        if self._shm is None:
+            return
+        self.coords = self.matrix = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __len__(self):
+        return self.n
+
+    def __call__(self, i, j):
+        """Scalar distance between cities ``i`` and ``j``."""
+        if self.matrix is not None:
+            return self.matrix[i, j]
+        (x1, y1), (x2, y2) = self.coords[i], self.coords[j]
+        return math.hypot(x1 - x2, y1 - y2)
+
+    def pair(self, a, b):
+        """Element-wise distances between index arrays ``a`` and ``b`` (any matching shape)."""
+        if self.matrix is not None:
+            return self.matrix[a, b]
+        d = self.coords[a] - self.coords[b]
+        return np.hypot(d[..., 0], d[..., 1])
+
+    def tour_length(self, order):
+        """Length of one closed tour."""
+        order = np.asarray(order)
+        return float(self.pair(order, np.roll(order, -1)).sum())
+
+    def tour_lengths(self, orders):
+        """Lengths of a whole population of tours (rows of ``orders``) in one pass."""
+        orders = np.asarray(orders)
+        return self.pair(orders, np.roll(orders, -1, axis=1)).sum(axis=1)
+
+    def swap_delta(self, order, i, j):
+        """Change in tour length if positions ``i`` and ``j`` were swapped. O(1)."""
+        n = len(order)
+        if i == j or n < 4:
+            if i == j:
+                return 0.0
+            swapped = order.copy()
+            swapped[i], swapped[j] = swapped[j], swapped[i]
+            return self.tour_length(swapped) - self.tour_length(order)
+        # Edges k -> k+1 that touch position i or j (deduplicated when i, j are adjacent).
+        edges = {(i - 1) % n, i, (j - 1) % n, j}
+        before = sum(self(order[k], order[(k + 1) % n]) for k in edges)
+
+        def city(k):
+            k %= n
+            return order[j] if k == i else order[i] if k == j else order[k]
+
+        after = sum(self(city(k), city(k + 1)) for k in edges)
+        return after - before
+
+
+def _attach_shared(name, n, dense):
+    shm = shared_memory.SharedMemory(name=name)
+    # Attaching registers the block with this process's resource tracker, which
+    # would unlink it when a worker exits; only the creating process owns it.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shared = DistanceMatrix._attach(shm, n, dense)
+    shared.coords.flags.writeable = False
+    if shared.matrix is not None:
+        shared.matrix.flags.writeable = False
+    return shared
@@ -0,0 +1,162 @@
+# tsp_islands.py
+# Island-model driver for the array-backed TSP genetic algorithm
+#
+# N sub-populations ("islands") evolve independently in a process pool. Every
+# `migration_interval` generations the best `migrants` tours of each island
+# replace the worst tours of another island, chosen either around a ring
+# (i -> i+1) or as a random derangement.
+#
+#   - City data is shared, not copied: the GA's DistanceMatrix is moved into
+#     shared memory once and workers attach to it by name.
+#   - Every island owns a Generator seeded from SeedSequence(seed).spawn(), and
+#     its state travels with the island, so a run is reproducible for a given
+#     seed regardless of process count or scheduling.
+#   - Telemetry records wall time and best length per island per generation.
+#
+# The GA object must be picklable and provide use_rng(rng),
+# new_population(orders=None, lengths=None), evolve_population(population) and
+# with_distances(distances); populations expose orders, lengths, get_fittest().
+
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+_worker_ga = None
+
+
+def _init_worker(ga):
+    global _worker_ga
+    _worker_ga = ga
+
+
+def _evolve_island(island, orders, lengths, rng_state, generations, ga=None):
+    ga = ga or _worker_ga
+    rng = np.random.default_rng()
+    rng.bit_generator.state = rng_state
+    ga.use_rng(rng)
+    population = ga.new_population(orders, lengths)
+    telemetry = []
+    for _ in range(generations):
+        t0 = time.perf_counter()
+        population = ga.evolve_population(population)
+        telemetry.append((time.perf_counter() - t0, population.get_fittest().get_distance()))
+    return island, population.orders, population.lengths, rng.bit_generator.state, telemetry
+
+
+class IslandModel:
+    """Run ``ga`` on ``n_islands`` sub-populations with periodic elite migration."""
+
+    def __init__(self, ga, n_islands=4, migration_interval=10, migrants=2,
+                 topology="ring", processes=None, seed=None):
+        if topology not in ("ring", "random"):
+            raise ValueError(f"unknown migration topology {topology!r}")
+        self.ga = ga
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.topology = topology
+        self.processes = os.cpu_count() if processes is None else processes
+        seeds = np.random.SeedSequence(seed).spawn(n_islands + 1)
+        self.rng = np.random.default_rng(seeds[-1])  # migration choices
+        self.islands = []
+        for island_seed in seeds[:-1]:
+            rng = np.random.default_rng(island_seed)
+            ga.use_rng(rng)
+            population = ga.new_population()
+            self.islands.append([population.orders, population.lengths, rng.bit_generator.state])
+        self.generation = 0
+        self.telemetry = []  # (generation, island, seconds, best)
+        self.epochs = []     # (first generation, generations, wall seconds)
+
+    # ------------------- Evolution -------------------
+    def run(self, generations, on_epoch=None):
+        """Evolve every island for ``generations`` generations; returns the best Tour."""
+        shared = self.ga.distances.share() if self.processes > 1 else None
+        try:
+            if shared is not None:
+                worker_ga = self.ga.with_distances(shared)
+                with ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(worker_ga,)) as pool:
+                    self._run(generations, pool.map, on_epoch)
+            else:
+                self._run(generations, map, on_epoch, ga=self.ga)
+        finally:
+            if shared is not None:
+                shared.close()
+        return self.best()
+
+    def _run(self, generations, mapper, on_epoch, ga=None):
+        remaining = generations
+        while remaining > 0:
+            step = min(self.migration_interval, remaining)
+            t0 = time.perf_counter()
+            results = mapper(
+                _evolve_island,
+                range(self.n_islands),
+                *zip(*self.islands),
+                [step] * self.n_islands,
+                [ga] * self.n_islands,
+            )
+            for island, orders, lengths, rng_state, telemetry in results:
+                self.islands[island] = [orders, lengths, rng_state]
+                for offset, (seconds, best) in enumerate(telemetry, start=1):
+                    self.telemetry.append((self.generation + offset, island, seconds, best))
+            self.epochs.append((self.generation + 1, step, time.perf_counter() - t0))
+            self.generation += step
+            remaining -= step
+            if self.generation % self.migration_interval == 0:
+                self.migrate()
+            if on_epoch:
+                on_epoch(self)
+
+    # ------------------- Migration -------------------
+    def destinations(self):
+        """Target island for each source island under the configured topology."""
+        n = self.n_islands
+        if self.topology == "ring" or n < 3:
+            return [(i + 1) % n for i in range(n)]
+        while True:  # random derangement: nobody sends to itself
+            targets = self.rng.permutation(n)
+            if not np.any(targets == np.arange(n)):
+                return targets.tolist()
+
+    def migrate(self):
+        """Copy each island's best tours over the worst tours of its destination."""
+        if self.n_islands < 2 or self.migrants < 1:
+            return
+        emigrants = []
+        for orders, lengths, _ in self.islands:
+            best = np.argsort(lengths)[:self.migrants]
+            emigrants.append((orders[best].copy(), lengths[best].copy()))
+        for source, target in enumerate(self.destinations()):
+            orders, lengths, _ = self.islands[target]
+            worst = np.argsort(lengths)[-self.migrants:]
+            orders[worst], lengths[worst] = emigrants[source]
+
+    # ------------------- Results & Telemetry -------------------
+    def best(self):
+        island = min(range(self.n_islands), key=lambda i: self.islands[i][1].min())
+        orders, lengths, _ = self.islands[island]
+        return self.ga.new_population(orders, lengths).get_fittest()
+
+    def best_by_generation(self):
+        """``{generation: best length across islands}``."""
+        best = {}
+        for generation, _, _, length in self.telemetry:
+            best[generation] = min(length, best.get(generation, np.inf))
+        return best
+
+    def summary(self):
+        wall = sum(seconds for _, _, seconds in self.epochs)
+        busy = sum(seconds for _, _, seconds, _ in self.telemetry)
+        return (f"{self.n_islands} islands x {self.generation} generations in {wall:.2f}s wall "
+                f"({busy:.2f}s of island time, {busy / wall if wall else 0:.1f}x parallel), "
+                f"best {self.best().get_distance():.2f}")
+
+    def save_telemetry(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["generation", "island", "seconds", "best"])
+            writer.writerows(self.telemetry)
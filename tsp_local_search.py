@@ -0,0 +1,285 @@
+# tsp_local_search.py
+# 2-opt + Or-opt local search with neighbour lists and don't-look bits
+#
+# Works on the same integer tours as the GA scripts and can be used two ways:
+#   - standalone: LocalSearch(distances).solve() builds a space-filling-curve
+#     tour and improves it to a 2-opt/Or-opt local optimum
+#   - memetic step: ls.improve(order, length) polishes a GA offspring in place
+#
+# Only the k nearest neighbours of each city are tried as new edge endpoints
+# (k-d tree from scipy when available, otherwise a uniform grid), every move is
+# scored in O(1) from the four or six edges it touches, and a queue of "active"
+# cities (don't-look bits) means only cities near a recent change are
+# re-examined. 2-opt reverses the shorter side of the tour.
+
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # fall back to the grid search below
+    cKDTree = None
+
+EPS = 1e-9
+
+
+def neighbor_lists(coords, k=8):
+    """(n, k) array of each city's k nearest other cities, nearest first."""
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.intp)
+    if cKDTree is not None:
+        _, idx = cKDTree(coords).query(coords, k=k + 1)
+        return _drop_self(idx, k)
+
+    # Grid: ~2 cities per cell, widen the ring of cells until k + 1 candidates are found.
+    low = coords.min(axis=0)
+    span = np.maximum(coords.max(axis=0) - low, 1e-12)
+    cells = max(1, int(math.sqrt(n / 2)))
+    cell = np.minimum((cells * (coords - low) / span).astype(np.intp), cells - 1)
+    grid = {}
+    for city, (cx, cy) in enumerate(cell.tolist()):
+        grid.setdefault((cx, cy), []).append(city)
+    result = np.empty((n, k + 1), dtype=np.intp)
+    for city, (cx, cy) in enumerate(cell.tolist()):
+        radius = 1
+        while True:
+            candidates = [c for x in range(cx - radius, cx + radius + 1)
+                          for y in range(cy - radius, cy + radius + 1) for c in grid.get((x, y), ())]
+            if len(candidates) > k or radius > cells:
+                break
+            radius += 1
+        # One more ring guarantees nothing closer sits just outside the square searched.
+        candidates = np.array([c for x in range(cx - radius - 1, cx + radius + 2)
+                               for y in range(cy - radius - 1, cy + radius + 2) for c in grid.get((x, y), ())])
+        d = np.hypot(*(coords[candidates] - coords[city]).T)
+        result[city] = candidates[np.argsort(d, kind="stable")[:k + 1]]
+    return _drop_self(result, k)
+
+
+def _drop_self(idx, k):
+    # Duplicate points can push a city out of first place in its own list; move it
+    # to the end wherever it is (stable, so the rest stay nearest first).
+    is_self = idx == np.arange(len(idx))[:, None]
+    order = np.argsort(is_self, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)[:, :k].astype(np.intp)
+
+
+def space_filling_tour(coords, order=16):
+    """Visit cities along a Hilbert curve: a fast O(n log n) starting tour (~25% above optimal)."""
+    coords = np.asarray(coords, dtype=np.float64)
+    side = 1 << order
+    low = coords.min(axis=0)
+    span = max(float(np.ptp(coords, axis=0).max()), 1e-12)
+    x, y = (((coords - low) / span) * (side - 1)).astype(np.int64).T
+    d = np.zeros(len(coords), dtype=np.int64)
+    s = side // 2
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve stays continuous.
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(~ry, y, x), np.where(~ry, x, y)
+        s //= 2
+    return np.argsort(d, kind="stable")
+
+
+class LocalSearch:
+    """2-opt and Or-opt over a DistanceMatrix, restricted to k-nearest-neighbour candidates."""
+
+    def __init__(self, distances, k=8, or_opt=True, neighbors=None):
+        self.distances = distances
+        self.k = k
+        self.or_opt = or_opt
+        self.neighbors = neighbor_lists(distances.coords, k) if neighbors is None else neighbors
+        self._prepare()
+
+    def _prepare(self):
+        self._xs, self._ys = self.distances.coords.T.tolist()
+        self._nbrs = self.neighbors.tolist()
+        self._nbr_dist = [[self._d(a, b) for b in row] for a, row in enumerate(self._nbrs)]
+
+    def __getstate__(self):
+        return {"distances": self.distances, "k": self.k, "or_opt": self.or_opt, "neighbors": self.neighbors}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._prepare()
+
+    def with_distances(self, distances):
+        """Same search over ``distances`` (e.g. a shared-memory copy of the same cities)."""
+        return LocalSearch(distances, self.k, self.or_opt, self.neighbors)
+
+    def _d(self, a, b):
+        return math.hypot(self._xs[a] - self._xs[b], self._ys[a] - self._ys[b])
+
+    # ------------------- Public API -------------------
+    def solve(self):
+        """Standalone: space-filling-curve tour improved to a local optimum. Returns (order, length)."""
+        order = space_filling_tour(self.distances.coords).astype(np.intp)
+        length = self.improve(order)
+        return order, length
+
+    def improve(self, order, length=None, max_moves=None):
+        """Improve ``order`` in place until no 2-opt/Or-opt move helps; returns the new length."""
+        n = len(order)
+        if length is None:
+            length = self.distances.tour_length(order)
+        if n < 5:
+            return length
+        self._t = t = order.tolist() if hasattr(order, "tolist") else list(order)
+        self._pos = pos = [0] * n
+        for i, c in enumerate(t):
+            pos[c] = i
+        self._queue = deque(t)
+        self._queued = bytearray(b"\x01") * n
+        self.moves = 0
+        while self._queue and (max_moves is None or self.moves < max_moves):
+            a = self._queue.popleft()
+            self._queued[a] = 0
+            delta = self._two_opt(a)
+            if delta is None and self.or_opt:
+                delta = self._or_opt(a)
+            if delta is not None:
+                length += delta
+                self.moves += 1
+                self._push(a)
+        order[:] = self._t
+        return length
+
+    # ------------------- Moves -------------------
+    def _push(self, *cities):
+        for c in cities:
+            if not self._queued[c]:
+                self._queued[c] = 1
+                self._queue.append(c)
+
+    def _reverse(self, i, j):
+        """Reverse tour positions i..j (inclusive, wrapping), or the complementary side if shorter."""
+        t, pos = self._t, self._pos
+        n = len(t)
+        inner = (j - i) % n + 1
+        if 2 * inner > n:
+            i, j, inner = (j + 1) % n, (i - 1) % n, n - inner
+        if i <= j:
+            segment = t[i:j + 1]
+            segment.reverse()
+            t[i:j + 1] = segment
+            for k, c in enumerate(segment, i):
+                pos[c] = k
+        else:
+            for _ in range(inner // 2):
+                a, b = t[i], t[j]
+                t[i], t[j] = b, a
+                pos[b], pos[a] = i, j
+                i = i + 1 if i + 1 < n else 0
+                j = j - 1 if j > 0 else n - 1
+
+    def _two_opt(self, a):
+        t, pos, d = self._t, self._pos, self._d
+        n = len(t)
+        for forward in (True, False):
+            pa = pos[a]
+            b = t[pa + 1 - n] if forward else t[pa - 1]
+            d_ab = d(a, b)
+            for c, d_ac in zip(self._nbrs[a], self._nbr_dist[a]):
+                if d_ac >= d_ab:
+                    break  # no later neighbour can pay for the removed edge either
+                pc = pos[c]
+                e = t[pc + 1 - n] if forward else t[pc - 1]
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d(b, e) - d_ab - d(c, e)
+                if delta < -EPS:
+                    # forward: a b .. c e -> a c .. b e ; backward: e c .. b a -> e b .. c a
+                    if forward:
+                        self._reverse((pa + 1) % n, pc)
+                    else:
+                        self._reverse(pc, (pa - 1) % n)
+                    self._push(a, b, c, e)
+                    return delta
+        return None
+
+    def _or_opt(self, a):
+        """Move the segment of 1-3 cities starting at ``a`` next to a neighbour of either end."""
+        t, pos, d = self._t, self._pos, self._d
+        n = len(t)
+        p1 = pos[a]
+        for seg_len in (1, 2, 3):
+            if seg_len > n - 3:
+                break
+            s1, s2 = a, t[(p1 + seg_len - 1) % n]
+            prev, nxt = t[p1 - 1], t[(p1 + seg_len) % n]
+            gain = d(prev, s1) + d(s2, nxt) - d(prev, nxt)
+            if gain <= EPS:
+                continue
+            for end, other in ((s1, s2), (s2, s1)):
+                for c, d_ec in zip(self._nbrs[end], self._nbr_dist[end]):
+                    if d_ec >= gain:
+                        break
+                    if (pos[c] - p1) % n < seg_len:
+                        continue  # c is inside the segment
+                    for after in (True, False):
+                        e = t[(pos[c] + 1) % n] if after else t[pos[c] - 1]
+                        if (pos[e] - p1) % n < seg_len:
+                            continue
+                        delta = d_ec + d(other, e) - d(c, e) - gain
+                        if delta < -EPS:
+                            self._move_segment(p1, seg_len, c, end, after)
+                            self._push(prev, nxt, s1, s2, c, e)
+                            return delta
+        return None
+
+    def _move_segment(self, p1, seg_len, c, end, after):
+        """Cut t[p1:p1+seg_len] out and reinsert it beside ``c`` with ``end`` touching ``c``.
+
+        Done as two or three path reversals: with (u, v) the target edge in tour
+        order, the cycle prev|s1..s2|nxt..u|v..prev becomes prev|nxt..u|s2..s1|v..,
+        and the segment is turned round only if the wrong end would touch c.
+        """
+        t = self._t
+        n = len(t)
+        s1, s2 = t[p1], t[(p1 + seg_len - 1) % n]
+        prev, nxt = t[p1 - 1], t[(p1 + seg_len) % n]
+        u, v = (c, t[(self._pos[c] + 1) % n]) if after else (t[self._pos[c] - 1], c)
+        self._reverse_path(prev, s1, u, v)
+        self._reverse_path(prev, u, nxt, s2)
+        if s1 != s2 and end != (s2 if after else s1):
+            self._reverse_path(u, s2, s1, v)
+
+    def _reverse_path(self, before, first, last, after):
+        """2-opt move: reverse the path first..last that lies between ``before`` and ``after``."""
+        t, pos = self._t, self._pos
+        if t[pos[first] - 1] == before:
+            self._reverse(pos[first], pos[last])
+        else:  # the path runs backwards in the array
+            self._reverse(pos[last], pos[first])
+
+def benchmark(n=10_000, seed=0):
+    """Solve a random uniform instance and report time and tour quality."""
+    rng = np.random.default_rng(seed)
+    from tsp_distance import DistanceMatrix
+    distances = DistanceMatrix(rng.random((n, 2)) * 1000)
+    t0 = time.perf_counter()
+    ls = LocalSearch(distances)
+    t1 = time.perf_counter()
+    start = distances.tour_length(space_filling_tour(distances.coords))
+    order, length = ls.solve()
+    t2 = time.perf_counter()
+    # Beardwood–Halton–Hammersley: optimal ≈ 0.7124 * sqrt(n * area) for uniform random cities.
+    estimate = 0.7124 * math.sqrt(n * 1000 * 1000)
+    print(f"{n} cities: neighbour lists {t1 - t0:.2f}s, search {t2 - t1:.2f}s, {ls.moves} moves; "
+          f"length {start:,.0f} -> {length:,.0f} (~{100 * (length / estimate - 1):.1f}% above the BHH estimate)")
+    assert abs(length - distances.tour_length(order)) < 1e-6 * length
+
+
+if __name__ == "__main__":
+    benchmark()
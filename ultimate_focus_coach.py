@@ -16,13 +16,11 @@ It now works as a full digital life/work coach, helping track your productivity,
 
 import tkinter as tk
 from tkinter import messagebox
-import threading
-import time
 import random
-from datetime import datetime
+from datetime import datetime, timedelta
 from plyer import notification
-import csv
-import os
+from productivity_log import ProductivityLog
+from reminder_scheduler import ReminderScheduler
 
 # ------------------- Motivational & Wellness Tips -------------------
 tips = [
@@ -40,12 +38,11 @@ micro_break_interval = 60  # minutes
 focus_session_duration = 25  # minutes
 tasks = []
 
-# CSV file to store daily logs
-log_file = "productivity_log.csv"
-if not os.path.exists(log_file):
-    with open(log_file, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Timestamp", "Event", "Details"])
+# Daily logs: one CSV per day under productivity_log/ plus an index of per-day,
+# per-event counts (buffered; rows are group-committed by a background flusher
+# and flushed durably on exit). An old single-file log is imported once.
+log_dir = "productivity_log"
+event_log = ProductivityLog(log_dir, legacy_file="productivity_log.csv")
 
 # ------------------- Helper Functions -------------------
 def send_notification(title, message):
@@ -56,25 +53,25 @@ def random_tip():
     return random.choice(tips)
 
 def log_event(event, details=""):
+    # Safe to call from the scheduler threads: this only enqueues the row.
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file, "a", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow([timestamp, event, details])
-
-# ------------------- Scheduler Threads -------------------
-def micro_break_scheduler():
-    while True:
-        time.sleep(micro_break_interval * 60)
-        tip = random_tip()
-        send_notification("⏰ Micro-Break Time!", tip)
-
-def focus_session_scheduler():
+    event_log.write([timestamp, event, details])
+
+# ------------------- Reminders -------------------
+# Both reminders live on one heap-based scheduler driven by root.after, so there
+# are no sleeping threads and interval changes apply immediately.
+def micro_break():
+    tip = random_tip()
+    send_notification("⏰ Micro-Break Time!", tip)
+
+def start_focus_session():
+    send_notification("🔔 Focus Time!", f"Focus for {focus_session_duration} minutes now!")
+
+def focus_session_complete():
     global completed_sessions
-    while True:
-        send_notification("🔔 Focus Time!", f"Focus for {focus_session_duration} minutes now!")
-        time.sleep(focus_session_duration * 60)
-        completed_sessions += 1
-        send_notification("✅ Focus Session Complete!", "Take a short break now!")
+    completed_sessions += 1
+    send_notification("✅ Focus Session Complete!", "Take a short break now!")
+    start_focus_session()
 
 # ------------------- Task Management -------------------
 def add_task():
@@ -112,14 +109,24 @@ def update_task_list():
 def generate_report():
     completed_tasks = sum(1 for t in tasks if t["completed"])
     pending_tasks = len(tasks) - completed_tasks
+    # Historical numbers come from the per-day index, not a scan of the whole log.
+    event_log.flush()
+    today = datetime.now().date()
+    week_start = today - timedelta(days=6)
+    week = event_log.range_counts(week_start, today)
     report = (
         f"📊 Daily Productivity Report\n\n"
         f"Focus Sessions Completed: {completed_sessions}\n"
         f"Tasks Completed: {completed_tasks}\n"
         f"Tasks Pending: {pending_tasks}\n"
         f"Micro-Break Interval: {micro_break_interval} min\n"
-        f"Focus Session Duration: {focus_session_duration} min\n"
-        f"Logged Events: See '{log_file}'"
+        f"Focus Session Duration: {focus_session_duration} min\n\n"
+        f"Last 7 Days:\n"
+        f"Focus Sessions Completed: {week.get('✅ Focus Session Complete!', 0)}\n"
+        f"Tasks Added: {week.get('Task Added', 0)}\n"
+        f"Tasks Completed: {week.get('Task Completed', 0)}\n"
+        f"Micro-Breaks: {week.get('⏰ Micro-Break Time!', 0)}\n"
+        f"Logged Events: See '{log_dir}/'"
     )
     messagebox.showinfo("Daily Report", report)
     log_event("Daily Report Generated", report)
@@ -130,6 +137,8 @@ def update_intervals():
     try:
         micro_break_interval = int(micro_entry.get())
         focus_session_duration = int(focus_entry.get())
+        scheduler.reschedule(micro_break_reminder, interval=micro_break_interval * 60)
+        scheduler.reschedule(focus_session_reminder, interval=focus_session_duration * 60)
         messagebox.showinfo("Intervals Updated", "Intervals updated successfully!")
         log_event("Intervals Updated", f"Micro-break: {micro_break_interval}, Focus: {focus_session_duration}")
     except ValueError:
@@ -172,8 +181,11 @@ task_listbox.pack(pady=10)
 tk.Button(root, text="Generate Daily Report", command=generate_report).pack(pady=10)
 tk.Button(root, text="Exit", command=root.destroy).pack(pady=10)
 
-# ------------------- Start Scheduler Threads -------------------
-threading.Thread(target=micro_break_scheduler, daemon=True).start()
-threading.Thread(target=focus_session_scheduler, daemon=True).start()
+# ------------------- Start Reminders -------------------
+scheduler = ReminderScheduler(root)
+micro_break_reminder = scheduler.every(micro_break_interval * 60, micro_break, name="micro-break")
+focus_session_reminder = scheduler.every(focus_session_duration * 60, focus_session_complete, name="focus-session")
+root.after(0, start_focus_session)
 
 root.mainloop()
+event_log.close()